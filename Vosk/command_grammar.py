@@ -0,0 +1,249 @@
+"""
+command_grammar.py — второй распознаватель Vosk с грамматикой команд
+====================================================================
+listen.py декодировал всё полной моделью с открытым словарём: «открой
+стелла» превращалось в «открой стела», «закрой тг» — в «закрой те же».
+KaldiRecognizer умеет работать с ограниченным списком фраз — тогда он
+выбирает только из них, декодирует быстрее и не путает названия с похожими
+словами.
+
+CommandGrammar собирает такой список из глаголов команд (intents.VERBS,
+кроме поиска — у него свободный запрос), слов-наполнителей и всех ключей
+и синонимов программ (app_index.json + aliases.json через alias_store),
+плюс "[unk]" для всего остального. Модель small-ru знает только кириллицу,
+поэтому латинские ключи («chrome») в грамматику не попадают — их заменяют
+кириллические синонимы («хром»); если у модели есть graph/words.txt, ещё
+и отсеиваются фразы со словами вне её словаря.
+
+Грамматика пересобирается сама: refresh() раз в CHECK_SECONDS сверяет
+(mtime, size) исходников, при изменении — хэш содержимого (как alias_store),
+и только если список фраз действительно другой, в фоне строит новый
+распознаватель. Подменяется он между фразами.
+
+DualRecognizer — обёртка с интерфейсом KaldiRecognizer (AcceptWaveform,
+Result, FinalResult, Reset), так что её можно поставить за VoiceGate.
+Каждый чанк идёт в оба распознавателя; если грамматический распознал
+команду целиком (глагол + название, без [unk]), берётся его текст, а
+открытый словарь сбрасывается, не дожидаясь своего результата. Иначе —
+обычная фраза открытого словаря.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+import re
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Set
+
+try:
+    from indexer import alias_store
+    from models import intents
+except ImportError:  # запуск из папки Vosk/
+    import sys
+    from os.path import dirname, abspath
+    sys.path.append(dirname(dirname(abspath(__file__))))
+    from indexer import alias_store
+    from models import intents
+
+try:
+    from vosk import KaldiRecognizer
+except ImportError:  # без vosk грамматику можно собрать, но не распознавать
+    KaldiRecognizer = None
+
+UNK = "[unk]"
+CHECK_SECONDS = 5.0   # не чаще раза в столько секунд проверять, не изменился ли индекс
+COMMAND_INTENTS = (intents.LAUNCH, intents.CLOSE, intents.SWITCH)
+
+_PHRASE = re.compile(r"[а-яё]+(?: [а-яё]+)*")  # только кириллица: латиницы в словаре small-ru нет
+_COMMAND_VERBS = frozenset(verb for name in COMMAND_INTENTS for verb in intents.VERBS[name])
+_FILLERS = frozenset(intents.FILLERS)
+
+
+def model_vocabulary(model_path) -> Optional[Set[str]]:
+    """Слова модели из graph/words.txt; None — файла нет (у части моделей его не кладут)."""
+    path = pathlib.Path(model_path) / "graph" / "words.txt"
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {line.split(maxsplit=1)[0] for line in f if line.strip()}
+    except OSError:
+        return None
+
+
+def grammar_phrases(names: Iterable[str], vocabulary: Optional[Set[str]] = None) -> List[str]:
+    """Отсортированный список фраз грамматики: глаголы, наполнители, названия программ и [unk]."""
+    phrases = set(_COMMAND_VERBS) | _FILLERS
+    for name in names:
+        name = alias_store.normalize(name)
+        if _PHRASE.fullmatch(name) and (vocabulary is None or all(w in vocabulary for w in name.split())):
+            phrases.add(name)
+    return sorted(phrases) + [UNK]
+
+
+def is_command(text: str) -> bool:
+    """Глагол команды и хоть одно слово названия, без [unk]: «открой мне хром» — да, «открой [unk]» — нет."""
+    words = [w for w in text.split() if w not in _FILLERS]
+    return len(words) >= 2 and words[0] in _COMMAND_VERBS and UNK not in words
+
+
+class CommandGrammar:
+    """Список фраз из индекса программ и построенный по нему грамматический распознаватель."""
+
+    def __init__(self, model, rate: int = 16000, vocabulary: Optional[Set[str]] = None,
+                 aliases_path: pathlib.Path = alias_store.ALIASES_FILE,
+                 index_path: pathlib.Path = alias_store.INDEX_FILE,
+                 store_path: pathlib.Path | None = alias_store.STORE_FILE):
+        self.model = model
+        self.rate = rate
+        self.vocabulary = vocabulary
+        self.aliases_path = pathlib.Path(aliases_path)
+        self.index_path = pathlib.Path(index_path)
+        self.store_path = store_path
+        self.phrases: List[str] = []
+        self.fingerprint = ""
+        self.counts = {"builds": 0, "checks": 0}
+        self.build_seconds = 0.0
+        self._stats = None
+        self._checked = 0.0
+        self._recognizer = None
+        self._next = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._rebuild(self._sources())
+
+    # --- исходники -------------------------------------------------------------
+    def _stat(self):
+        stats = []
+        for path in (self.aliases_path, self.index_path):
+            try:
+                st = path.stat()
+                stats.append((st.st_mtime, st.st_size))
+            except OSError:
+                stats.append(None)
+        return stats
+
+    def _sources(self) -> List[str]:
+        """Фразы грамматики по текущим app_index.json и aliases.json."""
+        self._stats = self._stat()
+        store = alias_store.load(self.aliases_path, self.index_path, self.store_path)
+        try:
+            keys = list(json.loads(self.index_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            keys = []
+        return grammar_phrases([*keys, *(synonym for synonym, _key in store.synonym_pairs())], self.vocabulary)
+
+    def _rebuild(self, phrases: List[str]) -> bool:
+        fingerprint = hashlib.sha1("\n".join(phrases).encode("utf-8")).hexdigest()
+        if fingerprint == self.fingerprint:
+            return False
+        started = time.perf_counter()
+        recognizer = None
+        if KaldiRecognizer is not None and self.model is not None:
+            recognizer = KaldiRecognizer(self.model, self.rate, json.dumps(phrases, ensure_ascii=False))
+        with self._lock:
+            self.phrases, self.fingerprint = phrases, fingerprint
+            self._next = recognizer
+        self.build_seconds = time.perf_counter() - started
+        self.counts["builds"] += 1
+        return True
+
+    # --- публичное -------------------------------------------------------------
+    def recognizer(self):
+        """Актуальный грамматический распознаватель; звать между фразами — новый подменяет старый."""
+        with self._lock:
+            if self._next is not None:
+                self._recognizer, self._next = self._next, None
+            return self._recognizer
+
+    def refresh(self, force: bool = False) -> bool:
+        """Пересобирает грамматику, если индекс или синонимы изменились; True — собрана новая."""
+        now = time.monotonic()
+        if not force and now - self._checked < CHECK_SECONDS:
+            return False
+        self._checked = now
+        self.counts["checks"] += 1
+        if not force and self._stat() == self._stats:
+            return False
+        return self._rebuild(self._sources())
+
+    def refresh_async(self) -> None:
+        """refresh() в фоновом потоке, чтобы сборка не задерживала распознавание."""
+        if self._refreshing or time.monotonic() - self._checked < CHECK_SECONDS:
+            return
+        self._refreshing = True
+
+        def run():
+            try:
+                if self.refresh():
+                    print(f"🔄 Грамматика команд пересобрана: {len(self.phrases)} фраз")
+            except Exception as e:
+                print(f"⚠️ Не удалось пересобрать грамматику команд: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, daemon=True, name="grammar").start()
+
+
+class DualRecognizer:
+    """Открытый словарь + грамматика команд с интерфейсом KaldiRecognizer."""
+
+    def __init__(self, full, grammar: CommandGrammar, command: Callable[[str], bool] = is_command):
+        self.full = full
+        self.grammar = grammar
+        self.is_command = command
+        self.command = grammar.recognizer()
+        self._result = '{"text": ""}'
+        self._command_done = False  # грамматический уже закончил фразу (не командой), ждём открытый
+        self.counts = {"command": 0, "open": 0}
+
+    def _finish(self, text: str, command: bool) -> None:
+        self._result = json.dumps({"text": text}, ensure_ascii=False)
+        self.counts["command" if command else "open"] += 1
+        self._command_done = False
+        self.grammar.refresh_async()
+        self.command = self.grammar.recognizer()  # новая грамматика — с начала следующей фразы
+
+    def AcceptWaveform(self, data: bytes) -> bool:
+        if self.command is None:  # грамматику не из чего собрать — только открытый словарь
+            if self.full.AcceptWaveform(data):
+                self._finish(json.loads(self.full.Result()).get("text", ""), False)
+                return True
+            return False
+        command_final = not self._command_done and self.command.AcceptWaveform(data)
+        full_final = self.full.AcceptWaveform(data)
+        if command_final:
+            text = json.loads(self.command.Result()).get("text", "")
+            if self.is_command(text):
+                if full_final:
+                    self.full.Result()
+                else:
+                    self.full.Reset()  # команда уже понята — открытый словарь её не дорасшифровывает
+                self._finish(text, True)
+                return True
+            self._command_done = True
+        if full_final:
+            if not self._command_done:
+                self.command.Reset()
+            self._finish(json.loads(self.full.Result()).get("text", ""), False)
+            return True
+        return False
+
+    def Result(self) -> str:
+        return self._result
+
+    def FinalResult(self) -> str:
+        command = "" if self.command is None or self._command_done else \
+            json.loads(self.command.FinalResult()).get("text", "")
+        full = json.loads(self.full.FinalResult()).get("text", "")
+        if self.is_command(command):
+            self._finish(command, True)
+        else:
+            self._finish(full, False)
+        return self._result
+
+    def Reset(self) -> None:
+        self.full.Reset()
+        if self.command is not None:
+            self.command.Reset()
+        self._command_done = False
@@ -3,10 +3,22 @@ import pyaudio
 import json
 import os
 import pyttsx3
-import requests
+from collections import deque
 from dotenv import load_dotenv
+import re
+import sys
+import threading
 import time
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.app_launcher import AppLauncher  # noqa: E402
+from models.llm_client import CancelToken, LLMClient, LLMError, OllamaBackend  # noqa: E402
+from command_grammar import CommandGrammar, DualRecognizer, model_vocabulary  # noqa: E402
+from pipeline import VoicePipeline  # noqa: E402
+from streaming import sentences  # noqa: E402
+from vad import GatedRecognizer, VoiceGate, make_vad  # noqa: E402
+from wake import WakeWord  # noqa: E402
+
 # ╔═══════════════════════════════════════╗
 # ║     Загрузка переменных окружения      ║
 # ╚═══════════════════════════════════════╝
@@ -18,6 +30,13 @@ load_dotenv()  # Подгружаем настройки из .env (наприм
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "vosk-model-small-ru-0.22")  # Путь к модели Vosk
 OLLAMA_URL = "http://localhost:11434"  # Локальный адрес сервера Ollama
 OLLAMA_MODEL = "llama3"                  # Имя модели Ollama, которую используем
+OLLAMA_STREAM = True                     # Говорить по предложениям, пока модель ещё пишет ответ
+OLLAMA_TIMEOUT = 60                      # Сек. ожидания очередного куска ответа (раньше таймаута не было)
+BARGE_IN = True                          # Новая фраза во время ответа обрывает его
+ECHO_OVERLAP = 0.6                       # Доля слов из недавно сказанного — это эхо Джарвиса, а не пользователь
+VAD_MODE = "auto"                        # Отсев тишины до Vosk: "auto" / "webrtc" / "energy" / None — выключен
+WAKE_WORD = True                         # В Ollama уходят только фразы с обращением «Джарвис»
+COMMAND_GRAMMAR = True                   # Второй распознаватель по названиям программ: команды точнее и быстрее
 
 # ╔═══════════════════════════════════════╗
 # ║         Проверка наличия модели Vosk    ║
@@ -31,6 +50,11 @@ if not os.path.exists(MODEL_PATH):
 # ╚═══════════════════════════════════════╝
 model = Model(MODEL_PATH)  # Загружаем модель для распознавания речи
 recognizer = KaldiRecognizer(model, 16000)  # Инициализируем распознаватель с частотой 16 кГц
+if COMMAND_GRAMMAR:
+    # открытый словарь + грамматика из app_index/aliases; сама пересобирается, когда индекс меняется
+    recognizer = DualRecognizer(recognizer, CommandGrammar(model, 16000, vocabulary=model_vocabulary(MODEL_PATH)))
+gate = VoiceGate(make_vad(VAD_MODE)) if VAD_MODE else None  # тишина до Kaldi не доходит
+wake = WakeWord() if WAKE_WORD else None
 
 # ╔═══════════════════════════════════════╗
 # ║        Настройка микрофона PyAudio      ║
@@ -47,88 +71,199 @@ stream = mic.open(
 # ╔═══════════════════════════════════════╗
 # ║      Инициализация синтеза речи        ║
 # ╚═══════════════════════════════════════╝
-engine = pyttsx3.init()  # Инициализируем движок озвучивания
-engine.setProperty('rate', 150)  # Скорость речи (слов в минуту)
-voices = engine.getProperty('voices')
-for voice in voices:
-    if 'russian' in voice.name.lower():  # Ищем и устанавливаем русский голос
-        engine.setProperty('voice', voice.id)
-        break
+engine = None  # создаётся в потоке озвучки: pyttsx3 (SAPI/COM) привязан к потоку, где его создали
+# Перебивание: поток распознавания только увеличивает счётчик, а stop() движку
+# вызывает сам поток озвучки — из колбэка started-word (чужой поток COM-объект не трогает)
+interruptions = 0   # сколько раз перебили
+speaking_after = 0  # значение счётчика, когда начался текущий кусок речи
+
+
+def init_tts():
+    """Инициализирует движок озвучивания с русским голосом."""
+    tts = pyttsx3.init()
+    tts.setProperty('rate', 150)  # Скорость речи (слов в минуту)
+    voices = tts.getProperty('voices')
+    for voice in voices:
+        if 'russian' in voice.name.lower():  # Ищем и устанавливаем русский голос
+            tts.setProperty('voice', voice.id)
+            break
+    tts.connect('started-word', _stop_if_interrupted)
+    return tts
+
+
+def _stop_if_interrupted(name, location, length):
+    """Колбэк pyttsx3 перед каждым словом (в потоке озвучки): перебили — замолкаем."""
+    if interruptions != speaking_after:
+        engine.stop()
+
+
+# ╔═══════════════════════════════════════╗
+# ║   Локальные команды (без обращения к ИИ) ║
+# ╚═══════════════════════════════════════╝
+launcher = AppLauncher(prewarm_top=5)  # открой / закрой / переключись / найди
+
+# ╔═══════════════════════════════════════╗
+# ║      Клиент Ollama (keep-alive)        ║
+# ╚═══════════════════════════════════════╝
+# Одно соединение на все ходы: TCP-рукопожатие не добавляется к каждому ответу
+llm = LLMClient(OllamaBackend(OLLAMA_URL, OLLAMA_MODEL), read_timeout=OLLAMA_TIMEOUT)
+threading.Thread(target=llm.warm, daemon=True).start()  # соединение откроется, пока грузится остальное
+
+current_request = CancelToken()  # отмена текущего ответа при перебивании
+spoken = deque(maxlen=3)         # последние озвученные куски — чтобы не принять эхо за пользователя
 
 
 # ╔═══════════════════════════════════════╗
 # ║         П О Л Е З Н Ы Е  Ф-Ц И И      ║
 # ╚═══════════════════════════════════════╝
 
-def ask_ollama(prompt):
+def ask_ollama(prompt, cancel=None):
     """
     Отправляет запрос на локальный Ollama сервер и возвращает ответ модели.
     """
     try:
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",  # Эндпоинт для генерации текста
-            json={
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False
-            }
-        )
-        response.raise_for_status()  # Проверяем успешный ответ сервера
-        data = response.json()
-        return data.get("response", "Нет поля 'response' в ответе")
-    except Exception as e:
+        return llm.complete(prompt, cancel)
+    except LLMError as e:
         return f"Ошибка при обращении к локальному ИИ: {e}"
 
+def ask_ollama_stream(prompt, cancel=None):
+    """
+    Потоковый запрос к Ollama: отдаёт ответ по предложениям, как только они дописаны.
+    """
+    try:
+        yield from sentences(llm.stream(prompt, cancel))
+    except LLMError as e:
+        yield f"Ошибка при обращении к локальному ИИ: {e}"
+
 def text_to_speech(text):
     """
-    Озвучивает текст через pyttsx3.
+    Озвучивает текст через pyttsx3 (вызывается только из потока озвучки).
     """
+    global engine, speaking_after
+    if engine is None:
+        engine = init_tts()
+    spoken.append(text)
+    speaking_after = interruptions
     engine.say(text)
     engine.runAndWait()
 
-# ╔═══════════════════════════════════════╗
-# ║              Основной цикл            ║
-# ╚═══════════════════════════════════════╝
 
-print("Говорите... (для выхода нажмите Ctrl+C)")
+def close_tts():
+    """
+    Останавливает движок озвучивания (вызывается потоком озвучки при его завершении).
+    """
+    global engine
+    if engine is not None:
+        engine.stop()
+        engine = None
+
+
+def interrupt(user_text):
+    """
+    Фраза пришла, пока Джарвис отвечает: обрываем запрос к ИИ и речь, если это не эхо его же слов.
+    """
+    global interruptions
+    if wake is not None and not wake.heard(user_text):
+        return False  # говорят не с Джарвисом — пусть договорит
+    words = set(re.findall(r"\w+", user_text.lower()))
+    heard = set(re.findall(r"\w+", " ".join(spoken).lower()))
+    if not words or len(words & heard) >= ECHO_OVERLAP * len(words):
+        return False
+    print(f"✋ Перебили: {user_text}")
+    current_request.cancel()
+    interruptions += 1  # речь оборвёт сам поток озвучки на следующем слове
+    return True
 
-try:
-    while True:
-        try:
-            # Читаем аудиоданные с микрофона, игнорируем переполнение буфера
-            data = stream.read(4096, exception_on_overflow=False)
-        except IOError as e:
-            print(f"Ошибка чтения микрофона: {e}")
-            continue  # Если ошибка — пропускаем итерацию
 
-        # Если получена полноценная часть речи
-        if recognizer.AcceptWaveform(data):
-            result = json.loads(recognizer.Result())
-            user_text = result.get("text", "").strip()
+def recognize(data):
+    """
+    Скармливает чанк Vosk; возвращает текст законченной фразы или None.
+    """
+    if recognizer.AcceptWaveform(data):
+        result = json.loads(recognizer.Result())
+        return result.get("text", "").strip() or None
+    return None
+
 
-            if user_text:
-                print(f"Вы: {user_text}")
+def respond(user_text):
+    """
+    Ответ на фразу: сначала быстрый локальный разбор намерения, Ollama — только если это не команда.
+    """
+    print(f"Вы: {user_text}")
+    addressed, user_text = wake.check(user_text) if wake is not None else (True, user_text)
+    if addressed and not user_text:  # просто «Джарвис» — ждём вопрос
+        print("JARVIS: Слушаю")
+        return "Слушаю"
+    response = launcher.execute_command(user_text)
+    if response:
+        print(f"JARVIS: {response}")
+        return response
+    if not addressed:
+        print("🔇 Без обращения «Джарвис» — в ИИ не отправляю")
+        return None
 
-                prompt = (
-                    "Ты — голосовой помощник Джарвис. Отвечай кратко и по существу. Отвечай на русском.\n\n"
-                    f"Вопрос: {user_text}"
-                )
+    global current_request
+    current_request = CancelToken()
+    prompt = (
+        "Ты — голосовой помощник Джарвис. Отвечай кратко и по существу. Отвечай на русском.\n\n"
+        f"Вопрос: {user_text}"
+    )
+    if not OLLAMA_STREAM:
+        response = ask_ollama(prompt, current_request)
+        print(f"JARVIS: {response}")
+        if wake is not None:
+            wake.extend()
+        return response
+    return _printed(ask_ollama_stream(prompt, current_request))
 
-                response = ask_ollama(prompt)
-                print(f"JARVIS: {response}")
-                text_to_speech(response)
 
-        time.sleep(0.01)# Небольшая пауза для разгрузки процессора
+def _printed(pieces):
+    """
+    Печатает куски ответа по мере прихода и передаёт их дальше — в озвучку.
+    """
+    for piece in pieces:
+        print(f"JARVIS: {piece}")
+        yield piece
+    if wake is not None:
+        wake.extend()  # после ответа можно переспросить без «Джарвис»
+
+# ╔═══════════════════════════════════════╗
+# ║              Основной цикл            ║
+# ╚═══════════════════════════════════════╝
+
+# Микрофон, Vosk, ответ и озвучка — в отдельных потоках (см. pipeline.py):
+# пока ИИ думает или Джарвис говорит, новая речь копится в буфере, а не теряется
+pipeline = VoicePipeline(
+    read_chunk=lambda: stream.read(4096, exception_on_overflow=False),
+    recognize=GatedRecognizer(recognizer, gate) if gate is not None else recognize,
+    respond=respond,
+    speak=text_to_speech,
+    interrupt=interrupt if BARGE_IN else None,
+    speak_closed=close_tts,
+)
+
+print("Говорите... (для выхода нажмите Ctrl+C)")
+
+try:
+    pipeline.start()
+    while pipeline.alive():
+        time.sleep(0.5)
 
 except KeyboardInterrupt:
     print("Завершение...")
 
 finally:
-    # Безопасно закрываем аудио поток
+    # Сначала останавливаем потоки (захват перестаёт читать микрофон), потом закрываем аудио
+    pipeline.stop()
+    print(f"📊 Конвейер: {pipeline.report()}")
+    if gate is not None:
+        print(f"📊 VAD ({gate.vad.name}): {gate.counts}")
+    if COMMAND_GRAMMAR:
+        print(f"📊 Распознано фраз: {recognizer.counts}, грамматика: {recognizer.grammar.counts}")
     try:
         stream.stop_stream()
         stream.close()
         mic.terminate()
     except Exception as e:
         print(f"Ошибка при остановке аудио: {e}")
-    engine.stop()
+    llm.close()  # движок озвучки останавливает сам поток speak (close_tts)
@@ -0,0 +1,313 @@
+"""
+pipeline.py — конвейер «микрофон → распознавание → ответ → озвучка» для listen.py
+==================================================================================
+Раньше основной цикл listen.py делал всё по очереди в одном потоке:
+stream.read() → AcceptWaveform() → ask_ollama() → runAndWait(). Пока модель
+думала и пока Джарвис говорил, микрофон никто не читал: звук копился в буфере
+PyAudio и молча выбрасывался (exception_on_overflow=False), так что фраза,
+сказанная во время ответа, терялась.
+
+VoicePipeline разносит стадии по потокам:
+
+    capture ──RingBuffer──▶ recognize ──Queue──▶ respond ──Queue──▶ speak
+    (микрофон)  (чанки)     (Vosk)      (фразы)  (команды/LLM) (ответы) (TTS)
+
+    - capture только читает микрофон и кладёт чанки в кольцевой буфер
+      на ring_seconds секунд звука; он никогда не ждёт остальных стадий;
+    - recognize разбирает чанки независимо от того, занят ли LLM или TTS,
+      готовые фразы идут в очередь ответов — ничего не теряется, пока
+      распознавание успевает за реальным временем;
+    - respond может вернуть строку или итерируемое кусков (например,
+      предложения по мере генерации) — каждый кусок сразу уходит в озвучку;
+    - если распознавание всё же отстало на весь буфер, вытесняются самые
+      старые чанки и растёт счётчик overruns (виден в stats()).
+
+Перебивание (barge-in): если передан interrupt(text) и новая фраза пришла,
+пока Джарвис ещё готовит или говорит ответ, recognize спрашивает interrupt(),
+стоит ли перебить (там же отменяют запрос к LLM и глушат TTS). Если да —
+недоговорённые куски и неотвеченные фразы, пришедшие раньше новой,
+пропускаются, и следующей отвечается уже она.
+
+Задержки стадий копятся в StageStats (p50/p99):
+    lag          — от захвата чанка до того, как его взял распознаватель;
+    recognize    — AcceptWaveform() одного чанка;
+    respond      — от фразы до первого куска ответа;
+    speak        — озвучка одного куска;
+    first_audio  — от конца фразы (захват её последнего чанка) до начала речи.
+"""
+from __future__ import annotations
+
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Union
+
+RING_SECONDS = 30.0   # столько звука буфер переживёт, если распознавание отстанет
+CHUNK_SECONDS = 4096 / 16000
+MAX_SAMPLES = 500     # сколько последних замеров держать на стадию
+POLL = 0.1            # сек.: как часто потоки проверяют, не пора ли остановиться
+
+
+class Chunk(NamedTuple):
+    data: bytes
+    captured: float   # time.perf_counter() момента чтения
+
+
+class Utterance(NamedTuple):
+    text: str
+    ended: float      # время захвата последнего чанка фразы
+    seq: int = 0      # порядковый номер фразы (для перебивания)
+
+
+class RingBuffer:
+    """Ограниченная очередь чанков: put() никогда не ждёт, при переполнении вытесняет самый старый."""
+
+    def __init__(self, capacity: int):
+        self._items: Deque[Chunk] = deque(maxlen=max(1, capacity))
+        self._cond = threading.Condition()
+        self._closed = False
+        self.overruns = 0
+        self.peak = 0
+
+    def put(self, item: Chunk) -> None:
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.overruns += 1
+            self._items.append(item)
+            self.peak = max(self.peak, len(self._items))
+            self._cond.notify()
+
+    def get(self, timeout: float | None = None) -> Chunk | None:
+        """Следующий чанк; None — истёк timeout или буфер закрыт и пуст."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class StageStats:
+    """Задержки по стадиям: stage → последние MAX_SAMPLES замеров в секундах."""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(stage, [])
+            samples.append(seconds)
+            del samples[:-MAX_SAMPLES]
+
+    def report(self) -> Dict[str, dict]:
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+        return {
+            stage: {
+                "n": len(samples),
+                "p50_ms": round(statistics.median(samples) * 1000, 2),
+                "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 2),
+            }
+            for stage, samples in snapshot.items() if samples
+        }
+
+
+class VoicePipeline:
+    """
+    Четыре потока, связанные буфером и очередями.
+
+    read_chunk()      — блокирующее чтение чанка с микрофона;
+    recognize(data)   — текст законченной фразы или None (фраза ещё идёт);
+    respond(text)     — ответ: строка, итерируемое кусков или None (молчать);
+    speak(text)       — озвучка куска (вызывается только из потока speak,
+                        так что движок TTS можно создать прямо в нём);
+    interrupt(text)   — необязательно: True, если фраза, сказанная во время
+                        ответа, должна его оборвать (вызывается из recognize);
+    speak_closed()    — необязательно: вызывается из потока speak, когда он
+                        завершается, — там же, где движок TTS создан, его и
+                        останавливают.
+    """
+
+    def __init__(
+        self,
+        read_chunk: Callable[[], bytes],
+        recognize: Callable[[bytes], Optional[str]],
+        respond: Callable[[str], Union[str, Iterable[str], None]],
+        speak: Callable[[str], None],
+        ring_seconds: float = RING_SECONDS,
+        chunk_seconds: float = CHUNK_SECONDS,
+        interrupt: Optional[Callable[[str], bool]] = None,
+        speak_closed: Optional[Callable[[], None]] = None,
+    ):
+        self.read_chunk = read_chunk
+        self.recognize = recognize
+        self.respond = respond
+        self.speak = speak
+        self.interrupt = interrupt
+        self.speak_closed = speak_closed
+        self.ring = RingBuffer(int(ring_seconds / chunk_seconds))
+        self.utterances: "queue.Queue[Utterance | None]" = queue.Queue()
+        self.replies: "queue.Queue[tuple | None]" = queue.Queue()
+        self.stats = StageStats()
+        self.counts = {"chunks": 0, "read_errors": 0, "utterances": 0, "replies": 0, "errors": 0,
+                       "interrupted": 0, "skipped": 0}
+        self._cutoff = 0       # фразы и куски ответов с seq меньше — устарели (их перебили)
+        self._responding = 0   # seq фразы, на которую сейчас готовится ответ
+        self._speaking = 0     # seq фразы, ответ на которую сейчас звучит
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    # --- управление ------------------------------------------------------------
+    def start(self) -> "VoicePipeline":
+        for name, target in (("capture", self._capture), ("recognize", self._recognize),
+                             ("respond", self._respond), ("speak", self._speak)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Останавливает захват; уже распознанное договаривается, затем потоки завершаются."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def alive(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def busy(self) -> bool:
+        """Джарвис сейчас готовит или произносит ответ."""
+        return bool(self._responding or self._speaking or self.replies.qsize())
+
+    def report(self) -> dict:
+        return {**self.counts, "overruns": self.ring.overruns, "ring_peak": self.ring.peak,
+                "stages": self.stats.report()}
+
+    # --- потоки ----------------------------------------------------------------
+    def _capture(self) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    data = self.read_chunk()
+                except IOError as e:
+                    self.counts["read_errors"] += 1
+                    print(f"Ошибка чтения микрофона: {e}")
+                    continue
+                self.ring.put(Chunk(data, time.perf_counter()))
+                self.counts["chunks"] += 1
+        finally:
+            self.ring.close()
+
+    def _recognize(self) -> None:
+        try:
+            while True:
+                chunk = self.ring.get(POLL)
+                if chunk is None:
+                    if self.ring.closed and not len(self.ring):
+                        return
+                    continue
+                started = time.perf_counter()
+                self.stats.add("lag", started - chunk.captured)
+                try:
+                    text = self.recognize(chunk.data)
+                except Exception as e:
+                    self.counts["errors"] += 1
+                    print(f"❌ Ошибка распознавания: {e}")
+                    continue
+                self.stats.add("recognize", time.perf_counter() - started)
+                if text:
+                    self.counts["utterances"] += 1
+                    seq = self.counts["utterances"]
+                    if self.interrupt is not None and self.busy() and self._interrupts(text):
+                        self._cutoff = seq
+                        self.counts["interrupted"] += 1
+                    self.utterances.put(Utterance(text, chunk.captured, seq))
+        finally:
+            self.utterances.put(None)
+
+    def _interrupts(self, text: str) -> bool:
+        try:
+            return bool(self.interrupt(text))
+        except Exception as e:
+            self.counts["errors"] += 1
+            print(f"❌ Ошибка при перебивании: {e}")
+            return False
+
+    def _respond(self) -> None:
+        try:
+            while True:
+                utterance = self.utterances.get()
+                if utterance is None:
+                    return
+                if utterance.seq < self._cutoff:
+                    self.counts["skipped"] += 1
+                    continue
+                self._responding = utterance.seq
+                started = time.perf_counter()
+                try:
+                    reply = self.respond(utterance.text)
+                    pieces = [reply] if isinstance(reply, str) else (reply or ())
+                    first = True
+                    for piece in pieces:
+                        if utterance.seq < self._cutoff:
+                            getattr(pieces, "close", lambda: None)()  # перебили — остаток ответа не нужен
+                            break
+                        if not piece:
+                            continue
+                        if first:
+                            self.stats.add("respond", time.perf_counter() - started)
+                        self.replies.put((piece, utterance.ended if first else None, utterance.seq))
+                        first = False
+                except Exception as e:
+                    self.counts["errors"] += 1
+                    print(f"❌ Ошибка при подготовке ответа: {e}")
+                finally:
+                    self._responding = 0
+        finally:
+            self.replies.put(None)
+
+    def _speak(self) -> None:
+        try:
+            self._speak_loop()
+        finally:
+            if self.speak_closed is not None:
+                try:
+                    self.speak_closed()
+                except Exception as e:
+                    print(f"❌ Ошибка при остановке озвучки: {e}")
+
+    def _speak_loop(self) -> None:
+        while True:
+            item = self.replies.get()
+            if item is None:
+                return
+            piece, ended, seq = item
+            if seq < self._cutoff:
+                self.counts["skipped"] += 1
+                continue
+            self._speaking = seq
+            started = time.perf_counter()
+            if ended is not None:
+                self.stats.add("first_audio", started - ended)
+            try:
+                self.speak(piece)
+                self.counts["replies"] += 1
+            except Exception as e:
+                self.counts["errors"] += 1
+                print(f"❌ Ошибка озвучки: {e}")
+            finally:
+                self._speaking = 0
+            self.stats.add("speak", time.perf_counter() - started)
@@ -0,0 +1,67 @@
+"""
+streaming.py — потоковый ответ Ollama, нарезанный на предложения для озвучки
+===========================================================================
+С "stream": False Джарвис молчал, пока llama3 не допишет ответ целиком,
+и только потом начинал говорить. В потоковом режиме Ollama присылает
+NDJSON — по строке JSON на каждый кусочек текста:
+
+    {"model": "llama3", "response": "При", "done": false}
+    {"model": "llama3", "response": "вет", "done": false}
+    ...
+    {"model": "llama3", "response": "", "done": true, ...}
+
+ollama_tokens() (из models/llm_client.py, здесь для удобства) достаёт из
+строк кусочки текста, sentences() склеивает их и отдаёт законченные
+предложения, как только они дописаны, — первое уходит в TTS, пока модель
+ещё генерирует остальные. Обе функции не зависят от HTTP-клиента: на вход
+годится любое итерируемое строк (LLMClient.stream(), ответ urllib, список
+в тестах).
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator
+
+try:
+    from models.llm_client import ollama_tokens  # noqa: F401
+except ImportError:  # запуск из папки Vosk/
+    import sys
+    from os.path import dirname, abspath
+    sys.path.append(dirname(dirname(abspath(__file__))))
+    from models.llm_client import ollama_tokens  # noqa: F401
+
+MIN_CHARS = 12    # короче не режем: пауза TTS между кусками заметнее выигрыша
+MAX_CHARS = 160   # длиннее — режем по запятой, чтобы не ждать конца длинной фразы
+
+# конец предложения: знак, возможно закрывающая кавычка/скобка, затем пробел или перевод строки
+_SENTENCE_END = re.compile(r"[.!?…]+[\"»)\]]*\s+|\n+")
+_CLAUSE_END = re.compile(r"[,;:—]\s+")
+
+
+def _cut(buffer: str, min_chars: int, max_chars: int) -> int | None:
+    """Позиция, до которой buffer можно отдать как готовый кусок, или None."""
+    for match in _SENTENCE_END.finditer(buffer):
+        if match.start() >= min_chars:
+            return match.end()
+    if len(buffer) > max_chars:
+        clauses = [m.end() for m in _CLAUSE_END.finditer(buffer, min_chars) if m.start() < max_chars]
+        if clauses:
+            return clauses[-1]
+    return None
+
+
+def sentences(tokens: Iterable[str], min_chars: int = MIN_CHARS, max_chars: int = MAX_CHARS) -> Iterator[str]:
+    """Предложения из потока кусочков — каждое сразу, как только дописано."""
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        while True:
+            cut = _cut(buffer, min_chars, max_chars)
+            if cut is None:
+                break
+            piece, buffer = buffer[:cut].strip(), buffer[cut:]
+            if piece:
+                yield piece
+    tail = buffer.strip()
+    if tail:
+        yield tail
@@ -0,0 +1,213 @@
+"""
+vad.py — отсев тишины до распознавателя Kaldi
+=============================================
+listen.py отдавал KaldiRecognizer.AcceptWaveform() каждый чанк микрофона —
+и тишину тоже. На постоянно включённой машине Джарвис почти всё время
+слушает пустую комнату, и именно декодирование тишины грузит процессор.
+
+Детектор речи (VAD) смотрит на кадры по FRAME_MS миллисекунд:
+    EnergyVAD  — энергия кадра относительно адаптивного уровня фона плюс
+                 доля пересечений нуля (ZCR): громкий кадр — речь, кадр
+                 потише с «шипящим» ZCR — глухая согласная (с, ш, ф).
+                 Фон подстраивается по тихим кадрам; если «речь» идёт
+                 FLOOR_RESET_SECONDS без паузы (включили вентилятор),
+                 фон берётся заново — по самому тихому кадру за это время;
+    WebRTCVAD  — то же через webrtcvad, если он установлен (точнее на шуме).
+
+VoiceGate решает по чанкам: пока тихо, чанки не идут дальше (последние
+preroll держатся про запас, чтобы не отрезать начало слова); с началом речи
+отдаёт их и всё, что дальше, а после hangover тихих чанков подряд —
+закрывается и сообщает, что фраза кончилась. GatedRecognizer — обёртка
+над KaldiRecognizer с тем же интерфейсом recognize(data), что ждёт
+VoicePipeline: если Kaldi сам не закончил фразу к закрытию, берёт
+FinalResult().
+"""
+from __future__ import annotations
+
+import json
+import math
+import warnings
+from array import array
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop  # быстрые rms/cross на C; в Python 3.13 удалён
+except ImportError:
+    audioop = None
+
+try:
+    import webrtcvad
+except ImportError:  # нет webrtcvad — работает EnergyVAD
+    webrtcvad = None
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30            # длина кадра VAD (webrtcvad понимает 10/20/30 мс)
+MARGIN_DB = 10.0         # речь громче фона минимум на столько
+MIN_SPEECH_DB = -50.0    # тише этого (дБ от полной шкалы) — не речь, каким бы тихим ни был фон
+FRICATIVE_ZCR = (0.15, 0.6)  # доля пересечений нуля у глухих согласных
+FLOOR_ADAPT = 0.05       # как быстро уровень фона подстраивается вверх
+FLOOR_RESET_SECONDS = 3.0  # столько «речи» без единого тихого кадра — значит, поднялся фон
+MIN_SPEECH_FRAMES = 2    # столько речевых кадров — и чанк считается речью
+PREROLL_CHUNKS = 1       # тихих чанков перед речью, которые всё же отдаются Kaldi
+HANGOVER_CHUNKS = 3      # тихих чанков после речи до закрытия (Kaldi нужна пауза, чтобы закончить фразу)
+
+
+def frame_stats(frame: bytes) -> Tuple[float, float]:
+    """(энергия в дБ от полной шкалы, доля пересечений нуля) кадра 16-бит моно."""
+    if audioop is not None:
+        rms = audioop.rms(frame, 2)
+        crossings = audioop.cross(frame, 2)
+        count = len(frame) // 2
+    else:
+        samples = array("h", frame)
+        count = len(samples)
+        rms = math.sqrt(sum(s * s for s in samples) / count) if count else 0.0
+        crossings = sum((a < 0) != (b < 0) for a, b in zip(samples, samples[1:]))
+    db = 20 * math.log10(rms / 32768) if rms else -120.0
+    return db, crossings / max(1, count - 1)
+
+
+class EnergyVAD:
+    """Энергия + ZCR с адаптивным уровнем фона; без зависимостей."""
+
+    name = "energy"
+
+    def __init__(self, rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS, margin_db: float = MARGIN_DB,
+                 min_speech_db: float = MIN_SPEECH_DB, fricative_zcr: Tuple[float, float] = FRICATIVE_ZCR,
+                 floor_reset_seconds: float = FLOOR_RESET_SECONDS):
+        self.rate = rate
+        self.frame_bytes = rate * frame_ms // 1000 * 2
+        self.margin_db = margin_db
+        self.min_speech_db = min_speech_db
+        self.fricative_zcr = fricative_zcr
+        self.floor_db: float | None = None
+        # речь без пауз: сколько кадров подряд и самый тихий из них
+        self.reset_frames = max(1, int(floor_reset_seconds * 1000 / frame_ms))
+        self._run = 0
+        self._run_min_db = 0.0
+        self.resets = 0
+
+    def is_speech(self, frame: bytes) -> bool:
+        db, zcr = frame_stats(frame)
+        if self.floor_db is None or db < self.floor_db:
+            self.floor_db = db  # фон стал тише — сразу верим
+        threshold = max(self.floor_db + self.margin_db, self.min_speech_db)
+        low, high = self.fricative_zcr
+        speech = db >= threshold or (db >= threshold - self.margin_db / 2 and low <= zcr <= high)
+        if not speech:
+            self.floor_db += FLOOR_ADAPT * (db - self.floor_db)
+            self._run = 0
+            return False
+        # в живой речи между словами есть тихие кадры; «речь» без них — это новый фон
+        self._run_min_db = min(self._run_min_db, db) if self._run else db
+        self._run += 1
+        if self._run >= self.reset_frames:
+            self.floor_db = self._run_min_db
+            self._run = 0
+            self.resets += 1
+        return True
+
+
+class WebRTCVAD:
+    """webrtcvad.Vad; aggressiveness 0–3 — чем больше, тем строже к шуму."""
+
+    name = "webrtc"
+
+    def __init__(self, aggressiveness: int = 2, rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS):
+        if webrtcvad is None:
+            raise ImportError("webrtcvad не установлен: pip install webrtcvad")
+        self.rate = rate
+        self.frame_bytes = rate * frame_ms // 1000 * 2
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(self, frame: bytes) -> bool:
+        return self._vad.is_speech(frame, self.rate)
+
+
+def make_vad(kind: str = "auto", rate: int = SAMPLE_RATE):
+    """"webrtc", "energy" или "auto" — webrtc, если установлен, иначе energy."""
+    if kind == "webrtc" or (kind == "auto" and webrtcvad is not None):
+        return WebRTCVAD(rate=rate)
+    if kind in ("energy", "auto"):
+        return EnergyVAD(rate=rate)
+    raise ValueError(f"Неизвестный VAD: {kind}")
+
+
+class VoiceGate:
+    """Пропускает к распознавателю только чанки с речью (плюс preroll до и hangover после)."""
+
+    def __init__(self, vad, preroll: int = PREROLL_CHUNKS, hangover: int = HANGOVER_CHUNKS,
+                 min_speech_frames: int = MIN_SPEECH_FRAMES):
+        self.vad = vad
+        self.hangover = hangover
+        self.min_speech_frames = min_speech_frames
+        self._preroll: Deque[bytes] = deque(maxlen=max(0, preroll))
+        self._active = False
+        self._quiet = 0
+        self.counts = {"chunks": 0, "speech": 0, "passed": 0, "skipped": 0, "segments": 0}
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def is_speech(self, chunk: bytes) -> bool:
+        # все кадры через VAD, без выхода на первых речевых: EnergyVAD считает длину «речи» в кадрах
+        step = self.vad.frame_bytes
+        found = sum(self.vad.is_speech(chunk[start:start + step]) for start in range(0, len(chunk) - step + 1, step))
+        return found >= self.min_speech_frames
+
+    def feed(self, chunk: bytes) -> Tuple[List[bytes], bool]:
+        """(чанки для распознавателя, закончилась ли фраза на этом чанке)."""
+        self.counts["chunks"] += 1
+        speech = self.is_speech(chunk)
+        if speech:
+            self.counts["speech"] += 1
+        if not self._active:
+            if not speech:
+                if self._preroll.maxlen:
+                    self._preroll.append(chunk)
+                self.counts["skipped"] += 1
+                return [], False
+            self._active, self._quiet = True, 0
+            self.counts["segments"] += 1
+            out = [*self._preroll, chunk]
+            self._preroll.clear()
+            self.counts["passed"] += len(out)
+            self.counts["skipped"] -= len(out) - 1  # preroll был посчитан пропущенным
+            return out, False
+        self._quiet = 0 if speech else self._quiet + 1
+        self.counts["passed"] += 1
+        if self._quiet >= self.hangover:
+            self._active = False
+            return [chunk], True
+        return [chunk], False
+
+
+def _text(result: str) -> str:
+    return json.loads(result).get("text", "").strip()
+
+
+class GatedRecognizer:
+    """recognize(data) для VoicePipeline: KaldiRecognizer за VoiceGate — тишину Kaldi не видит."""
+
+    def __init__(self, recognizer, gate: VoiceGate):
+        self.recognizer = recognizer
+        self.gate = gate
+        self._pending = False  # Kaldi получил звук, но фразу ещё не отдал
+
+    def __call__(self, data: bytes) -> Optional[str]:
+        chunks, ended = self.gate.feed(data)
+        texts = []
+        for chunk in chunks:
+            if self.recognizer.AcceptWaveform(chunk):
+                texts.append(_text(self.recognizer.Result()))
+                self._pending = False
+            else:
+                self._pending = True
+        if ended and self._pending:
+            texts.append(_text(self.recognizer.FinalResult()))
+            self._pending = False
+        return " ".join(t for t in texts if t) or None
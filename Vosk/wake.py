@@ -0,0 +1,89 @@
+"""
+wake.py — режим «Джарвис»: в LLM уходят только фразы, обращённые к ассистенту
+============================================================================
+Без обращения Джарвис отправлял в Ollama всё, что расслышал: разговор в
+комнате, телевизор, собственное эхо. WakeWord проверяет, что фраза
+обращена к нему:
+
+    «Джарвис, какая погода»        → да, вопрос «какая погода»;
+    «эй джарвис» … «какая погода»  → да: после одного «Джарвис» следующая
+                                     фраза в течение follow_up секунд
+                                     тоже считается обращением;
+    «какая погода, джарвис»        → да (обращение в конце);
+    «какая погода»                 → нет.
+
+Vosk редко пишет «Джарвис» ровно так («жарвис», «джарвиз», «jarvis»),
+поэтому слова сравниваются по фонетическому ключу из fuzzy_index
+с допуском в одну букву и с падежными окончаниями («джарвису»).
+"""
+from __future__ import annotations
+
+import re
+import time
+from typing import Callable, Iterable, List, Tuple
+
+try:
+    from models.fuzzy_index import _levenshtein, phonetic_key
+except ImportError:  # запуск из папки Vosk/
+    import sys
+    from os.path import dirname, abspath
+    sys.path.append(dirname(dirname(abspath(__file__))))
+    from models.fuzzy_index import _levenshtein, phonetic_key
+
+WAKE_WORDS = ("джарвис",)
+FOLLOW_UP_SECONDS = 8.0   # столько после обращения или ответа можно говорить без «Джарвис»
+MAX_LEADING = 2           # обращение ищем среди первых слов («эй, джарвис») и в последнем
+MAX_ENDING = 2            # «джарвису», «джарвиса»
+INTERJECTIONS = frozenset({"эй", "слушай", "привет", "ну", "окей", "ok", "hey"})
+
+_WORD = re.compile(r"\w+")
+
+
+class WakeWord:
+    """Проверка обращения и окно продолжения разговора."""
+
+    def __init__(self, words: Iterable[str] = WAKE_WORDS, follow_up: float = FOLLOW_UP_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.keys = [phonetic_key(word) for word in words]
+        self.follow_up = follow_up
+        self.clock = clock
+        self._until = 0.0
+
+    def is_wake(self, word: str) -> bool:
+        key = phonetic_key(word)
+        return any(
+            _levenshtein(key[:size], wake) <= 1
+            for wake in self.keys
+            for size in (len(wake) - 1, len(wake))  # «жарвис» — без одной буквы
+            if 0 <= len(key) - size <= MAX_ENDING
+        )
+
+    def strip(self, text: str) -> str | None:
+        """Фраза без обращения; None — обращения нет."""
+        words: List[str] = _WORD.findall(text.lower())
+        for i, word in enumerate(words[:MAX_LEADING]):
+            if self.is_wake(word) and all(w in INTERJECTIONS for w in words[:i]):
+                return " ".join(words[i + 1:])
+        if len(words) > 1 and self.is_wake(words[-1]):
+            return " ".join(words[:-1])
+        return None
+
+    def listening(self) -> bool:
+        """Открыто ли окно продолжения разговора."""
+        return self.clock() < self._until
+
+    def extend(self) -> None:
+        """Продлевает окно: после ответа можно переспросить без «Джарвис»."""
+        self._until = self.clock() + self.follow_up
+
+    def heard(self, text: str) -> bool:
+        """Обращена ли фраза к ассистенту (без побочных эффектов)."""
+        return self.strip(text) is not None or self.listening()
+
+    def check(self, text: str) -> Tuple[bool, str]:
+        """(обращена ли фраза, текст без обращения); обращение открывает окно продолжения."""
+        rest = self.strip(text)
+        if rest is not None:
+            self.extend()
+            return True, rest
+        return self.listening(), text
@@ -0,0 +1,136 @@
+"""
+bench_command_grammar.py — открытый словарь vs DualRecognizer (+ грамматика команд)
+
+Без vosk печатает только грамматику, собранную по настоящему индексу
+(indexer/app_index.json + aliases.json): сколько фраз, сколько времени
+занимает сборка списка и проверка «не изменился ли индекс».
+
+С установленным vosk, --model и --wav декодирует набор записей двумя
+способами:
+    open  — KaldiRecognizer с открытым словарём, как раньше в listen.py;
+    dual  — DualRecognizer: открытый словарь + грамматика команд.
+Для каждого печатает процессорное время на секунду звука, время от конца
+записи до готового текста, долю точных совпадений с эталоном и WER
+отдельно для команд и для прочих фраз.
+
+Набор WAV: 16 кГц моно 16-бит, рядом <имя>.json с эталонной расшифровкой
+{"text": "открой хром"}. Записать можно чем угодно; в конец каждой
+записи бенчмарк добавляет --tail-ms тишины, чтобы Vosk закончил фразу.
+
+Запуск
+------
+    python benchmarks/bench_command_grammar.py
+    python benchmarks/bench_command_grammar.py --model Vosk/vosk-model-small-ru-0.22 --wav recordings/commands
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Vosk"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+from command_grammar import CommandGrammar, DualRecognizer, is_command, model_vocabulary  # noqa: E402
+from synthetic_audio import read_wav  # noqa: E402
+
+try:
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+except ImportError:
+    KaldiRecognizer = None
+
+CHUNK = 4096
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    ref, hyp = reference.split(), hypothesis.split()
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def decode(recognizer, data: bytes, tail: bytes) -> tuple:
+    """(текст, процессорное время, задержка от конца речи до текста)."""
+    texts = []
+    cpu = time.process_time()
+    step = CHUNK * 2
+    speech_end = None
+    for start in range(0, len(data) + len(tail), step):
+        chunk = (data + tail)[start:start + step]
+        if start >= len(data) and speech_end is None:
+            speech_end = time.perf_counter()
+        if recognizer.AcceptWaveform(chunk):
+            texts.append(json.loads(recognizer.Result()).get("text", ""))
+    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    done = time.perf_counter()
+    return " ".join(t for t in texts if t), time.process_time() - cpu, done - (speech_end or done)
+
+
+def load_set(folder: pathlib.Path):
+    samples = []
+    for path in sorted(folder.glob("*.wav")):
+        labels = path.with_suffix(".json")
+        if not labels.exists():
+            continue
+        data, rate, _segments = read_wav(path)
+        samples.append((path.name, data, rate, json.loads(labels.read_text(encoding="utf-8"))["text"].lower()))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=pathlib.Path)
+    parser.add_argument("--wav", type=pathlib.Path, help="Папка с WAV и эталонными <имя>.json")
+    parser.add_argument("--tail-ms", type=float, default=800.0)
+    args = parser.parse_args()
+
+    vocabulary = model_vocabulary(args.model) if args.model else None
+    started = time.perf_counter()
+    grammar = CommandGrammar(None, vocabulary=vocabulary, store_path=None)
+    built = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(100):
+        grammar.refresh(force=False)
+        grammar._checked = 0.0
+    check = (time.perf_counter() - started) / 100
+    print(f"грамматика: {len(grammar.phrases)} фраз, сборка списка {built * 1000:.1f} мс, "
+          f"проверка индекса {check * 1e6:.0f} мкс" + ("" if vocabulary is None else f", словарь модели {len(vocabulary)}"))
+
+    if KaldiRecognizer is None or not args.model or not args.wav:
+        print("ℹ️ декодирование не измерено: нужны vosk, --model и --wav с размеченными записями")
+        return
+
+    SetLogLevel(-1)
+    model = Model(str(args.model))
+    grammar = CommandGrammar(model, vocabulary=vocabulary, store_path=None)
+    print(f"грамматический распознаватель собран за {grammar.build_seconds * 1000:.0f} мс")
+    samples = load_set(args.wav)
+    seconds = sum(len(data) / 2 / rate for _n, data, rate, _t in samples)
+    for label in ("open", "dual"):
+        rows = []
+        for name, data, rate, reference in samples:
+            tail = bytes(int(rate * args.tail_ms / 1000) * 2)
+            recognizer = KaldiRecognizer(model, rate)
+            if label == "dual":
+                recognizer = DualRecognizer(recognizer, grammar)
+            text, cpu, latency = decode(recognizer, data, tail)
+            rows.append((is_command(reference), text == reference, wer(reference, text), cpu, latency))
+        cpu = sum(r[3] for r in rows)
+        print(f"{label:<5} CPU {cpu / seconds:5.3f} с/с звука   до текста p50 "
+              f"{statistics.median(r[4] for r in rows) * 1000:6.1f} мс")
+        for kind, flag in (("команды", True), ("прочее", False)):
+            part = [r for r in rows if r[0] == flag]
+            if part:
+                print(f"      {kind:<8} n={len(part):<4} точно {sum(r[1] for r in part) / len(part):6.1%}   "
+                      f"WER {statistics.mean(r[2] for r in part):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+bench_command_matcher.py — поиск программы в команде: перебор app_mapping vs автомат
+
+Синтетический словарь на 10k+ синонимов (случайные слова из русских слогов)
+и набор команд вида «запусти <синоним>», 10% из них — без известной
+программы. Меряет на команду:
+    loop     — старый execute_command(): `synonym in text` по всему словарю;
+    matcher  — CommandMatcher.best(): один проход Ахо–Корасик;
+и время сборки автомата. Заодно проверяет, что «вар» не перекрывает
+«вартандер», а перебор — перекрывает.
+
+Запуск
+------
+    python benchmarks/bench_command_matcher.py
+    python benchmarks/bench_command_matcher.py --aliases 50000 --commands 2000
+"""
+import argparse
+import pathlib
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "models"))
+from command_matcher import CommandMatcher  # noqa: E402
+
+CONSONANTS = "бвгдзклмнпрстфхцчш"
+VOWELS = "аеиоуыэюя"
+TRIGGERS = ["запусти", "открой", "включи", "открыть"]
+
+
+def syllables(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(n))
+
+
+def synthetic(n: int, rng: random.Random) -> dict:
+    mapping = {"вар": "C:\\Games\\var.exe", "вартандер": "C:\\Games\\WarThunder\\aces.exe"}
+    while len(mapping) < n:
+        word = syllables(rng, rng.randint(2, 4))
+        if rng.random() < 0.2:
+            word += " " + syllables(rng, 2)
+        mapping[word] = f"C:\\Program Files\\App {len(mapping)}\\app.exe"
+    return mapping
+
+
+def legacy_best(mapping: dict, text: str):
+    for name, path in mapping.items():
+        if name in text:
+            return name, path
+    return None
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--aliases", type=int, default=10_000)
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mapping = synthetic(args.aliases, rng)
+    names = list(mapping)
+    # 10% команд без программы из словаря — перебору приходится пройти его целиком
+    commands = [
+        f"{rng.choice(TRIGGERS)} {rng.choice(names) if rng.random() < 0.9 else 'что-нибудь ещё'}"
+        for _ in range(args.commands)
+    ]
+
+    start = time.perf_counter()
+    matcher = CommandMatcher(mapping)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(matcher)} синонимов, сборка автомата {build_ms:.0f} мс")
+
+    results = {}
+    for label, find in (
+        ("loop", lambda text: legacy_best(mapping, text)),
+        ("matcher", matcher.best),
+    ):
+        samples = []
+        for text in commands:
+            t0 = time.perf_counter()
+            find(text)
+            samples.append((time.perf_counter() - t0) * 1e6)
+        results[label] = percentiles(samples)
+        p50, p99 = results[label]
+        print(f"{label:<8} p50 {p50:9.1f} мкс   p99 {p99:9.1f} мкс")
+
+    print(f"ускорение по медиане: ×{results['loop'][0] / results['matcher'][0]:.0f}")
+
+    text = "запусти вартандер"
+    print(f"«{text}»: loop → {legacy_best(mapping, text)[0]}, matcher → {matcher.best(text).pattern}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+bench_fuzzy_index.py — нечёткий поиск «расслышанных» названий: скорость и точность
+
+Для 1k…10k синтетических программ (русские названия из слогов и латинские
+с транслитерацией) генерирует «ошибки распознавания» — оглушение/озвончение,
+замену гласной, выпадение буквы — и меряет:
+    build    — сборку FuzzyIndex;
+    p50/p99  — задержку lookup() на запрос;
+    top-1    — долю запросов, где первой найдена задуманная программа
+               (и уверенность ≥ MIN_CONFIDENCE).
+
+Запуск
+------
+    python benchmarks/bench_fuzzy_index.py
+    python benchmarks/bench_fuzzy_index.py --sizes 5000 --queries 2000
+"""
+import argparse
+import pathlib
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "models"))
+import fuzzy_index  # noqa: E402
+
+CONSONANTS = "бвгдзклмнпрстфхчш"
+VOWELS = "аеиоуыя"
+LATIN_CONSONANTS = "bdfgklmnprstvz"
+LATIN_VOWELS = "aeiou"
+# что Vosk путает чаще всего: пары звонкий/глухой и близкие гласные
+CONFUSIONS = {
+    "б": "п", "п": "б", "в": "ф", "ф": "в", "г": "к", "к": "г", "д": "т", "т": "д",
+    "з": "с", "с": "з", "м": "в", "о": "а", "а": "о", "е": "и", "и": "е", "ы": "и",
+}
+
+
+def synthetic(n: int, rng: random.Random) -> dict:
+    names = {}
+    while len(names) < n:
+        if rng.random() < 0.7:
+            word = "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 4)))
+        else:
+            word = "".join(rng.choice(LATIN_CONSONANTS) + rng.choice(LATIN_VOWELS) for _ in range(rng.randint(2, 4)))
+        names[word] = f"C:\\Program Files\\App {len(names)}\\app.exe"
+    return names
+
+
+def mishear(word: str, rng: random.Random) -> str:
+    """Одна типичная ошибка распознавания в русском слове."""
+    spots = [i for i, ch in enumerate(word) if ch in CONFUSIONS]
+    if spots and rng.random() < 0.8:
+        i = rng.choice(spots)
+        return word[:i] + CONFUSIONS[word[i]] + word[i + 1:]
+    i = rng.randrange(1, len(word))
+    return word[:i] + word[i + 1:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10_000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'программ':>9} {'build':>9} {'p50':>9} {'p99':>9} {'top-1':>7}")
+    for n in args.sizes:
+        rng = random.Random(args.seed)
+        names = synthetic(n, rng)
+        cyrillic = [w for w in names if w[0] in CONSONANTS]
+
+        start = time.perf_counter()
+        index = fuzzy_index.FuzzyIndex(names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        samples, hits = [], 0
+        for _ in range(args.queries):
+            expected = rng.choice(cyrillic)
+            heard = mishear(expected, rng)
+            t0 = time.perf_counter()
+            found = index.lookup(heard)
+            samples.append((time.perf_counter() - t0) * 1000)
+            if found and found[0].confidence >= fuzzy_index.MIN_CONFIDENCE \
+                    and fuzzy_index.phonetic_key(found[0].name) == fuzzy_index.phonetic_key(expected):
+                hits += 1
+
+        samples.sort()
+        p50, p99 = statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+        print(f"{n:>9} {build_ms:>7.0f}мс {p50:>7.3f}мс {p99:>7.3f}мс {hits / args.queries:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
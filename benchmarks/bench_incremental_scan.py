@@ -0,0 +1,68 @@
+"""
+bench_incremental_scan.py — холодное vs тёплое сканирование app_indexer
+
+Строит синтетическое дерево (много папок, в каждой несколько .exe/.py/.txt),
+затем замеряет:
+    1) cold  — scan_folders() с пустым манифестом (как --full);
+    2) warm  — повторный запуск с манифестом, ничего не менялось;
+    3) touch — в одной папке появился новый файл.
+
+Запуск
+------
+    python benchmarks/bench_incremental_scan.py            # 2000 папок
+    python benchmarks/bench_incremental_scan.py --dirs 20000
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import pathlib
+
+# app_indexer импортирует соседние модули (alias_store, scoring, …) как модули верхнего уровня
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "indexer"))
+import app_indexer  # noqa: E402
+
+
+def build_tree(root: pathlib.Path, n_dirs: int, files_per_dir: int = 5) -> None:
+    """Создаёт n_dirs папок вида vendor_i/app_j с мелкими файлами."""
+    for i in range(n_dirs):
+        d = root / f"vendor_{i // 50}" / f"app_{i}"
+        d.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_dir):
+            ext = (".exe", ".py", ".txt")[j % 3]
+            (d / f"tool_{j}{ext}").write_bytes(b"x" * 64)
+        (d / f"app_{i}.exe").write_bytes(b"x" * 64)
+
+
+def timed(label: str, fn) -> float:
+    """Замеряет fn(), глуша её вывод («🔍 Сканируем: …»)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<6} {elapsed * 1000:10.1f} мс")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dirs", type=int, default=2000, help="Количество папок в дереве")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        build_tree(root, args.dirs)
+        print(f"Дерево: {args.dirs} папок в {root}")
+
+        manifest: dict = {}
+        cold = timed("cold", lambda: app_indexer.scan_folders([root], manifest))
+        warm = timed("warm", lambda: app_indexer.scan_folders([root], manifest))
+        (root / "vendor_0" / "app_0" / "new_app.exe").write_bytes(b"x")
+        timed("touch", lambda: app_indexer.scan_folders([root], manifest))
+        print(f"ускорение warm/cold: ×{cold / max(warm, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+bench_index_load.py — время загрузки индекса: app_index.json vs app_index.bin
+
+Для 10k…100k синтетических программ (и по 3 синонима на каждую) меряет:
+    json      — json.load() индекса и синонимов + сборка словаря синонимов
+                (то, что делал AppLauncher при каждом старте);
+    store     — json.load() индекса + alias_store.load() с готовым кэшем
+                и его alias_map (синонимы уже скомпилированы);
+    bin open  — load_index(): mmap + заголовок, без распаковки;
+    bin full  — to_dict() + alias_map(): всё, что нужно AppLauncher;
+    bin get   — один поиск по ключу в открытом индексе (двоичный поиск).
+
+Запуск
+------
+    python benchmarks/bench_index_load.py
+    python benchmarks/bench_index_load.py --sizes 10000 50000
+"""
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "indexer"))
+import alias_store  # noqa: E402
+import index_format  # noqa: E402
+
+REPEAT = 5
+
+
+def synthetic(n: int):
+    index = {f"app{i:06d}": f"C:\\Program Files\\Vendor {i % 300}\\App {i}\\app{i:06d}.exe" for i in range(n)}
+    aliases = {key: [f"прога {i}", f"апп {i}", f"app {i}"] for i, key in enumerate(index)}
+    return index, aliases
+
+
+def best_of(fn) -> float:
+    """Лучшее время из REPEAT прогонов, мс."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'записей':>8} {'json':>10} {'store':>10} {'bin open':>10} {'bin full':>10} {'bin get':>10}   размер json/bin")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            index, aliases = synthetic(n)
+            json_path = pathlib.Path(tmp) / f"index_{n}.json"
+            bin_path = json_path.with_suffix(".bin")
+            json_path.write_text(json.dumps(index, ensure_ascii=False, indent=4), encoding="utf-8")
+            index_format.write_index(bin_path, index, None, index_format.build_alias_map(index, aliases))
+            aliases_path = json_path.with_name(f"aliases_{n}.json")
+            store_path = json_path.with_name(f"alias_store_{n}.json")
+            alias_store.write_aliases(aliases, aliases_path)
+            alias_store.load(aliases_path, json_path, store_path)  # прогрев кэша
+
+            def load_json():
+                with open(json_path, encoding="utf-8") as f:
+                    paths = json.load(f)
+                index_format.build_alias_map(paths, alias_store.read_aliases(aliases_path))
+
+            def load_store():
+                with open(json_path, encoding="utf-8") as f:
+                    json.load(f)
+                alias_store.load(aliases_path, json_path, store_path).alias_map
+
+            def open_bin():
+                index_format.load_index(bin_path).close()
+
+            def full_bin():
+                with index_format.load_index(bin_path) as compact:
+                    compact.to_dict()
+                    compact.alias_map()
+
+            compact = index_format.load_index(bin_path)
+            probe = f"app{n // 2:06d}"
+            get_ms = best_of(lambda: compact[probe])
+            compact.close()
+
+            print(f"{n:>8} {best_of(load_json):>8.1f}мс {best_of(load_store):>8.1f}мс {best_of(open_bin):>8.2f}мс "
+                  f"{best_of(full_bin):>8.1f}мс {get_ms * 1000:>7.1f}мкс   "
+                  f"{json_path.stat().st_size // 1024} КБ / {bin_path.stat().st_size // 1024} КБ")
+
+
+if __name__ == "__main__":
+    main()
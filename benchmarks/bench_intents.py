@@ -0,0 +1,79 @@
+"""
+bench_intents.py — разбор намерений: скорость и точность IntentEngine
+
+Прогоняет небольшой размеченный корпус фраз (намерение, слот) через
+IntentEngine без классификатора (только грамматика глаголов) и с ним
+и печатает p50/p99 разбора и долю верных намерений/слотов. Фразы, которые
+ушли в ask, — это те, на которые раньше всегда тратился запрос к Ollama.
+
+Запуск
+------
+    python benchmarks/bench_intents.py
+    python benchmarks/bench_intents.py --repeat 2000
+"""
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "models"))
+import intents  # noqa: E402
+
+CORPUS = [
+    ("открой хром", intents.LAUNCH, "хром"),
+    ("запусти, пожалуйста, стим", intents.LAUNCH, "стим"),
+    ("включи мне телеграм", intents.LAUNCH, "телеграм"),
+    ("джарвис открой блокнот", intents.LAUNCH, "блокнот"),
+    ("закрой дискорд", intents.CLOSE, "дискорд"),
+    ("выключи музыку", intents.CLOSE, "музыку"),
+    ("заверши вартандер", intents.CLOSE, "вартандер"),
+    ("переключись на браузер", intents.SWITCH, "браузер"),
+    ("разверни телеграм", intents.SWITCH, "телеграм"),
+    ("найди рецепт блинов в интернете", intents.SEARCH, "рецепт блинов"),
+    ("загугли курс доллара", intents.SEARCH, "курс доллара"),
+    ("поищи погоду в москве", intents.SEARCH, "погоду в москве"),
+    ("хочу поиграть в стим", intents.LAUNCH, None),
+    ("вернись в браузер", intents.SWITCH, None),
+    ("как дела", intents.ASK, None),
+    ("расскажи анекдот про программистов", intents.ASK, None),
+    ("сколько будет семь умножить на восемь", intents.ASK, None),
+    ("почему трава зелёная", intents.ASK, None),
+    ("как остановить кровотечение", intents.ASK, None),
+    ("как перейти на новую работу", intents.ASK, None),
+]
+
+
+def run(engine: intents.IntentEngine, repeat: int) -> str:
+    samples = []
+    right_intent = right_slot = slots = 0
+    for text, expected, slot in CORPUS:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            parsed = engine.parse(text)
+            samples.append(time.perf_counter() - started)
+        right_intent += parsed.name == expected
+        if slot is not None:
+            slots += 1
+            right_slot += parsed.slot == slot
+    samples.sort()
+    p50 = statistics.median(samples) * 1e6
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6
+    return (f"p50 {p50:6.1f} мкс  p99 {p99:6.1f} мкс  намерение {right_intent}/{len(CORPUS)}  "
+            f"слот {right_slot}/{slots}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    classifier = intents.IntentClassifier()
+    print(f"обучение классификатора: {(time.perf_counter() - started) * 1000:.2f} мс")
+    print(f"grammar     {run(intents.IntentEngine({}), args.repeat)}")
+    print(f"+classifier {run(intents.IntentEngine({}, classifier=classifier), args.repeat)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+bench_launcher.py — горячий путь AppLauncher на синтетических каталогах 100…100k
+
+Для каждого размера каталога (synthetic_apps.catalog) пишет app_index.json
+и aliases.json во временную папку и меряет:
+    build    — конструктор AppLauncher: чтение индекса, компиляция
+               alias_store, build_app_mapping() (автомат + нечёткий индекс);
+    mapping  — отдельно build_app_mapping();
+    memory   — сколько памяти удерживает готовый AppLauncher (tracemalloc)
+               и пик во время сборки;
+    p50/p99  — execute_command() на корпусе команд (synthetic_apps.commands);
+    accuracy — доля фраз, после которых запущена ожидаемая программа
+               (или ничего не запущено для unknown/chat), по видам команд.
+
+subprocess.Popen подменён заглушкой — процессы не создаются, бенчмарк
+работает без окон и на Linux.
+
+Запуск
+------
+    python benchmarks/bench_launcher.py
+    python benchmarks/bench_launcher.py --sizes 100 1000 10000 100000 --commands 5000
+"""
+import argparse
+import itertools
+import json
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+import synthetic_apps  # noqa: E402
+from indexer import alias_store, usage_stats  # noqa: E402
+from models.app_launcher import AppLauncher  # noqa: E402
+from models.launch_service import LaunchService  # noqa: E402
+
+_pids = itertools.count(10_000)
+
+
+class StubProcess:
+    """Вместо subprocess.Popen: «процесс» сразу завершился, ничего не запускается."""
+
+    def __init__(self, path):
+        self.args = path
+        self.pid = next(_pids)
+
+    def poll(self):
+        return 0
+
+    def terminate(self):
+        pass
+
+
+class RecordingLaunches(LaunchService):
+    """Настоящий LaunchService с заглушкой Popen, который помнит последний запрошенный путь."""
+
+    def __init__(self):
+        super().__init__(dedup_window=0.0, spawn=StubProcess)
+        self.last = None
+
+    def launch(self, name, path):
+        self.last = path
+        return super().launch(name, path)
+
+
+def build(tmp: pathlib.Path) -> AppLauncher:
+    index_path = tmp / "app_index.json"
+    store = alias_store.load(tmp / "aliases.json", index_path, store_path=None)
+    return AppLauncher(index_path=index_path, aliases=store, launches=RecordingLaunches(),
+                       usage=usage_stats.UsageStats(None))
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'программ':>9} {'build':>9} {'mapping':>9} {'память':>9} {'пик':>9} "
+          f"{'p50':>8} {'p99':>8} {'точность':>9}  по видам")
+    for n in args.sizes:
+        index, aliases = synthetic_apps.catalog(n, args.seed)
+        corpus = synthetic_apps.commands(index, aliases, args.commands, args.seed + 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = pathlib.Path(tmp)
+            (tmp / "app_index.json").write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+            (tmp / "aliases.json").write_text(json.dumps(aliases, ensure_ascii=False), encoding="utf-8")
+
+            start = time.perf_counter()
+            launcher = build(tmp)
+            build_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            launcher.build_app_mapping()
+            mapping_ms = (time.perf_counter() - start) * 1000
+            launcher.launches.shutdown()
+            del launcher
+
+            # память — отдельной сборкой: tracemalloc сильно замедляет аллокации
+            tracemalloc.start()
+            launcher = build(tmp)
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        samples, right, total = [], Counter(), Counter()
+        for text, expected, kind in corpus:
+            launcher.launches.last = None
+            start = time.perf_counter()
+            launcher.execute_command(text)
+            samples.append(time.perf_counter() - start)
+            wanted = index[expected] if expected else None
+            right[kind] += launcher.launches.last == wanted
+            total[kind] += 1
+        launcher.launches.shutdown()
+
+        samples.sort()
+        by_kind = " ".join(f"{kind} {right[kind] / total[kind]:.0%}" for kind in synthetic_apps.MIX if total[kind])
+        print(f"{n:>9} {build_ms:>7.0f}мс {mapping_ms:>7.0f}мс {retained / 1_048_576:>7.1f}МБ "
+              f"{peak / 1_048_576:>7.1f}МБ {statistics.median(samples) * 1000:>6.2f}мс "
+              f"{percentile(samples, 0.99) * 1000:>6.2f}мс {sum(right.values()) / len(corpus):>9.1%}  {by_kind}")
+
+
+if __name__ == "__main__":
+    main()
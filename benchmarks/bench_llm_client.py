@@ -0,0 +1,115 @@
+"""
+bench_llm_client.py — LLMClient: соединение на каждый ход vs keep-alive пул, и отмена
+
+Поднимает заглушку Ollama (llm_standin.py), у которой каждое новое
+соединение стоит --connect-ms (как TCP+TLS-рукопожатие до удалённого
+сервера), и гоняет --turns голосовых ходов подряд:
+    fresh   — LLMClient(pool_size=0): новое соединение на каждый запрос,
+              как прежний requests.post() без сессии;
+    pooled  — LLMClient с пулом и warm(): соединение открыто заранее
+              и переиспользуется.
+Печатает p50/p99 времени ответа, первого токена потока и сколько
+соединений открыл сервер.
+
+Затем проверяет перебивание: запускает длинный поток, через --cancel-ms
+зовёт CancelToken.cancel() и меряет, за сколько stream() и complete()
+вернули управление.
+
+Запуск
+------
+    python benchmarks/bench_llm_client.py
+    python benchmarks/bench_llm_client.py --connect-ms 150 --turns 30
+"""
+import argparse
+import pathlib
+import statistics
+import sys
+import threading
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+from llm_standin import StandinServer  # noqa: E402
+from models.llm_client import CancelToken, Cancelled, LLMClient, OllamaBackend  # noqa: E402
+
+
+def percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def run_turns(client: LLMClient, turns: int) -> tuple:
+    complete, first = [], []
+    for _ in range(turns):
+        started = time.perf_counter()
+        client.complete("вопрос")
+        complete.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        tokens = client.stream("вопрос")
+        next(tokens)
+        first.append(time.perf_counter() - started)
+        for _ in tokens:
+            pass
+    return complete, first
+
+
+def cancel_latency(client: LLMClient, after: float, streaming: bool) -> float:
+    token = CancelToken()
+    done = []
+
+    def run():
+        try:
+            if streaming:
+                for _ in client.stream("вопрос", token):
+                    pass
+            else:
+                client.complete("вопрос", token)
+        except Cancelled:
+            pass
+        done.append(time.perf_counter())
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(after)
+    cancelled_at = time.perf_counter()
+    token.cancel()
+    thread.join()
+    return done[0] - cancelled_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connect-ms", type=float, default=80.0, help="Цена нового соединения")
+    parser.add_argument("--first-token-ms", type=float, default=20.0)
+    parser.add_argument("--token-ms", type=float, default=1.0)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--cancel-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    with StandinServer(latency=args.first_token_ms / 1000, token_delay=args.token_ms / 1000,
+                       connect_delay=args.connect_ms / 1000) as server:
+        backend = OllamaBackend(server.ollama_url)
+        for label, client in (("fresh", LLMClient(backend, pool_size=0)), ("pooled", LLMClient(backend))):
+            before = server.connections
+            if label == "pooled":
+                client.warm()
+            complete, first = run_turns(client, args.turns)
+            print(f"{label:<7} ответ p50 {statistics.median(complete) * 1000:7.1f} мс  "
+                  f"p99 {percentile(complete, 0.99) * 1000:7.1f} мс   первый токен p50 "
+                  f"{statistics.median(first) * 1000:7.1f} мс   соединений {server.connections - before} "
+                  f"на {2 * args.turns} запросов")
+            client.close()
+
+        server.token_delay = 0.05  # длинный ответ, который будем перебивать
+        client = LLMClient(backend)
+        for streaming in (True, False):
+            latency = cancel_latency(client, args.cancel_ms / 1000, streaming)
+            print(f"отмена {'stream()' if streaming else 'complete()':<10} вернул управление через "
+                  f"{latency * 1000:.1f} мс")
+        client.complete("вопрос")
+        print(f"после отмен: {client.stats()}")
+
+
+if __name__ == "__main__":
+    main()
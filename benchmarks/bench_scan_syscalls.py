@@ -0,0 +1,181 @@
+"""
+bench_scan_syscalls.py — сколько stat() и времени уходит на 100k файлов
+
+Сравнивает два обхода одного и того же синтетического дерева:
+    legacy  — прежний цикл: os.walk + pathlib.Path на каждый файл +
+              score_exe() с двумя path.stat();
+    scandir — текущий app_indexer.scan_folders(): os.scandir, размер и
+              mtime из DirEntry.stat(), не больше одного stat на файл.
+
+Время меряется на «чистом» прогоне, системные вызовы — на отдельном,
+где os.stat / os.scandir подменены счётчиками (strace есть не везде).
+
+Запуск
+------
+    python benchmarks/bench_scan_syscalls.py              # 100k файлов
+    python benchmarks/bench_scan_syscalls.py --files 20000
+"""
+import argparse
+import contextlib
+import io
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "indexer"))
+import app_indexer  # noqa: E402
+
+FILES_PER_DIR = 50
+
+
+# ╔═══════════════════════════════════════╗
+# ║      Э Т А Л О Н  (прежний код)       ║
+# ╚═══════════════════════════════════════╝
+LEGACY_STOPWORDS = {
+    "uninstall", "update", "setup", "helper", "crash",
+    "service", "patch", "install", "debug"
+}
+LEGACY_BAD_DIR_PARTS = {
+    "update", "installer", "redist", "patcher",
+    "resources", "bin", "debug", "x64", "x86"
+}
+
+
+def legacy_score(path: pathlib.Path) -> int:
+    """score_exe() до перехода на os.scandir — ради двух path.stat()."""
+    score = 0
+    stem = path.stem.lower()
+    if stem == path.parent.stem.lower().replace(" ", ""):
+        score += 10
+    if stem in app_indexer.ALIASES:
+        score += 8
+    if any(w in stem for w in LEGACY_STOPWORDS):
+        score -= 10
+    if any(part.lower() in LEGACY_BAD_DIR_PARTS for part in path.parts):
+        score -= 5
+    if path.stat().st_size / 1_048_576 < 3:
+        score -= 10
+    if (time.time() - path.stat().st_mtime) / (30 * 24 * 3600) > 1:
+        score -= 3
+    if path.suffix.lower() == ".url" and "steam" in str(path).lower():
+        score += 15
+    return score
+
+
+def legacy_scan(start_paths):
+    results = {}
+    for base in start_paths:
+        for root, dirs, files in os.walk(base):
+            dirs[:] = [d for d in dirs if d.lower() not in app_indexer.SKIP_DIR_NAMES]
+            for file in files:
+                if not file.lower().endswith(app_indexer.TARGET_EXTENSIONS):
+                    continue
+                p = pathlib.Path(root) / file
+                key = p.stem.lower().replace(" ", "")
+                if legacy_score(p) >= 3 and (
+                    key not in results or p.suffix.lower() == ".exe"
+                ):
+                    results[key] = str(p)
+    return results
+
+
+# ╔═══════════════════════════════════════╗
+# ║        С Ч Ё Т Ч И К  S T A T         ║
+# ╚═══════════════════════════════════════╝
+class _CountingEntry:
+    """Обёртка над DirEntry: считает первый stat() (дальше он кэширован)."""
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+        self._stat = None
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def stat(self, *args, **kwargs):
+        if self._stat is None:
+            self._counter["stat"] += 1
+            self._stat = self._entry.stat(*args, **kwargs)
+        return self._stat
+
+
+@contextlib.contextmanager
+def count_syscalls():
+    counter = {"stat": 0, "scandir": 0}
+    real_stat, real_scandir = os.stat, os.scandir
+
+    def stat(*args, **kwargs):
+        counter["stat"] += 1
+        return real_stat(*args, **kwargs)
+
+    class _Scandir:
+        """Итератор как у os.scandir, но отдаёт _CountingEntry."""
+
+        def __init__(self, path="."):
+            counter["scandir"] += 1
+            self._it = real_scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._it.close()
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            return _CountingEntry(next(self._it), counter)
+
+        def close(self):
+            self._it.close()
+
+    os.stat, os.scandir = stat, _Scandir
+    try:
+        yield counter
+    finally:
+        os.stat, os.scandir = real_stat, real_scandir
+
+
+# ╔═══════════════════════════════════════╗
+# ║              З А П У С К              ║
+# ╚═══════════════════════════════════════╝
+def build_tree(root: pathlib.Path, n_files: int) -> None:
+    for i in range(0, n_files, FILES_PER_DIR):
+        d = root / f"vendor_{i // 5000}" / f"app_{i}"
+        d.mkdir(parents=True, exist_ok=True)
+        for j in range(FILES_PER_DIR):
+            ext = (".exe", ".py", ".dll", ".txt")[j % 4]
+            (d / f"file_{j}{ext}").write_bytes(b"")
+
+
+def measure(label: str, fn, root: pathlib.Path, n_files: int) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fn([root])
+        elapsed = time.perf_counter() - start
+        with count_syscalls() as counter:
+            fn([root])
+    per_100k = 100_000 / n_files
+    print(f"{label:<8} {elapsed * per_100k * 1000:9.1f} мс/100k  "
+          f"stat: {counter['stat'] * per_100k:9.0f}/100k  scandir: {counter['scandir']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100_000, help="Всего файлов в дереве")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        build_tree(root, args.files)
+        print(f"Дерево: {args.files} файлов, из них с нужным расширением ~{args.files // 2}")
+        measure("legacy", legacy_scan, root, args.files)
+        measure("scandir", app_indexer.scan_folders, root, args.files)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+bench_shortcuts.py — разбор .lnk: чистый парсер и кэш ShortcutResolver
+
+Генерирует N синтетических ярлыков в формате MS-SHLLINK (LinkInfo с
+Unicode-путём, как пишет Explorer) и меряет:
+    parse  — shortcuts.read_lnk_target() на каждый файл (холодный скан);
+    cold   — ShortcutResolver.resolve() с пустым кэшем;
+    warm   — повторный resolve() после save()/load() кэша (следующий запуск);
+    com    — IShellLinkW с одним экземпляром на поток (только на Windows).
+
+Запуск
+------
+    python benchmarks/bench_shortcuts.py
+    python benchmarks/bench_shortcuts.py --links 20000
+"""
+import argparse
+import pathlib
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "indexer"))
+import shortcuts  # noqa: E402
+
+_HAS_LINK_INFO = 0x02
+_IS_UNICODE = 0x80
+
+
+def make_lnk(target: str) -> bytes:
+    """Минимальный ярлык: заголовок + LinkInfo (VolumeID, ANSI- и Unicode-путь)."""
+    header = struct.pack(
+        "<I16sIIQQQIiIHHII",
+        0x4C, shortcuts._LINK_CLSID, _HAS_LINK_INFO | _IS_UNICODE, 0x20,
+        0, 0, 0, 0, 0, 1, 0, 0, 0, 0,
+    )
+    volume_id = struct.pack("<IIII", 0x11, 3, 0x1234ABCD, 0x10) + b"\0"
+    base_ansi = target.encode("cp1251", errors="replace") + b"\0"
+    base_unicode = target.encode("utf-16-le") + b"\0\0"
+    header_size = 0x24
+    vol_off = header_size
+    base_off = vol_off + len(volume_id)
+    suffix_off = base_off + len(base_ansi)
+    unicode_base_off = suffix_off + 1
+    unicode_suffix_off = unicode_base_off + len(base_unicode)
+    body = volume_id + base_ansi + b"\0" + base_unicode + b"\0\0"
+    size = header_size + len(body)
+    link_info = struct.pack(
+        "<9I", size, header_size, 0x1, vol_off, base_off, 0, suffix_off,
+        unicode_base_off, unicode_suffix_off,
+    ) + body
+    return header + link_info + b"\0\0\0\0"  # TerminalBlock
+
+
+def timed(label: str, n: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<6} {elapsed * 1000:9.1f} мс  ({elapsed / n * 1e6:6.1f} мкс/ярлык)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", type=int, default=5000, help="Количество ярлыков")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        links = []
+        for i in range(args.links):
+            target = f"C:\\Program Files\\Издатель {i % 50}\\Игра {i}\\game{i}.exe"
+            path = root / f"Игра {i}.lnk"
+            path.write_bytes(make_lnk(target))
+            links.append(str(path))
+
+        sample = shortcuts.read_lnk_target(links[-1])
+        assert sample and sample.endswith(f"game{args.links - 1}.exe"), sample
+        print(f"{args.links} ярлыков, пример цели: {sample}")
+
+        timed("parse", args.links, lambda: [shortcuts.read_lnk_target(p) for p in links])
+
+        cache = root / "shortcut_cache.json"
+        cold = shortcuts.ShortcutResolver(cache, use_com=False)
+        timed("cold", args.links, lambda: [cold.resolve(p) for p in links])
+        cold.save()
+
+        warm = shortcuts.ShortcutResolver(cache, use_com=False)
+        warm.load()
+        timed("warm", args.links, lambda: [warm.resolve(p) for p in links])
+        print(f"кэш: {warm.stats()}")
+
+        if sys.platform == "win32":
+            timed("com", args.links, lambda: [shortcuts.com_resolve(p) for p in links])
+        else:
+            print("com    пропущено (не Windows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+bench_streaming_tts.py — время до первого звука: ответ целиком vs поток по предложениям
+
+Поднимает заглушку Ollama (llm_standin.py, /api/generate), которая отдаёт
+заданный текст по токену раз в --token-ms после задержки --first-token-ms,
+и сравнивает:
+    blocking   — как раньше: "stream": false, озвучка после всего ответа;
+    streaming  — NDJSON-поток → streaming.sentences() → озвучка каждого
+                 предложения в отдельном потоке, пока модель пишет дальше.
+
+Озвучка имитируется паузой по длине текста (--tts-cps символов в секунду).
+Печатает p50 времени до первого звука и до конца речи.
+
+Запуск
+------
+    python benchmarks/bench_streaming_tts.py
+    python benchmarks/bench_streaming_tts.py --token-ms 60 --runs 10
+"""
+import argparse
+import json
+import pathlib
+import queue
+import statistics
+import sys
+import threading
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Vosk"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+from llm_standin import StandinServer, generate_lines  # noqa: E402
+from streaming import ollama_tokens, sentences  # noqa: E402
+
+
+def run_blocking(url: str, speak) -> tuple:
+    started = time.perf_counter()
+    text = json.loads(b"".join(generate_lines(url, "вопрос", stream=False)))["response"]
+    first = time.perf_counter() - started
+    speak(text)
+    return first, time.perf_counter() - started, 1
+
+
+def run_streaming(url: str, speak) -> tuple:
+    started = time.perf_counter()
+    pieces: "queue.Queue[str | None]" = queue.Queue()
+    first = []
+
+    def speaker():
+        while True:
+            piece = pieces.get()
+            if piece is None:
+                return
+            if not first:
+                first.append(time.perf_counter() - started)
+            speak(piece)
+
+    thread = threading.Thread(target=speaker)
+    thread.start()
+    count = 0
+    for piece in sentences(ollama_tokens(generate_lines(url, "вопрос"))):
+        pieces.put(piece)
+        count += 1
+    pieces.put(None)
+    thread.join()
+    return first[0], time.perf_counter() - started, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=40.0)
+    parser.add_argument("--tts-cps", type=float, default=15.0, help="Скорость речи TTS, символов/с")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    def speak(text):
+        time.sleep(len(text) / args.tts_cps)
+
+    with StandinServer(latency=args.first_token_ms / 1000, token_delay=args.token_ms / 1000) as server:
+        for label, run in (("blocking", run_blocking), ("streaming", run_streaming)):
+            results = [run(server.ollama_url, speak) for _ in range(args.runs)]
+            first = statistics.median(r[0] for r in results) * 1000
+            done = statistics.median(r[1] for r in results) * 1000
+            print(f"{label:<10} первый звук p50 {first:7.0f} мс   конец речи p50 {done:7.0f} мс   "
+                  f"кусков {results[0][2]}")
+
+
+if __name__ == "__main__":
+    main()
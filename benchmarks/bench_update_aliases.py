@@ -0,0 +1,79 @@
+"""
+bench_update_aliases.py — генерация синонимов: по ключу за раз vs пакеты параллельно
+
+Поднимает локальную заглушку LLM (llm_standin.py) с задержкой ответа,
+ограничением одновременных запросов (429) и случайными ошибками 500
+и прогоняет synonym_batch.generate() для N синтетических ключей:
+    serial   — как раньше: один ключ на запрос, строго по очереди;
+    batched  — по --batch-size ключей на запрос, --workers параллельно,
+               с токен-бакетом и повторами;
+    cached   — повторный прогон с SynonymCache (SQLite) после небольшой
+               правки индекса (+5% новых ключей): к модели идут только новые.
+
+Запуск
+------
+    python benchmarks/bench_update_aliases.py
+    python benchmarks/bench_update_aliases.py --keys 500 --latency 0.2 --error-rate 0.1
+"""
+import argparse
+import pathlib
+import sys
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "indexer"))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+import synonym_batch  # noqa: E402
+import synonym_cache  # noqa: E402
+from llm_standin import StandinServer, chat_complete  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Задержка ответа заглушки, сек.")
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--drop-rate", type=float, default=0.02)
+    parser.add_argument("--max-inflight", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=synonym_batch.BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=synonym_batch.WORKERS)
+    parser.add_argument("--rate", type=float, default=20.0)
+    args = parser.parse_args()
+
+    keys = [f"app{i:04d}" for i in range(args.keys)]
+    modes = [
+        ("serial", dict(batch_size=1, workers=1, rate=1e9, burst=1)),
+        ("batched", dict(batch_size=args.batch_size, workers=args.workers, rate=args.rate,
+                         burst=args.workers)),
+    ]
+    for label, options in modes:
+        with StandinServer(latency=args.latency, max_inflight=args.max_inflight,
+                           error_rate=args.error_rate, drop_rate=args.drop_rate) as server:
+            stats = synonym_batch.BatchStats()
+            result = synonym_batch.generate(
+                keys, lambda prompt: chat_complete(server.url, prompt),
+                backoff=0.05, stats=stats, **options,
+            )
+            answered = sum(1 for key in keys if result[key] != [key])
+            print(f"{label:<8} {stats.report()}; получено {answered}/{len(keys)}, "
+                  f"429 от сервера {server.rejected}, пик одновременных {server.peak_inflight}")
+
+    options = modes[1][1]
+    grown = keys + [f"new{i:04d}" for i in range(max(1, args.keys // 20))]
+    with tempfile.TemporaryDirectory() as tmp, \
+            StandinServer(latency=args.latency, max_inflight=args.max_inflight) as server:
+        cache = synonym_cache.SynonymCache("standin", synonym_cache.template_hash(synonym_batch.BATCH_PROMPT),
+                                           path=pathlib.Path(tmp) / "cache.sqlite3")
+        for run, run_keys in (("cold", keys), ("cached", grown)):
+            stats = synonym_batch.BatchStats()
+            answers = cache.get_many(run_keys)
+            missing = [key for key in run_keys if key not in answers]
+            generated = synonym_batch.generate(missing, lambda prompt: chat_complete(server.url, prompt),
+                                               backoff=0.05, stats=stats, **options)
+            cache.put_many(generated)
+            print(f"{run:<8} {stats.report()}; из кэша {len(answers)}/{len(run_keys)}")
+        print(f"кэш: {cache.report()}")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+bench_vad.py — VoiceGate перед Kaldi: сколько звука отсеяно, чего это стоит и что потеряно
+
+На WAV-фикстурах с разметкой речи (synthetic_audio.py или свои записи
+с <имя>.json рядом) режет звук на чанки как listen.py (--chunk отсчётов)
+и для каждого VAD (energy, webrtc — если установлен) печатает:
+    passed       — доля чанков, дошедших до Kaldi (остальное — тишина, которую
+                   раньше декодировали зря);
+    recall       — доля размеченных речевых чанков, которые VAD пропустил к Kaldi;
+    missed       — фраз, от которых до Kaldi не дошло ни одного чанка;
+    vad          — процессорное время VAD на минуту звука.
+
+С --model (и установленным vosk) ещё и декодирует: процессорное время
+KaldiRecognizer на минуту звука без VAD и за VoiceGate, и сколько фраз
+распознано в обоих случаях.
+
+В конце — точность режима «Джарвис» (wake.py) на размеченных расшифровках:
+обращения, которые Vosk записал с ошибками, и фразы не к ассистенту.
+
+Запуск
+------
+    python benchmarks/bench_vad.py
+    python benchmarks/bench_vad.py --seconds 300 --vad energy
+    python benchmarks/bench_vad.py --wav recordings/ --model Vosk/vosk-model-small-ru-0.22
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Vosk"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+from synthetic_audio import read_wav, write_fixtures  # noqa: E402
+from vad import GatedRecognizer, VoiceGate, make_vad, webrtcvad  # noqa: E402
+from wake import WakeWord  # noqa: E402
+
+try:
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+except ImportError:
+    KaldiRecognizer = None
+
+QUESTIONS = ("какая погода", "сколько времени", "расскажи анекдот", "что такое квазар",
+             "поставь таймер на пять минут", "как дела")
+# (шаблон расшифровки, обращена ли к ассистенту)
+WAKE_FORMS = (
+    ("джарвис {q}", True), ("эй джарвис {q}", True), ("жарвис {q}", True), ("джарвиз {q}", True),
+    ("jarvis {q}", True), ("{q} джарвис", True), ("слушай джарвис {q}", True),
+    ("{q}", False), ("дарвин {q}", False), ("вчера джарвис сказал {q}", False),
+    ("{q} сказал бы джарвис мне", False), ("а ты {q}", False),
+)
+
+
+def chunks_of(data: bytes, size: int):
+    step = size * 2
+    return [data[i:i + step] for i in range(0, len(data) - step + 1, step)]
+
+
+def speech_chunks(segments, count: int, size: int, rate: int):
+    """Номера чанков, хотя бы на треть занятых размеченной речью."""
+    seconds = size / rate
+    labelled = set()
+    for start, end in segments:
+        for i in range(int(start / seconds), min(count, int(end / seconds) + 1)):
+            overlap = min(end, (i + 1) * seconds) - max(start, i * seconds)
+            if overlap >= seconds / 3:
+                labelled.add(i)
+    return labelled
+
+
+def speech_chunks_each(segments, count: int, size: int, rate: int):
+    return [speech_chunks([segment], count, size, rate) for segment in segments]
+
+
+def gate_run(chunks, kind: str, rate: int):
+    gate = VoiceGate(make_vad(kind, rate))
+    passed = set()
+    started = time.process_time()
+    for i, chunk in enumerate(chunks):
+        out, _ended = gate.feed(chunk)
+        if out:
+            passed.update(range(i - len(out) + 1, i + 1))
+    return passed, time.process_time() - started
+
+
+def decode(chunks, model, rate: int, kind: str | None):
+    recognizer = KaldiRecognizer(model, rate)
+    if kind is None:
+        def recognize(data):
+            if recognizer.AcceptWaveform(data):
+                return json.loads(recognizer.Result()).get("text") or None
+            return None
+    else:
+        recognize = GatedRecognizer(recognizer, VoiceGate(make_vad(kind, rate)))
+    started = time.process_time()
+    phrases = sum(1 for chunk in chunks if recognize(chunk))
+    return phrases, time.process_time() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", type=pathlib.Path, nargs="*", help="WAV-файлы или папки с ними")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Длина синтетических фикстур")
+    parser.add_argument("--vad", choices=("energy", "webrtc", "all"), default="all")
+    parser.add_argument("--chunk", type=int, default=4096)
+    parser.add_argument("--model", type=pathlib.Path, help="Модель Vosk для замера декодирования")
+    args = parser.parse_args()
+
+    kinds = ["energy", "webrtc"] if args.vad == "all" else [args.vad]
+    if webrtcvad is None and "webrtc" in kinds:
+        kinds.remove("webrtc")
+        print("ℹ️ webrtcvad не установлен — только energy")
+    tmp = None
+    if args.wav:
+        paths = [p for w in args.wav for p in (sorted(w.glob("*.wav")) if w.is_dir() else [w])]
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        paths = write_fixtures(pathlib.Path(tmp.name), args.seconds)
+    model = None
+    if args.model:
+        if KaldiRecognizer is None:
+            print("ℹ️ vosk не установлен — время декодирования не измеряется")
+        else:
+            SetLogLevel(-1)
+            model = Model(str(args.model))
+
+    for path in paths:
+        data, rate, segments = read_wav(path)
+        chunks = chunks_of(data, args.chunk)
+        minutes = len(chunks) * args.chunk / rate / 60
+        labelled = speech_chunks(segments or [], len(chunks), args.chunk, rate)
+        print(f"{path.name}: {minutes * 60:.0f} с, речь в {len(labelled)}/{len(chunks)} чанков")
+        for kind in kinds:
+            passed, cpu = gate_run(chunks, kind, rate)
+            line = f"    {kind:<7} passed {len(passed) / len(chunks):6.1%}   vad {cpu / minutes * 1000:6.1f} мс/мин"
+            if segments is not None:
+                recall = len(labelled & passed) / len(labelled) if labelled else 1.0
+                missed = sum(1 for s in speech_chunks_each(segments, len(chunks), args.chunk, rate)
+                             if s and not s & passed)
+                line += f"   recall {recall:6.1%}   missed {missed}/{len(segments)}"
+            print(line)
+        if model is not None:
+            phrases, cpu = decode(chunks, model, rate, None)
+            print(f"    kaldi   без VAD        {cpu / minutes:6.2f} с CPU/мин, фраз {phrases}")
+            for kind in kinds:
+                phrases, cpu = decode(chunks, model, rate, kind)
+                print(f"    kaldi   за {kind:<7}     {cpu / minutes:6.2f} с CPU/мин, фраз {phrases}")
+
+    wake, correct, total = WakeWord(), 0, 0
+    for form, addressed in WAKE_FORMS:
+        for question in QUESTIONS:
+            rest = wake.strip(form.format(q=question))
+            correct += (rest is not None) == addressed and (not addressed or rest == question)
+            total += 1
+    print(f"wake word: верно {correct}/{total} расшифровок")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
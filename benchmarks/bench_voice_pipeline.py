@@ -0,0 +1,144 @@
+"""
+bench_voice_pipeline.py — голосовой цикл: последовательный vs VoicePipeline
+
+Имитирует микрофон реального времени (чанк раз в --chunk-ms, у «устройства»
+буфер на --device-chunks чанков, лишнее выбрасывается — как PyAudio с
+exception_on_overflow=False), распознаватель, который отдаёт фразу, только
+если увидел все её чанки, и LLM/TTS с заданными задержками. Пользователь
+говорит фразу за фразой, не дожидаясь конца ответа.
+
+    serial    — прежний цикл listen.py: read → AcceptWaveform → LLM → TTS;
+    pipeline  — VoicePipeline (Vosk/pipeline.py) с теми же функциями.
+
+Печатает, сколько фраз распознано целиком, сколько чанков потеряно, общее
+время и задержки стадий конвейера (p50/p99).
+
+Запуск
+------
+    python benchmarks/bench_voice_pipeline.py
+    python benchmarks/bench_voice_pipeline.py --phrases 30 --llm-ms 3000 --speed 20
+"""
+import argparse
+import pathlib
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "Vosk"))
+from pipeline import VoicePipeline  # noqa: E402
+
+SILENCE = b"silence"
+
+
+class FakeMicrophone:
+    """Чанки «звука» в реальном времени с маленьким буфером устройства."""
+
+    def __init__(self, chunks, chunk_seconds: float, device_chunks: int):
+        self.chunks = chunks
+        self.chunk_seconds = chunk_seconds
+        self.device_chunks = device_chunks
+        self.pos = 0
+        self.dropped = 0
+        self._t0 = None
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.pos >= len(self.chunks)
+
+    def read(self) -> bytes:
+        with self._lock:
+            now = time.perf_counter()
+            if self._t0 is None:
+                self._t0 = now
+            produced = int((now - self._t0) / self.chunk_seconds)
+            if produced - self.pos > self.device_chunks:  # читатель опоздал — буфер устройства переполнен
+                oldest = produced - self.device_chunks
+                self.dropped += min(oldest, len(self.chunks)) - min(self.pos, len(self.chunks))
+                self.pos = oldest
+            ready = self._t0 + (self.pos + 1) * self.chunk_seconds
+            index = self.pos
+            self.pos += 1
+        time.sleep(max(0.0, ready - time.perf_counter()))
+        return self.chunks[index] if index < len(self.chunks) else SILENCE
+
+
+class FakeRecognizer:
+    """Отдаёт «фразу N», если получил все её чанки; иначе фраза испорчена и не засчитывается."""
+
+    def __init__(self):
+        self.seen = {}
+
+    def __call__(self, data: bytes):
+        if data == SILENCE:
+            return None
+        phrase, part, total = data.decode().split(":")
+        self.seen.setdefault(phrase, set()).add(int(part))
+        if int(part) == int(total) - 1:
+            return f"фраза {phrase}" if len(self.seen[phrase]) == int(total) else None
+        return None
+
+
+def script(phrases: int, speech: int, gap: int):
+    chunks = []
+    for i in range(phrases):
+        chunks += [f"{i}:{k}:{speech}".encode() for k in range(speech)]
+        chunks += [SILENCE] * gap
+    return chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phrases", type=int, default=15)
+    parser.add_argument("--speech-chunks", type=int, default=8, help="Длина фразы в чанках")
+    parser.add_argument("--gap-chunks", type=int, default=4, help="Пауза между фразами в чанках")
+    parser.add_argument("--chunk-ms", type=float, default=256.0)
+    parser.add_argument("--device-chunks", type=int, default=4)
+    parser.add_argument("--llm-ms", type=float, default=1500.0)
+    parser.add_argument("--tts-ms", type=float, default=1000.0)
+    parser.add_argument("--speed", type=float, default=10.0, help="Во сколько раз ускорить время")
+    args = parser.parse_args()
+
+    chunk_s = args.chunk_ms / 1000 / args.speed
+    llm_s = args.llm_ms / 1000 / args.speed
+    tts_s = args.tts_ms / 1000 / args.speed
+    chunks = script(args.phrases, args.speech_chunks, args.gap_chunks)
+
+    def respond(text):
+        time.sleep(llm_s)
+        return f"ответ на «{text}»"
+
+    def speak(_text):
+        time.sleep(tts_s)
+
+    # --- прежний цикл ------------------------------------------------------------
+    mic, recognize, heard = FakeMicrophone(chunks, chunk_s, args.device_chunks), FakeRecognizer(), 0
+    started = time.perf_counter()
+    while not mic.exhausted:
+        text = recognize(mic.read())
+        if text:
+            heard += 1
+            speak(respond(text))
+    elapsed = time.perf_counter() - started
+    print(f"serial    фраз {heard}/{args.phrases}, потеряно чанков {mic.dropped}, "
+          f"время {elapsed * args.speed:.1f} с (в реальном масштабе)")
+
+    # --- конвейер ----------------------------------------------------------------
+    mic = FakeMicrophone(chunks, chunk_s, args.device_chunks)
+    pipeline = VoicePipeline(mic.read, FakeRecognizer(), respond, speak, chunk_seconds=chunk_s)
+    started = time.perf_counter()
+    pipeline.start()
+    while not mic.exhausted:
+        time.sleep(chunk_s)
+    pipeline.stop(timeout=args.phrases * (llm_s + tts_s) + 5)
+    elapsed = time.perf_counter() - started
+    report = pipeline.report()
+    print(f"pipeline  фраз {report['utterances']}/{args.phrases}, потеряно чанков {mic.dropped}, "
+          f"время {elapsed * args.speed:.1f} с, вытеснено из кольца {report['overruns']}")
+    for stage, numbers in report["stages"].items():
+        print(f"    {stage:<12} n={numbers['n']:<4} p50 {numbers['p50_ms'] * args.speed:8.1f} мс"
+              f"  p99 {numbers['p99_ms'] * args.speed:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+llm_standin.py — локальный сервер-заглушка вместо OpenAI и Ollama, чтобы бенчмарки шли офлайн
+
+POST /v1/chat/completions — формат OpenAI Chat Completions. Из последнего
+сообщения достаёт ключи («Вот ключи: [...]» — пакетный промпт
+synonym_batch.py, «Вот ключ: "…"» — одиночный) и возвращает синтетические
+синонимы.
+
+POST /api/generate — формат Ollama: отвечает заранее заданным текстом
+(reply), по токену раз в token_delay секунд. С "stream": true (по
+умолчанию, как у Ollama) — NDJSON-поток кусками HTTP/1.1 chunked,
+с "stream": false — одним JSON, когда «сгенерирован» весь ответ.
+Chat Completions с "stream": true так же отдаёт reply потоком SSE.
+GET /api/tags и /v1/models — пустые ответы для прогрева соединения.
+Соединения keep-alive; сколько их открыто, видно в connections, а цену
+нового соединения (рукопожатие по сети) имитирует connect_delay.
+
+Поведение настраивается, чтобы проверять повторы и ограничения:
+    latency      — задержка ответа (для /api/generate — до первого токена), сек.;
+    max_inflight — больше одновременных запросов → 429 Too Many Requests;
+    error_rate   — доля ответов 500;
+    drop_rate    — доля ключей, «забытых» моделью в пакетном ответе;
+    reply        — текст ответа /api/generate;
+    token_delay  — пауза между токенами /api/generate, сек.;
+    connect_delay — задержка на каждое новое соединение, сек.
+
+Запуск вручную (update_aliases.py ходит к нему через OPENAI_BASE_URL)
+---------------------------------------------------------------------
+    python benchmarks/llm_standin.py --port 8765 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=x python indexer/update_aliases.py
+"""
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_BATCH_KEYS = re.compile(r"Вот ключи:\s*(\[.*?\])", re.DOTALL)
+_SINGLE_KEY = re.compile(r'Вот ключ:\s*"([^"]*)"')
+_TOKENS = re.compile(r"\S+\s*")
+
+DEFAULT_REPLY = (
+    "Конечно! Сейчас в Москве около пятнадцати градусов и небольшая облачность. "
+    "К вечеру станет прохладнее, возможен лёгкий дождь, так что зонт лучше взять с собой. "
+    "Завтра обещают солнце и до двадцати градусов. Могу ещё чем-нибудь помочь?"
+)
+
+
+def fake_synonyms(key: str) -> list:
+    return [key, f"{key} прога", f"запусти {key}", key.replace("e", "е").replace("a", "а")]
+
+
+class StandinServer:
+    """ThreadingHTTPServer в фоновом потоке; url — базовый адрес вида http://127.0.0.1:port/v1."""
+
+    def __init__(self, port: int = 0, latency: float = 0.05, max_inflight: int = 1000,
+                 error_rate: float = 0.0, drop_rate: float = 0.0, seed: int = 1,
+                 reply: str = DEFAULT_REPLY, token_delay: float = 0.03, connect_delay: float = 0.0):
+        self.latency = latency
+        self.max_inflight = max_inflight
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.reply = reply
+        self.token_delay = token_delay
+        self.connect_delay = connect_delay
+        self.requests = self.rejected = self.peak_inflight = self.connections = 0
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    @property
+    def ollama_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def _answer(self, prompt: str) -> str:
+        batch = _BATCH_KEYS.search(prompt)
+        if batch:
+            keys = json.loads(batch.group(1))
+            with self._lock:
+                kept = [k for k in keys if self._rng.random() >= self.drop_rate]
+            return json.dumps({k: fake_synonyms(k) for k in kept}, ensure_ascii=False)
+        single = _SINGLE_KEY.search(prompt)
+        return json.dumps(fake_synonyms(single.group(1) if single else "программа"), ensure_ascii=False)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive и chunked-поток для /api/generate
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # как у Ollama
+                with server._lock:
+                    server.connections += 1
+                time.sleep(server.connect_delay)  # цена нового соединения (RTT, TLS-рукопожатие)
+
+            def _send(self, code: int, payload: dict) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _chunk(self, line: bytes) -> None:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+
+            def _stream(self, content_type: str, lines) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, line in enumerate(lines):
+                    if i:
+                        time.sleep(server.token_delay)
+                    self._chunk(line)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _stream_chat(self, model) -> None:
+                def events():
+                    for token in _TOKENS.findall(server.reply):
+                        chunk = {"object": "chat.completion.chunk", "model": model,
+                                 "choices": [{"index": 0, "delta": {"content": token}}]}
+                        yield b"data: " + json.dumps(chunk, ensure_ascii=False).encode("utf-8") + b"\n\n"
+                    yield b"data: [DONE]\n\n"
+                self._stream("text/event-stream", events())
+
+            def _generate(self, request: dict) -> None:
+                model = request.get("model")
+                tokens = _TOKENS.findall(server.reply)
+                if not request.get("stream", True):
+                    time.sleep(server.token_delay * len(tokens))
+                    return self._send(200, {"model": model, "response": server.reply, "done": True})
+                payloads = [{"model": model, "response": token, "done": False} for token in tokens]
+                payloads.append({"model": model, "response": "", "done": True, "eval_count": len(tokens)})
+                self._stream("application/x-ndjson", (
+                    json.dumps(p, ensure_ascii=False).encode("utf-8") + b"\n" for p in payloads))
+
+            def do_GET(self):
+                self._send(200, {"models": []} if self.path.endswith("/api/tags") else {"data": []})
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with server._lock:
+                    server.requests += 1
+                    server._inflight += 1
+                    server.peak_inflight = max(server.peak_inflight, server._inflight)
+                    overloaded = server._inflight > server.max_inflight
+                    failing = server._rng.random() < server.error_rate
+                try:
+                    if overloaded:
+                        with server._lock:
+                            server.rejected += 1
+                        return self._send(429, {"error": {"message": "rate limit"}})
+                    time.sleep(server.latency)
+                    if failing:
+                        return self._send(500, {"error": {"message": "boom"}})
+                    if self.path.rstrip("/").endswith("/api/generate"):
+                        return self._generate(request)
+                    if request.get("stream"):
+                        return self._stream_chat(request.get("model"))
+                    content = server._answer(request["messages"][-1]["content"])
+                    self._send(200, {
+                        "id": "standin", "object": "chat.completion", "model": request.get("model"),
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": content}}],
+                    })
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True   # клиент отменил запрос и закрыл сокет
+                finally:
+                    with server._lock:
+                        server._inflight -= 1
+
+        return Handler
+
+    def start(self) -> "StandinServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def chat_complete(base_url: str, prompt: str, model: str = "standin", timeout: float = 30.0) -> str:
+    """Запрос Chat Completions через urllib (HTTPError на 429/500 — пусть ловит вызывающий)."""
+    body = json.dumps({"model": model, "messages": [{"role": "user", "content": prompt}]}).encode("utf-8")
+    req = urllib.request.Request(f"{base_url}/chat/completions", data=body,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())["choices"][0]["message"]["content"]
+
+
+def generate_lines(base_url: str, prompt: str, model: str = "standin", stream: bool = True,
+                   timeout: float = 30.0):
+    """Запрос /api/generate через urllib; отдаёт строки NDJSON по мере прихода."""
+    body = json.dumps({"model": model, "prompt": prompt, "stream": stream}).encode("utf-8")
+    req = urllib.request.Request(f"{base_url}/api/generate", data=body,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        yield from resp
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-inflight", type=int, default=1000)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.03)
+    args = parser.parse_args()
+
+    server = StandinServer(args.port, args.latency, args.max_inflight, args.error_rate, args.drop_rate,
+                           token_delay=args.token_delay)
+    print(f"🧪 Заглушка LLM: {server.url} (OpenAI), {server.ollama_url} (Ollama)  (Ctrl+C — выход)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+synthetic_apps.py — синтетический каталог программ и корпус голосовых команд
+
+Общий генератор данных для бенчмарков лаунчера:
+    catalog(n)     — app_index ({ключ: путь к exe}) и aliases ({ключ: [синонимы]})
+                     в формате indexer/app_index.json и indexer/aliases.json:
+                     латинский ключ из слогов, его кириллическое «прочтение»,
+                     иногда короткое прозвище и составное название
+                     («кароми студио»);
+    commands(...)  — размеченные фразы, какими их выдаёт Vosk:
+                     (текст, ожидаемый ключ или None, вид команды).
+
+Виды команд:
+    exact     — «открой кароми», «запусти, пожалуйста, karomi»;
+    misheard  — кириллическое название с типичной ошибкой распознавания;
+    unknown   — глагол запуска + название, которого нет в каталоге;
+    chat      — вопрос к ассистенту без команды (должен уйти в LLM).
+
+Запуск (записать датасет на диск)
+---------------------------------
+    python benchmarks/synthetic_apps.py --apps 10000 --out /tmp/catalog
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import random
+from typing import Dict, List, Optional, Tuple
+
+# слог: (латиница, как его прочтёт русскоязычный пользователь); после phonetic_key()
+# все слоги различны — иначе «та»/«да» давали бы неразличимые на слух программы
+SYLLABLES = [
+    ("ka", "ка"), ("ro", "ро"), ("mi", "ми"), ("ta", "та"), ("vo", "во"), ("ne", "не"),
+    ("lu", "лу"), ("si", "си"), ("nu", "ну"), ("ge", "ге"), ("zo", "зо"), ("ri", "ри"),
+    ("hu", "ху"), ("zhu", "жу"), ("che", "че"), ("no", "но"), ("ti", "ти"), ("lo", "ло"),
+    ("ma", "ма"), ("ku", "ку"), ("sha", "ша"), ("dre", "дре"), ("vi", "ви"), ("po", "по"),
+]
+SUFFIXES = ("студио", "лаунчер", "редактор", "плеер", "клиент")
+FOLDERS = ("Program Files", "Program Files (x86)", "Games", "PortableApps", "Tools")
+VERBS = ("открой", "запусти", "включи", "открыть", "запустить")
+FILLERS = ("", "", "", "пожалуйста ", "мне ", "джарвис ")
+CHAT = (
+    "как дела", "расскажи анекдот", "какая сегодня погода", "сколько будет два плюс два",
+    "что ты умеешь", "почему небо голубое", "кто написал войну и мир", "привет",
+)
+# что Vosk путает чаще всего: пары звонкий/глухой и близкие гласные
+CONFUSIONS = {
+    "б": "п", "п": "б", "в": "ф", "ф": "в", "г": "к", "к": "г", "д": "т", "т": "д",
+    "з": "с", "с": "з", "о": "а", "а": "о", "е": "и", "и": "е",
+}
+MIX = {"exact": 0.6, "misheard": 0.2, "unknown": 0.1, "chat": 0.1}
+
+Command = Tuple[str, Optional[str], str]  # (фраза, ожидаемый ключ, вид)
+
+
+def _word(rng: random.Random) -> Tuple[str, str]:
+    parts = [rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))]
+    return "".join(p[0] for p in parts), "".join(p[1] for p in parts)
+
+
+def catalog(n: int, seed: int = 1) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """n программ: (app_index, aliases)."""
+    rng = random.Random(seed)
+    index: Dict[str, str] = {}
+    readings: Dict[str, str] = {}
+    while len(index) < n:
+        key, reading = _word(rng)
+        if key in index:
+            continue
+        title = key.capitalize()
+        index[key] = f"C:\\{rng.choice(FOLDERS)}\\{title}\\{title}.exe"
+        readings[key] = reading
+
+    taken = set(readings.values()) | set(index)
+    aliases: Dict[str, List[str]] = {}
+    for key, reading in readings.items():
+        synonyms = [key, reading]
+        nick = reading[: len(reading) * 2 // 3]
+        if rng.random() < 0.3 and len(nick) >= 3 and nick not in taken:
+            taken.add(nick)
+            synonyms.append(nick)
+        if rng.random() < 0.1:
+            synonyms.append(f"{reading} {rng.choice(SUFFIXES)}")
+        aliases[key] = synonyms
+    return index, aliases
+
+
+def mishear(word: str, rng: random.Random) -> str:
+    """Одна типичная ошибка распознавания в русском слове."""
+    spots = [i for i, ch in enumerate(word) if ch in CONFUSIONS]
+    if spots and rng.random() < 0.8:
+        i = rng.choice(spots)
+        return word[:i] + CONFUSIONS[word[i]] + word[i + 1:]
+    i = rng.randrange(1, len(word))
+    return word[:i] + word[i + 1:]
+
+
+def commands(index: Dict[str, str], aliases: Dict[str, List[str]], count: int, seed: int = 2) -> List[Command]:
+    """До count размеченных фраз в пропорциях MIX (misheard без однозначной ошибки пропускаются)."""
+    rng = random.Random(seed)
+    keys = list(index)
+    kinds = rng.choices(list(MIX), weights=list(MIX.values()), k=count)
+    known = set(index) | {s for synonyms in aliases.values() for s in synonyms}
+    result: List[Command] = []
+    for kind in kinds:
+        prefix = f"{rng.choice(VERBS)} {rng.choice(FILLERS)}"
+        if kind == "chat":
+            result.append((rng.choice(CHAT), None, kind))
+        elif kind == "unknown":
+            while True:
+                _latin, name = _word(rng)
+                name += "ус"  # у синтетических программ такого окончания нет
+                if name not in known:
+                    break
+            result.append((prefix + name, None, kind))
+        else:
+            key = rng.choice(keys)
+            if kind == "exact":
+                name = rng.choice(aliases[key][:2])
+            else:
+                # ошибка, давшая название другой программы, неотличима от точной команды
+                name = mishear(aliases[key][1], rng)
+                for _attempt in range(10):
+                    if name not in known:
+                        break
+                    name = mishear(aliases[key][1], rng)
+                else:
+                    continue
+            result.append((prefix + name, key, kind))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=pathlib.Path, required=True)
+    args = parser.parse_args()
+
+    index, aliases = catalog(args.apps, args.seed)
+    args.out.mkdir(parents=True, exist_ok=True)
+    for name, data in (("app_index.json", index), ("aliases.json", aliases),
+                       ("commands.json", commands(index, aliases, args.commands, args.seed + 1))):
+        (args.out / name).write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"✅ {len(index)} программ и {args.commands} команд записаны в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
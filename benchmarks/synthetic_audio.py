@@ -0,0 +1,166 @@
+"""
+synthetic_audio.py — WAV-фикстуры «постоянно включённого микрофона» для бенчмарка VAD
+
+Пишет 16 кГц моно 16-бит WAV (модулем wave, без зависимостей) и рядом
+разметку <имя>.json: {"rate": 16000, "speech": [[начало, конец], ...]}
+в секундах. Большая часть записи — фон комнаты, речь занимает малую долю
+времени, как у голосового ассистента, который весь день ждёт обращения.
+
+«Речь» — слоги: глухая согласная (шум с подъёмом высоких частот) и гласная
+(гармоники основного тона с «формантными» весами и огибающей). Это не
+разборчивые слова, но по энергии и пересечениям нуля похоже на голос —
+ровно то, на что смотрит VAD.
+
+Сцены (SCENES):
+    quiet  — тихая комната, фон около -62 дБ;
+    fan    — вентилятор: низкочастотный шум около -45 дБ;
+    hum    — сетевой фон 50 Гц и шум около -50 дБ, речь потише.
+
+Для распознавания Vosk годятся только настоящие записи с разметкой в том
+же формате — bench_vad.py принимает и их (--wav).
+
+Запуск (записать фикстуры на диск)
+----------------------------------
+    python benchmarks/synthetic_audio.py --out /tmp/vad_wavs --seconds 120
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+import random
+import wave
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+RATE = 16000
+SPEECH_SHARE = 0.15   # доля времени с речью
+# сцена: (уровень шума дБ, сглаживание шума 0..1 (больше — глуше), фон 50 Гц дБ или None, уровень речи дБ)
+SCENES: Dict[str, Tuple[float, float, Optional[float], float]] = {
+    "quiet": (-62.0, 0.0, None, -22.0),
+    "fan": (-45.0, 0.9, None, -22.0),
+    "hum": (-50.0, 0.3, -40.0, -28.0),
+}
+Segments = List[Tuple[float, float]]
+
+
+def _amplitude(db: float) -> float:
+    return 32768 * 10 ** (db / 20)
+
+
+def background(seconds: float, rng: random.Random, noise_db: float, smooth: float,
+               hum_db: Optional[float]) -> List[float]:
+    count = int(seconds * RATE)
+    # сглаженный шум теряет мощность — поправка, чтобы уровень соответствовал noise_db
+    scale = _amplitude(noise_db) * math.sqrt((1 + smooth) / (1 - smooth)) if smooth else _amplitude(noise_db)
+    samples, level = [], 0.0
+    for _ in range(count):
+        level = smooth * level + (1 - smooth) * rng.gauss(0, 1)
+        samples.append(level * scale)
+    if hum_db is not None:
+        hum = _amplitude(hum_db) * math.sqrt(2)
+        step = 2 * math.pi * 50 / RATE
+        for i in range(count):
+            samples[i] += hum * math.sin(step * i)
+    return samples
+
+
+def syllable(rng: random.Random, level_db: float, pitch: float) -> List[float]:
+    """Слог с действующим уровнем гласной около level_db."""
+    out: List[float] = []
+    amplitude = _amplitude(level_db)
+    if rng.random() < 0.5:  # глухая согласная: разность соседних отсчётов шума — «шипение», на 10 дБ тише
+        previous = 0.0
+        for _ in range(int(RATE * rng.uniform(0.04, 0.09))):
+            value = rng.gauss(0, 1)
+            out.append((value - previous) / math.sqrt(2) * amplitude * 0.3)
+            previous = value
+    weights = [rng.uniform(0.2, 1.0) / k for k in range(1, 9)]  # «формантная» окраска гласной
+    scale = amplitude * math.sqrt(2) / math.sqrt(sum(w * w for w in weights) / 2)  # sqrt(2) — на огибающую
+    length = int(RATE * rng.uniform(0.10, 0.22))
+    phase = 2 * math.pi * pitch / RATE
+    for i in range(length):
+        envelope = math.sin(math.pi * i / length)
+        value = sum(w * math.sin(phase * k * i) for k, w in enumerate(weights, 1))
+        out.append(value * envelope * scale)
+    return out
+
+
+def utterance(rng: random.Random, level_db: float) -> List[float]:
+    pitch = rng.uniform(95, 230)
+    samples: List[float] = []
+    for _word in range(rng.randint(2, 6)):
+        for _syl in range(rng.randint(1, 4)):
+            samples += syllable(rng, level_db + rng.uniform(-4, 2), pitch * rng.uniform(0.9, 1.1))
+        samples += [0.0] * int(RATE * rng.uniform(0.03, 0.12))  # пауза между словами
+    return samples
+
+
+def scene(name: str, seconds: float, seed: int = 1) -> Tuple[array, Segments]:
+    """Отсчёты int16 и размеченные отрезки речи (сек.)."""
+    noise_db, smooth, hum_db, speech_db = SCENES[name]
+    rng = random.Random(f"{name}:{seed}")
+    samples = background(seconds, rng, noise_db, smooth, hum_db)
+    segments: Segments = []
+    position = rng.uniform(1.0, 3.0)
+    while True:
+        speech = utterance(rng, speech_db)
+        start = int(position * RATE)
+        if start + len(speech) >= len(samples):
+            break
+        for i, value in enumerate(speech):
+            samples[start + i] += value
+        end = position + len(speech) / RATE
+        segments.append((round(position, 3), round(end, 3)))
+        # пауза до следующей фразы, чтобы речь занимала ≈SPEECH_SHARE времени
+        gap = (end - position) * (1 - SPEECH_SHARE) / SPEECH_SHARE
+        position = end + gap * rng.uniform(0.5, 1.5)
+    pcm = array("h", (max(-32768, min(32767, int(v))) for v in samples))
+    return pcm, segments
+
+
+def write_wav(path: pathlib.Path, pcm: array, segments: Segments, rate: int = RATE) -> None:
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(pcm.tobytes())
+    path.with_suffix(".json").write_text(json.dumps({"rate": rate, "speech": segments}), encoding="utf-8")
+
+
+def read_wav(path: pathlib.Path) -> Tuple[bytes, int, Optional[Segments]]:
+    """(PCM, частота, разметка речи или None, если рядом нет <имя>.json)."""
+    with wave.open(str(path), "rb") as src:
+        if src.getnchannels() != 1 or src.getsampwidth() != 2:
+            raise ValueError(f"{path}: нужен моно 16-бит WAV")
+        rate, data = src.getframerate(), src.readframes(src.getnframes())
+    labels = path.with_suffix(".json")
+    segments = json.loads(labels.read_text(encoding="utf-8")).get("speech") if labels.exists() else None
+    return data, rate, segments
+
+
+def write_fixtures(out: pathlib.Path, seconds: float = 60.0, seed: int = 1) -> List[pathlib.Path]:
+    out.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in SCENES:
+        pcm, segments = scene(name, seconds, seed)
+        path = out / f"{name}.wav"
+        write_wav(path, pcm, segments)
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=pathlib.Path, required=True)
+    args = parser.parse_args()
+
+    paths = write_fixtures(args.out, args.seconds, args.seed)
+    print(f"✅ {len(paths)} WAV по {args.seconds:g} с записаны в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
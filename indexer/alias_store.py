@@ -0,0 +1,232 @@
+"""
+alias_store.py — единое скомпилированное хранилище синонимов
+============================================================
+Синонимы раньше читались тремя способами: AppLauncher собирал
+синоним → путь из aliases.ALIASES при каждом запуске, update_aliases.py
+разбирал aliases.py через ast и перегенерировал Python-код, а индексатор
+смотрел только `stem in ALIASES`.
+
+Теперь:
+    aliases.json        — сами данные {ключ программы: [синонимы]}; его правят
+                          руками и пишет update_aliases.py (aliases.py лишь
+                          читает его и отдаёт ALIASES для старого кода);
+    alias_store.json    — скомпилированный кэш (в .gitignore): нормализованные
+                          синонимы, обратный индекс синоним → ключ и таблица
+                          только для программ из app_index.json, а также
+                          хэши содержимого обоих исходников.
+
+load() пересобирает кэш, только если изменилось содержимое aliases.json или
+app_index.json: сначала сверяются (mtime, size), а при расхождении —
+SHA-1, так что «touch» без правок пересборку не вызывает. get() — ленивый
+общий экземпляр для индексатора, AppLauncher и update_aliases.py.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+import re
+import threading
+from typing import Dict, FrozenSet, Iterator, List, Mapping, Tuple
+
+try:
+    from indexer import index_format
+except ImportError:  # запуск из папки indexer/
+    import index_format
+
+ALIASES_FILE = pathlib.Path(__file__).with_name("aliases.json")
+INDEX_FILE = pathlib.Path(__file__).with_name("app_index.json")
+STORE_FILE = pathlib.Path(__file__).with_name("alias_store.json")
+STORE_VERSION = 1
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(synonym: str) -> str:
+    """Синоним в том виде, в каком его ищут во фразе: нижний регистр, одиночные пробелы."""
+    return _SPACES.sub(" ", synonym.lower()).strip()
+
+
+# ╔═══════════════════════════════════════╗
+# ║      И С Х О Д Н Ы Е  Д А Н Н Ы Е     ║
+# ╚═══════════════════════════════════════╝
+def read_aliases(path: pathlib.Path = ALIASES_FILE) -> Dict[str, List[str]]:
+    """Словарь синонимов как есть (пустой, если файла нет)."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def write_aliases(aliases: Mapping[str, List[str]], path: pathlib.Path = ALIASES_FILE) -> None:
+    """Атомарно записывает aliases.json (скомпилированный кэш пересоберётся сам)."""
+    data = json.dumps(aliases, ensure_ascii=False, indent=4) + "\n"
+    index_format.atomic_write_bytes(path, data.encode("utf-8"))
+
+
+def _source_state(path: pathlib.Path, known: dict | None) -> dict:
+    """{mtime, size, sha1} файла; sha1 берётся из known, если mtime и size не менялись."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {"mtime": None, "size": None, "sha1": ""}
+    if known and known.get("mtime") == st.st_mtime and known.get("size") == st.st_size:
+        return known
+    return {"mtime": st.st_mtime, "size": st.st_size,
+            "sha1": hashlib.sha1(path.read_bytes()).hexdigest()}
+
+
+# ╔═══════════════════════════════════════╗
+# ║            К О М П И Л Я Ц И Я        ║
+# ╚═══════════════════════════════════════╝
+class AliasStore:
+    """
+    Скомпилированные синонимы; создаётся через load()/get().
+
+    Хранится плоско — так JSON-кэш разбирается в разы быстрее вложенных
+    словарей: keys[i] — ключ программы, synonyms[j] — синоним, owners[j] —
+    номер его ключа, in_index[i] — есть ли ключ в app_index.json.
+    Словари aliases / alias_map / reverse собираются по первому обращению.
+    """
+
+    def __init__(self, keys: List[str], synonyms: List[str], owners: List[int],
+                 in_index: List[bool], sources: dict):
+        self._keys = keys
+        self._synonyms = synonyms
+        self._owners = owners
+        self._in_index = in_index
+        self.sources = sources        # {"aliases": {...}, "index": {...}} — см. _source_state
+        self.keys: FrozenSet[str] = frozenset(keys)
+        self._aliases: Dict[str, List[str]] | None = None
+        self._alias_map: Dict[str, str] | None = None
+        self._reverse: Dict[str, str] | None = None
+
+    @property
+    def content_hash(self) -> str:
+        """Хэш содержимого обоих исходников — меняется только при реальной правке."""
+        return hashlib.sha1(
+            (self.sources["aliases"]["sha1"] + self.sources["index"]["sha1"]).encode()
+        ).hexdigest()
+
+    @property
+    def aliases(self) -> Dict[str, List[str]]:
+        """Ключ → нормализованные синонимы без повторов (в исходном порядке)."""
+        if self._aliases is None:
+            aliases: Dict[str, List[str]] = {key: [] for key in self._keys}
+            for synonym, owner in zip(self._synonyms, self._owners):
+                aliases[self._keys[owner]].append(synonym)
+            self._aliases = aliases
+        return self._aliases
+
+    @property
+    def alias_map(self) -> Dict[str, str]:
+        """
+        Синоним → ключ только для программ из app_index.json; при повторе
+        синонима побеждает последний — как в index_format.build_alias_map().
+        """
+        if self._alias_map is None:
+            keys, in_index = self._keys, self._in_index
+            self._alias_map = {
+                synonym: keys[owner]
+                for synonym, owner in zip(self._synonyms, self._owners) if in_index[owner]
+            }
+        return self._alias_map
+
+    def synonym_pairs(self) -> Iterator[Tuple[str, str]]:
+        """(синоним, ключ) для программ из app_index.json — как alias_map, но без словаря."""
+        keys, in_index = self._keys, self._in_index
+        return ((synonym, keys[owner]) for synonym, owner in zip(self._synonyms, self._owners)
+                if in_index[owner])
+
+    @property
+    def reverse(self) -> Dict[str, str]:
+        """Синоним → ключ по всем программам из aliases.json (и тем, что не в индексе)."""
+        if self._reverse is None:
+            self._reverse = dict(zip(self._synonyms, map(self._keys.__getitem__, self._owners)))
+        return self._reverse
+
+    @classmethod
+    def compile(cls, raw: Mapping[str, List[str]], index: Mapping[str, str], sources: dict) -> "AliasStore":
+        keys = list(raw)
+        synonyms: List[str] = []
+        owners: List[int] = []
+        for owner, key in enumerate(keys):
+            for synonym in dict.fromkeys(filter(None, map(normalize, raw[key]))):
+                synonyms.append(synonym)
+                owners.append(owner)
+        return cls(keys, synonyms, owners, [key in index for key in keys], sources)
+
+    def to_json(self) -> dict:
+        return {"version": STORE_VERSION, "sources": self.sources, "keys": self._keys,
+                "synonyms": self._synonyms, "owners": self._owners, "in_index": self._in_index}
+
+    @classmethod
+    def from_json(cls, payload: dict, sources: dict) -> "AliasStore":
+        return cls(payload["keys"], payload["synonyms"], payload["owners"], payload["in_index"], sources)
+
+
+def load(
+    aliases_path: pathlib.Path = ALIASES_FILE,
+    index_path: pathlib.Path = INDEX_FILE,
+    store_path: pathlib.Path | None = STORE_FILE,
+) -> AliasStore:
+    """Скомпилированное хранилище: из кэша, если исходники не менялись, иначе пересборка."""
+    cached = None
+    if store_path is not None:
+        try:
+            cached = json.loads(store_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = None
+    if not cached or cached.get("version") != STORE_VERSION:
+        cached = {"sources": {}}
+
+    known = cached["sources"]
+    sources = {
+        "aliases": _source_state(aliases_path, known.get("aliases")),
+        "index": _source_state(index_path, known.get("index")),
+    }
+    unchanged = all(
+        sources[name]["sha1"] == known.get(name, {}).get("sha1") for name in ("aliases", "index")
+    )
+    if unchanged and "keys" in cached:
+        store = AliasStore.from_json(cached, sources)
+        if sources != known and store_path is not None:  # touch без правок — обновим только mtime
+            _save(store, store_path)
+        return store
+
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        index = {}
+    store = AliasStore.compile(read_aliases(aliases_path), index, sources)
+    if store_path is not None:
+        _save(store, store_path)
+    return store
+
+
+def _save(store: AliasStore, path: pathlib.Path) -> None:
+    data = json.dumps(store.to_json(), ensure_ascii=False, separators=(",", ":"))
+    try:
+        index_format.atomic_write_bytes(path, data.encode("utf-8"))
+    except OSError:
+        pass  # кэш — не данные: нет прав на запись — просто соберём заново в следующий раз
+
+
+_shared: AliasStore | None = None
+_shared_lock = threading.Lock()
+
+
+def get() -> AliasStore:
+    """Общий экземпляр (файлы по умолчанию); загружается при первом обращении."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = load()
+        return _shared
+
+
+def reset() -> None:
+    """Забыть общий экземпляр (например, после update_aliases.py или пересканирования)."""
+    global _shared
+    with _shared_lock:
+        _shared = None
@@ -13,113 +13,17 @@ aliases.py — словарь синонимов для запуска прог
 А пользователь может сказать:
 - "телега", "тг", "гугл", "код", и т.д.
 
-👉 Поэтому мы создаём ALIASES — словарь синонимов.  
+👉 Поэтому мы создаём ALIASES — словарь синонимов.
 
 
 
 🔗 "telegram" — это ключ, совпадающий с ключом из app_index.json
+
+📦 Сами данные лежат в aliases.json (его пишет update_aliases.py и можно
+править руками). Скомпилированная версия с обратным индексом — в
+alias_store.py; этот модуль оставлен для кода, которому нужен ALIASES.
 """
+import json
+import pathlib
 
-ALIASES = {
-    "telegram": [
-        "тг"
-    ],
-    "stella": [
-        "stella",
-        "стелла",
-        "стэлла"
-    ],
-    "eadesktop": [
-        "еа",
-        "иа",
-        "ea десктоп",
-        "еа десктоп",
-        "eadesktop",
-        "иа десктоп"
-    ],
-    "chrome": [
-        "браузер",
-        "гугл браузер",
-        "chrome",
-        "хром",
-        "гугл",
-        "хромиум"
-    ],
-    "ninja": [
-        "ниндзя",
-        "нинжа",
-        "ninja",
-        "ниндза"
-    ],
-    "vcpkg": [
-        "ви си пикейджи",
-        "vcpkg",
-        "ви си пак",
-        "висипак",
-        "ви си пакэдж",
-        "пакетный менеджер"
-    ],
-    "wsl": [
-        "дабл ю эс эль",
-        "ви эс эль",
-        "wsl",
-        "даблуэсэль",
-        "дабл ю",
-        "всел"
-    ],
-    "anydesk": [
-        "энидиск",
-        "эни-деск",
-        "any desk",
-        "anydesk",
-        "эни диск",
-        "десктоп",
-        "энидеск"
-    ],
-    "planetvpn": [
-        "planet vpn",
-        "планет vpn",
-        "планетвпн",
-        "планета впн",
-        "планет",
-        "planetvpn"
-    ],
-    "xray": [
-        "экс-рей",
-        "эксрей",
-        "икс",
-        "рентген",
-        "икс-рей",
-        "иксрей",
-        "xray"
-    ],
-    "steam": [
-        "стим",
-        "паровозик",
-        "паровоз",
-        "стеам",
-        "стимчик",
-        "steam",
-        "стив"
-    ],
-    "mount&bladeiibannerlord": [
-        "блэйд",
-        "моунт энд блэйд",
-        "mount&bladeiibannerlord",
-        "моунт баннерлорд",
-        "моунт",
-        "баннер лорд",
-        "баннерлорд"
-    ],
-    "warthunder": [
-        "варт",
-        "вартандэр",
-        "вар",
-        "warthunder",
-        "war thunder",
-        "вар тандер",
-        "вартундер",
-        "вартхандер",
-        "вартандер"
-    ]
-}
+ALIASES = json.loads(pathlib.Path(__file__).with_name("aliases.json").read_text(encoding="utf-8"))
@@ -3,12 +3,31 @@ indexer.py ― «умный» индексатор приложений для A
 =========================================================
 🔍  Ищет .exe / .lnk / .py, но пропускает явный мусор ‑ uninstall, update, helper и т. д.
 ⚖️  Каждому файлу начисляется score; в индекс попадают только те, у кого score ≥ TRESHOLD.
-📄  Итог сохраняется в app_index.json (читается assistant.py / listen.py).
+    Правила score — в scoring_rules.json (см. scoring.py), менять их можно без правки кода.
+📄  Итог сохраняется в app_index.json (читается assistant.py / listen.py)
+    и в компактный app_index.bin (см. index_format.py) — его грузит AppLauncher.
 
 Запуск
 ------
     python indexer.py                         # сканирует стандартные директории
     python indexer.py "D:/Games" "E:/Portable"  # + любые ваши пути
+    python indexer.py --full                  # полный пересчёт, без манифеста
+    python indexer.py --workers 16            # больше потоков для сетевых дисков
+    python indexer.py --watch                 # демон: держит app_index.json актуальным
+    python indexer.py --rules my_rules.json   # свои правила score
+    python indexer.py --processes 8           # шарды по процессам (упор в CPU, а не в I/O)
+    python indexer.py --only "D:/Games" --partial-out d.json   # частичный индекс диска
+    python indexer.py --merge d.json e.json   # слить частичные индексы в app_index.json
+
+Инкрементальный режим
+---------------------
+Рядом с app_index.json хранится app_index.manifest.json: mtime каждой папки
+и (size, mtime, score) каждого найденного файла. При повторном запуске
+папки с тем же mtime не перечитываются, а у файлов с тем же size/mtime
+переиспользуется сохранённый score. В манифест score пишется без штрафа
+за давность (stale) и без бонуса за запуски голосом (launched): первый
+зависит от текущей даты, второй — от usage_stats.json, и оба добавляются
+при чтении.
 
 Зависимости
 -----------
@@ -23,8 +42,9 @@ import json
 import os
 import pathlib
 import sys
-import ctypes
+import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List
 
 # --- внешняя необязательная зависимость --------------------------------------
@@ -33,9 +53,20 @@ try:
 except ImportError:     # если не установлена — подпись просто не учитываем
     pefile = None
 
-# импортируем словарь синонимов
-import aliases
-ALIASES = aliases.ALIASES
+try:
+    from watchdog.events import FileSystemEventHandler  # события ФС для --watch
+    from watchdog.observers import Observer
+except ImportError:     # нет watchdog — --watch работает опросом
+    FileSystemEventHandler = object
+    Observer = None
+
+import alias_store
+import index_format
+import partial_index
+import scan_profile
+import scoring
+import shortcuts
+import usage_stats
 
 
 
@@ -48,7 +79,7 @@ SKIP_DIR_NAMES: set[str] = {
     "appdata", "temp", "packages"
 }
 
-TARGET_EXTENSIONS: tuple[str, ...] = (".exe", ".py", ".url")
+TARGET_EXTENSIONS: tuple[str, ...] = (".exe", ".py", ".url", ".lnk")
 
 DEFAULT_PATHS: list[pathlib.Path] = [
     pathlib.Path.home() / "Downloads",
@@ -60,155 +91,614 @@ DEFAULT_PATHS: list[pathlib.Path] = [
     pathlib.Path.home() / "AppData" / "Roaming" / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Steam",
 ]
 
+WATCH_DEBOUNCE = 2.0        # сек. тишины после последнего события перед пересчётом
+WATCH_POLL_INTERVAL = 30.0  # сек. между проверками mtime папок в режиме опроса
+
+DEFAULT_WORKERS = 8  # потоков для параллельного обхода (упор в I/O, а не в CPU)
+
 OUTPUT_FILE = pathlib.Path(__file__).with_name("app_index.json")
+MANIFEST_FILE = OUTPUT_FILE.with_name("app_index.manifest.json")
+MANIFEST_VERSION = 3
+SHORTCUT_CACHE_FILE = OUTPUT_FILE.with_name("shortcut_cache.json")
 
 # --- эвристические правила ----------------------------------------------------
-GOOD_MATCH_PARENTS = 10  # exe=имя_папки
-GOOD_ALIAS_HIT     = 8   # имя совпало с ключом из ALIASES
-BAD_STOPWORD       = -10 # uninstall / update …
-BAD_DIRNAME        = -5  # installer / redist …
-BAD_SIZE           = -10  # подозрительный размер
+PROFILE: scan_profile.ScanProfile | None = None  # включается через --profile
+SHORTCUTS = shortcuts.ShortcutResolver(SHORTCUT_CACHE_FILE)  # .lnk → цель, с кэшем
 
-TRESHOLD = 3       # минимальный score, чтобы войти в индекс
+# словарь синонимов (alias_store.py) и программы, которые реально запускали голосом
+# (AppLauncher → usage_stats.json), — для бонусов score. Импорт модуля их не читает
+# (и не пишет alias_store.json рядом с кодом): их загружает load_sources()
+ALIASES: Dict[str, List[str]] = {}
+LAUNCHED: frozenset = frozenset()
 
-STOPWORDS = {
-    "uninstall", "update", "setup", "helper", "crash",
-    "service", "patch", "install", "debug"
-}
-BAD_DIR_PARTS = {
-    "update", "installer", "redist", "patcher",
-    "resources", "bin", "debug", "x64", "x86"
-}
+RULES_PATH = scoring.RULES_FILE
+RULES = scoring.load_rules(RULES_PATH, ALIASES, LAUNCHED)
+TRESHOLD = RULES.threshold  # минимальный score, чтобы войти в индекс
+
+
+def use_rules(path: pathlib.Path) -> None:
+    """Подменяет правила score (например, из --rules)."""
+    global RULES, RULES_PATH, TRESHOLD
+    RULES_PATH = path
+    RULES = scoring.load_rules(path, ALIASES, LAUNCHED)
+    TRESHOLD = RULES.threshold
+
+
+def load_sources(store_path: pathlib.Path | None = alias_store.STORE_FILE) -> None:
+    """
+    Читает ALIASES и LAUNCHED и пересобирает правила. store_path=None — не
+    записывать скомпилированное хранилище синонимов (вызов не из CLI).
+    """
+    global ALIASES, LAUNCHED
+    if store_path == alias_store.STORE_FILE:
+        store = alias_store.get()  # общий экземпляр, как у AppLauncher
+    else:
+        store = alias_store.load(store_path=store_path)
+    ALIASES = store.aliases
+    LAUNCHED = usage_stats.load().launched_keys()
+    use_rules(RULES_PATH)
 
 
 # ╔═══════════════════════════════════════╗
 # ║         П О Л Е З Н Ы Е  Ф-Ц И И      ║
 # ╚═══════════════════════════════════════╝
-def _sanitize_key(path: pathlib.Path) -> str:
-    """Имя файла → нижний регистр, без пробелов."""
-    return path.stem.lower().replace(" ", "")
+def _sanitize_key(path: str | os.PathLike) -> str:
+    """Имя файла → нижний регистр, без пробелов (строки и Path, без создания Path)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.lower().replace(" ", "")
+
 
+def score_exe(path: pathlib.Path) -> int:
+    """Оценивает файл по правилам RULES и возвращает итоговый score."""
+    st = path.stat()  # один stat на файл
+    return RULES.score(str(path.parent), path.name, st.st_size, st.st_mtime)
 
-def _resolve_windows_shortcut(lnk_path: str) -> str | None:
+
+# ╔═══════════════════════════════════════╗
+# ║          Г Л А В Н Ы Е  Ф‑Ц И И       ║
+# ╚═══════════════════════════════════════╝
+def _list_dir(root: str, old: dict | None) -> dict:
     """
-    Возвращает целевой путь ярлыка (.lnk) или None, если не удалось.
-    Работает только на Windows; на других ОС просто вернёт None.
+    Читает одну папку и возвращает запись манифеста:
+    {"mtime": …, "dirs": [подпапки], "files": {имя: [size, mtime, score, путь, mtime цели]}}.
+    score — без штрафа stale и бонуса launched (см. _record_scores); mtime цели — у оценённого
+    файла (для .lnk — у того, на что он указывает). Для файлов, у которых
+    size/mtime совпали с old, score берётся из кэша.
     """
-    if sys.platform != "win32":
-        return None
+    prof = PROFILE
+    clock = time.perf_counter
+    started = clock() if prof else 0.0
+    t_stat = t_lnk = t_score = 0.0
+    n_files = n_pruned = 0
+
+    old_files = old["files"] if old else {}
+    dirs: List[str] = []
+    files: Dict[str, list] = {}
+    pending: List[tuple] = []  # (имя, size, mtime) — оцениваются одной пачкой
+
+    with os.scandir(root) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                # как os.walk: симлинки на папки не обходим
+                if entry.name.lower() in SKIP_DIR_NAMES:
+                    n_pruned += 1
+                elif not entry.is_symlink():
+                    dirs.append(entry.name)
+                continue
+
+            n_files += 1
+            name = entry.name
+            if not name.lower().endswith(TARGET_EXTENSIONS):
+                continue
+
+            if prof:
+                t0 = clock()
+            try:
+                st = entry.stat()  # на Windows — из данных FindNextFile, без syscall
+            except OSError:
+                continue
+            finally:
+                if prof:
+                    t_stat += clock() - t0
+
+            cached = old_files.get(name)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime:
+                files[name] = cached
+                continue
+
+            # разворачиваем ярлык .lnk
+            if name.lower().endswith(".lnk"):
+                if prof:
+                    t0 = clock()
+                target = SHORTCUTS.resolve(entry.path, st)
+                try:
+                    target_st = os.stat(target) if target else None
+                except OSError:
+                    target_st = None
+                if prof:
+                    t_lnk += clock() - t0
+                if target_st is None:
+                    files[name] = [st.st_size, st.st_mtime, None, None, None]
+                    continue
+                target_dir, target_name = os.path.split(target)
+                file_score = RULES.score(target_dir, target_name, target_st.st_size, target_st.st_mtime, volatile=False)
+                files[name] = [st.st_size, st.st_mtime, file_score, target, target_st.st_mtime]
+                continue
+
+            files[name] = [st.st_size, st.st_mtime, None, entry.path, st.st_mtime]
+            pending.append((name, st.st_size, st.st_mtime))
+
+    if prof:
+        t0 = clock()
+    for (name, _size, _mtime), file_score in zip(pending, RULES.score_batch(root, pending, volatile=False)):
+        files[name][2] = file_score
+    if prof:
+        t_score = clock() - t0
 
-    CLSID_ShellLink = ctypes.c_buffer(b'\x01\x14\x02\x00\x00\x00\x00\x00\xC0'
-                                      b'\x00\x00\x00\x00\x00\x00F')
-    IID_IShellLink  = ctypes.c_buffer(b'\xF9\x14\x02\x00\x00\x00\x00\x00\xC0'
-                                      b'\x00\x00\x00\x00\x00\x00F')
+    record = {"mtime": os.stat(root).st_mtime, "dirs": dirs, "files": files}
+    if prof:
+        prof.add_dir(root, clock() - started, t_stat, t_lnk, t_score,
+                     n_files, len(files), n_pruned)
+    return record
 
-    shell = ctypes.OleDLL('ole32').CoCreateInstance
-    psl = ctypes.c_void_p()
-    if shell(CLSID_ShellLink, None, 1, IID_IShellLink, ctypes.byref(psl)):
-        return None
 
-    lnk = ctypes.POINTER(ctypes.c_void_p)()
-    if ctypes.cast(psl, ctypes.POINTER(ctypes.c_void_p * 5))[0][4](lnk_path, 0):
-        return None
+def _record_scores(record: dict, now: float) -> list:
+    """
+    (путь, score) файлов записи манифеста; штраф stale — на момент now, а не
+    сканирования, бонус launched — по запускам на момент чтения.
+    """
+    return [
+        (path_str, file_score + RULES.age_penalty(scored_mtime, now) + RULES.launched_bonus(path_str))
+        for _size, _mtime, file_score, path_str, scored_mtime in record["files"].values()
+        if path_str is not None
+    ]
 
-    buf = ctypes.create_unicode_buffer(260)
-    if ctypes.cast(psl, ctypes.POINTER(ctypes.c_void_p * 21))[0][20](buf, 260, None, 0):
-        return None
-    return buf.value or None
 
+def _read_dir(root: str, old_dirs: dict) -> dict | None:
+    """Запись манифеста для root: из old_dirs, если mtime не менялся, иначе свежая."""
+    old = old_dirs.get(root)
+    try:
+        if old is not None:
+            t0 = time.perf_counter()
+            unchanged = old["mtime"] == os.stat(root).st_mtime
+            if PROFILE and unchanged:
+                PROFILE.add_cached_dir(root, time.perf_counter() - t0)
+            if unchanged:
+                return old
+        return _list_dir(root, old)
+    except OSError:
+        return None  # нет доступа / папка исчезла — как onerror=None у os.walk
+
+
+def _walk(base: str, old_dirs: dict, new_dirs: dict):
+    """
+    Обход в том же порядке, что и os.walk (сверху вниз).
+    Папки, чей mtime совпал с манифестом, не перечитываются —
+    их подпапки и файлы берутся из old_dirs. Отдаёт (путь, score).
+    """
+    now = time.time()
+    stack = [base]
+    while stack:
+        root = stack.pop()
+        record = _read_dir(root, old_dirs)
+        if record is None:
+            continue
+        new_dirs[root] = record
 
-def score_exe(path: pathlib.Path) -> int:
-    """Оценивает файл по набору эвристик и возвращает итоговый score."""
-    score = 0
-    stem = path.stem.lower()
+        yield from _record_scores(record, now)
 
-    # 1) exe = имя родительской папки
-    if stem == path.parent.stem.lower().replace(" ", ""):
-        score += GOOD_MATCH_PARENTS
+        stack.extend(os.path.join(root, d) for d in reversed(record["dirs"]))
 
-    # 2) попадание в словарь ALIASES
-    if stem in ALIASES:
-        score += GOOD_ALIAS_HIT
 
-    # 3) стоп‑слова в названии файла
-    if any(w in stem for w in STOPWORDS):
-        score += BAD_STOPWORD
+def _scan_unit(base: str, old_dirs: dict) -> tuple[list, dict]:
+    """Единица работы для пула: полный обход поддерева base."""
+    new_dirs: dict = {}
+    return list(_walk(base, old_dirs, new_dirs)), new_dirs
 
-    # 4) «плохие» части пути
-    if any(part.lower() in BAD_DIR_PARTS for part in path.parts):
-        score += BAD_DIRNAME
 
-    # 5) подозрительный размер (<30 КБ или >1 ГБ)
-    try:
-        size_mb = path.stat().st_size / 1_048_576
-        if size_mb < 3:
-            score += BAD_SIZE
-    except PermissionError:
-        pass  # нет доступа → не трогаем
-    
-    # 6) не показывать те, что давно не открывал
-    mtime = path.stat().st_mtime
-    years_ago = (time.time() - mtime) / (30*24*3600)
-    if years_ago > 1:
-        score -= 3
-    
-    # 7) игры из стим
-    if path.suffix.lower() == ".url" and "steam" in str(path).lower():
-        score += 15
-
-    return score
+def _split_root(base: str, old_dirs: dict, new_dirs: dict) -> tuple[list, list[str]]:
+    """
+    Читает только сам base: возвращает его файлы и список подпапок,
+    каждая из которых станет отдельной единицей работы.
+    """
+    record = _read_dir(base, old_dirs)
+    if record is None:
+        return [], []
+    new_dirs[base] = record
+    return _record_scores(record, time.time()), [os.path.join(base, d) for d in record["dirs"]]
+
+
+def _merge_into(results: Dict[str, str], items, scores: Dict[str, int] | None = None) -> None:
+    """Добавляет (путь, score) в индекс в порядке обхода; scores — score победителя по ключу."""
+    if PROFILE:
+        items = list(items)
+        PROFILE.add_scores(file_score for _path, file_score in items)
+    for path_str, file_score in items:
+        if file_score < TRESHOLD:
+            continue
+        key = _sanitize_key(path_str)
 
+        # оставляем, если хороший score и .exe приоритетнее .py
+        if key not in results or path_str.lower().endswith(".exe"):
+            results[key] = path_str
+            if scores is not None:
+                scores[key] = file_score
 
-# ╔═══════════════════════════════════════╗
-# ║          Г Л А В Н Ы Е  Ф‑Ц И И       ║
-# ╚═══════════════════════════════════════╝
-def scan_folders(start_paths: List[pathlib.Path]) -> Dict[str, str]:
+
+def scan_folders(
+    start_paths: List[pathlib.Path],
+    manifest: dict | None = None,
+    workers: int = 1,
+    scores: Dict[str, int] | None = None,
+) -> Dict[str, str]:
     """
     Обходит все start_paths, применяет score_exe(), формирует словарь
     {ключ: полный_путь}.
+
+    manifest — словарь из load_manifest(); если передан, неизменившиеся
+    папки и файлы берутся из него, а сам он обновляется на месте.
+
+    workers > 1 — параллельный обход: каждая подпапка первого уровня каждого
+    корня сканируется в отдельном потоке (os.scandir/stat отпускают GIL,
+    так что выигрыш есть на медленных и сетевых дисках). Результаты
+    сливаются в исходном порядке обхода, поэтому индекс тот же, что и при
+    workers=1.
+
+    scores — если передан, заполняется {ключ: score} для попавших в индекс.
+    Статистика кэша контекстов папок после прохода — RULES.dir_cache.stats().
     """
     results: Dict[str, str] = {}
+    old_dirs = _usable_dirs(manifest)
+    RULES.dir_cache.reset_stats()
+    new_dirs: dict = {}
+    scanned: List[str] = []
+    chunks: list = []  # списки (путь, score) или Future — строго в порядке обхода
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for base in start_paths:
+            if not base.exists():
+                continue
+            print(f"🔍 Сканируем: {base}")
+            scanned.append(str(base))
+
+            if workers <= 1:
+                chunks.append(list(_walk(str(base), old_dirs, new_dirs)))
+                continue
+
+            head, units = _split_root(str(base), old_dirs, new_dirs)
+            chunks.append(head)
+            chunks.extend(pool.submit(_scan_unit, unit, old_dirs) for unit in units)
+
+        for chunk in chunks:
+            if isinstance(chunk, Future):
+                chunk, unit_dirs = chunk.result()
+                new_dirs.update(unit_dirs)
+            t0 = time.perf_counter()
+            _merge_into(results, chunk, scores)
+            if PROFILE:
+                PROFILE.merge_time += time.perf_counter() - t0
+
+    if manifest is not None:
+        _update_manifest(manifest, old_dirs, new_dirs, scanned)
 
-    for base in start_paths:
-        if not base.exists():
-            continue
-        print(f"🔍 Сканируем: {base}")
-
-        for root, dirs, files in os.walk(base):
-            dirs[:] = [d for d in dirs if d.lower() not in SKIP_DIR_NAMES]
+    return results
 
-            for file in files:
-                if not file.lower().endswith(TARGET_EXTENSIONS):
-                    continue
 
-                p = pathlib.Path(root) / file
+def _usable_dirs(manifest: dict | None) -> dict:
+    """Записи папок из манифеста, если они посчитаны по текущим правилам."""
+    if not manifest or manifest.get("rules") != RULES.fingerprint:
+        return {}  # правила или ALIASES поменялись — кэшированные score недействительны
+    return manifest.get("dirs", {})
 
-                # разворачиваем ярлык .lnk
-                if p.suffix.lower() == ".lnk":
-                    target = _resolve_windows_shortcut(str(p))
-                    if target and pathlib.Path(target).exists():
-                        p = pathlib.Path(target)
-                    else:
-                        continue
 
-                key = _sanitize_key(p)
-                file_score = score_exe(p)
+def _update_manifest(manifest: dict, old_dirs: dict, new_dirs: dict, scanned: List[str]) -> None:
+    """Кладёт результат прохода в манифест; записи по несканированным корням сохраняет."""
+    for root, record in old_dirs.items():
+        if root not in new_dirs and not any(
+            root == b or root.startswith(b.rstrip(os.sep) + os.sep) for b in scanned
+        ):
+            new_dirs[root] = record
+    manifest["version"] = MANIFEST_VERSION
+    manifest["rules"] = RULES.fingerprint
+    manifest["dirs"] = new_dirs
 
-                # оставляем, если хороший score и .exe приоритетнее .py
-                if file_score >= TRESHOLD and (
-                    key not in results or p.suffix.lower() == ".exe"
-                ):
-                    results[key] = str(p)
 
+def index_from_manifest(
+    manifest: dict,
+    start_paths: List[pathlib.Path],
+    scores: Dict[str, int] | None = None,
+) -> Dict[str, str]:
+    """
+    Собирает индекс из манифеста без обращения к диску — тот же результат,
+    что дал бы scan_folders() по этим корням, если с тех пор ничего не менялось.
+    """
+    results: Dict[str, str] = {}
+    dirs = manifest.get("dirs", {})
+    now = time.time()
+    for base in start_paths:
+        stack = [str(base)]
+        while stack:
+            root = stack.pop()
+            record = dirs.get(root)
+            if record is None:
+                continue
+            _merge_into(results, _record_scores(record, now), scores)
+            stack.extend(os.path.join(root, d) for d in reversed(record["dirs"]))
     return results
 
 
-def save_index(index: Dict[str, str], path: pathlib.Path = OUTPUT_FILE) -> None:
-    """Записывает итоговый индекс в JSON."""
-    path.write_text(json.dumps(index, ensure_ascii=False, indent=4), encoding="utf-8")
+def save_index(
+    index: Dict[str, str],
+    path: pathlib.Path = OUTPUT_FILE,
+    scores: Dict[str, int] | None = None,
+    binary_path: pathlib.Path | None = None,
+) -> None:
+    """
+    Записывает итоговый индекс в JSON (для людей) и в app_index.bin
+    (для AppLauncher, вместе со score и таблицей синонимов). Оба файла
+    пишутся атомарно. binary_path по умолчанию — path с суффиксом .bin.
+    """
+    data = json.dumps(index, ensure_ascii=False, indent=4).encode("utf-8")
+    index_format.atomic_write_bytes(path, data)
+    index_format.write_index(
+        binary_path or path.with_suffix(".bin"),
+        index,
+        scores,
+        index_format.build_alias_map(index, ALIASES),
+    )
     print(f"💾 Индекс сохранён: {path}  ({len(index)} объектов)")
 
 
+def load_manifest(path: pathlib.Path = MANIFEST_FILE) -> dict:
+    """Читает манифест инкрементального сканирования; при любой проблеме — пустой."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_manifest(manifest: dict, path: pathlib.Path = MANIFEST_FILE) -> None:
+    """Записывает манифест компактно (он для машины, не для человека) и атомарно."""
+    data = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    index_format.atomic_write_bytes(path, data)
+
+
+# ╔═══════════════════════════════════════╗
+# ║        Р Е Ж И М  --watch             ║
+# ╚═══════════════════════════════════════╝
+def refresh_dirs(manifest: dict, dirty: set) -> None:
+    """
+    Перечитывает только папки из dirty и обновляет манифест на месте.
+    Файлы в них пересчитываются, только если изменились size/mtime;
+    новые подпапки обходятся целиком, исчезнувшие — удаляются из манифеста.
+    """
+    dirs = manifest.setdefault("dirs", {})
+    for root in sorted(dirty):  # родители раньше детей
+        if root not in dirs:
+            continue  # новая папка подхватится через своего родителя
+        try:
+            record = _list_dir(root, dirs[root])
+        except OSError:
+            record = None
+
+        fresh: dict = {}
+        if record is not None:
+            fresh[root] = record
+            for d in record["dirs"]:
+                for _ in _walk(os.path.join(root, d), dirs, fresh):
+                    pass
+
+        prefix = root.rstrip(os.sep) + os.sep
+        for stale in [d for d in dirs if d == root or d.startswith(prefix)]:
+            del dirs[stale]
+        dirs.update(fresh)
+
+
+def _changed_dirs(manifest: dict) -> set:
+    """Папки из манифеста, у которых поменялся mtime (или которых больше нет)."""
+    changed = set()
+    for root, record in manifest.get("dirs", {}).items():
+        try:
+            if os.stat(root).st_mtime != record["mtime"]:
+                changed.add(root)
+        except OSError:
+            changed.add(root)
+    return changed
+
+
+class _DirtyHandler(FileSystemEventHandler):
+    """Переводит события watchdog в «грязные» папки."""
+
+    def __init__(self, mark):
+        super().__init__()
+        self._mark = mark
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if not path:
+                continue
+            if event.is_directory:
+                self._mark(path)
+                self._mark(os.path.dirname(path))
+            elif path.lower().endswith(TARGET_EXTENSIONS):
+                self._mark(os.path.dirname(path))
+
+
+def watch(
+    start_paths: List[pathlib.Path],
+    manifest: dict,
+    index_path: pathlib.Path = OUTPUT_FILE,
+    manifest_path: pathlib.Path = MANIFEST_FILE,
+    workers: int = 1,
+    debounce: float = WATCH_DEBOUNCE,
+    poll_interval: float = WATCH_POLL_INTERVAL,
+    use_polling: bool = False,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Долгоживущий режим: один инкрементальный проход, затем подписка на
+    изменения под start_paths (watchdog) или опрос mtime папок раз в
+    poll_interval. Изменённые папки копятся и обрабатываются пачкой после
+    debounce секунд тишины; индекс пишется, только если он реально
+    изменился. Остановка — Ctrl+C или stop.set().
+    """
+    if (use_polling or Observer is None) and poll_interval <= debounce:
+        raise ValueError(f"poll_interval ({poll_interval:g} с) должен быть больше debounce ({debounce:g} с)")
+    stop = stop or threading.Event()
+    lock = threading.Lock()
+    dirty: set = set()
+    last_event = 0.0
+
+    def mark(path: str) -> None:
+        nonlocal last_event
+        with lock:
+            dirty.add(path)
+            last_event = time.monotonic()
+
+    scores: Dict[str, int] = {}
+    index = scan_folders(start_paths, manifest, workers=workers, scores=scores)
+    save_manifest(manifest, manifest_path)
+    SHORTCUTS.save()
+    save_index(index, index_path, scores)
+
+    observer = None
+    if Observer is not None and not use_polling:
+        observer = Observer()
+        handler = _DirtyHandler(mark)
+        for base in start_paths:
+            observer.schedule(handler, str(base), recursive=True)
+        observer.start()
+        print(f"👀 Слежу за {len(start_paths)} папками (watchdog)")
+    else:
+        print(f"👀 Слежу за {len(start_paths)} папками (опрос раз в {poll_interval:g} с)")
+
+    next_poll = time.monotonic() + poll_interval
+    try:
+        while not stop.wait(min(debounce, poll_interval) / 2):
+            now = time.monotonic()
+            if observer is None and now >= next_poll:
+                changed = _changed_dirs(manifest)
+                with lock:
+                    # уже ждущие пересчёта папки опрос видит снова (манифест ещё старый) —
+                    # повторная отметка сбрасывала бы отсчёт debounce, и пачка не уходила бы никогда
+                    changed -= dirty
+                for root in changed:
+                    mark(root)
+                next_poll = now + poll_interval
+
+            with lock:
+                if not dirty or time.monotonic() - last_event < debounce:
+                    continue
+                batch = set(dirty)
+                dirty.clear()
+
+            refresh_dirs(manifest, batch)
+            save_manifest(manifest, manifest_path)
+            SHORTCUTS.save()
+            new_scores: Dict[str, int] = {}
+            new_index = index_from_manifest(manifest, start_paths, new_scores)
+            if new_index != index or new_scores != scores:
+                index, scores = new_index, new_scores
+                save_index(index, index_path, scores)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+# ╔═══════════════════════════════════════╗
+# ║     Ш А Р Д Ы  П О  П Р О Ц Е С С А М ║
+# ╚═══════════════════════════════════════╝
+def _init_shard_worker(rules_path: str, aliases: Dict[str, List[str]], launched: frozenset) -> None:
+    """Инициализация процесса-воркера: те же правила, синонимы и кэш ярлыков, что у родителя."""
+    global ALIASES, LAUNCHED
+    ALIASES, LAUNCHED = aliases, launched
+    use_rules(pathlib.Path(rules_path))
+    SHORTCUTS.load()
+
+
+def _scan_shard(unit: str, old_dirs: dict) -> tuple[dict, dict]:
+    """Шард: обходит поддерево unit и возвращает (частичный индекс, записи манифеста)."""
+    new_dirs: dict = {}
+    partial: dict = {}
+    for path_str, file_score in _walk(unit, old_dirs, new_dirs):
+        if file_score >= TRESHOLD:
+            partial_index.add(partial, _sanitize_key(path_str), path_str, file_score)
+    return partial, new_dirs
+
+
+def _bucket_dirs(old_dirs: dict, units: List[str], bases: List[str]) -> Dict[str, dict]:
+    """Раскладывает записи манифеста по шардам, чтобы не гонять весь манифест в каждый процесс."""
+    buckets: Dict[str, dict] = {unit: {} for unit in units}
+    prefixes = [b.rstrip(os.sep) + os.sep for b in bases]
+    for root, record in old_dirs.items():
+        for prefix in prefixes:
+            if root.startswith(prefix):
+                unit = prefix + root[len(prefix):].split(os.sep, 1)[0]
+                if unit in buckets:
+                    buckets[unit][root] = record
+                break
+    return buckets
+
+
+def scan_sharded(
+    start_paths: List[pathlib.Path],
+    manifest: dict | None = None,
+    processes: int | None = None,
+) -> dict:
+    """
+    Как scan_folders(), но подпапки первого уровня каждого корня сканируются
+    в отдельных процессах (обход GIL, когда упираемся в score и строки).
+    Каждый шард отдаёт частичный индекс {ключ: [путь, score]}, они сливаются
+    по правилу partial_index (.exe > score > путь) — результат не зависит
+    от того, как корни разошлись по процессам.
+    """
+    old_dirs = _usable_dirs(manifest)
+    new_dirs: dict = {}
+    scanned: List[str] = []
+    partials: list = []
+    units: List[str] = []
+
+    for base in start_paths:
+        if not base.exists():
+            continue
+        print(f"🔍 Сканируем: {base}")
+        scanned.append(str(base))
+        head, base_units = _split_root(str(base), old_dirs, new_dirs)
+        head_partial: dict = {}
+        for path_str, file_score in head:
+            if file_score >= TRESHOLD:
+                partial_index.add(head_partial, _sanitize_key(path_str), path_str, file_score)
+        partials.append(head_partial)
+        units.extend(base_units)
+
+    buckets = _bucket_dirs(old_dirs, units, scanned)
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_shard_worker,
+        initargs=(str(RULES_PATH), ALIASES, LAUNCHED)
+    ) as pool:
+        futures = [pool.submit(_scan_shard, unit, buckets[unit]) for unit in units]
+        for future in futures:
+            partial, unit_dirs = future.result()
+            partials.append(partial)
+            new_dirs.update(unit_dirs)
+
+    if manifest is not None:
+        _update_manifest(manifest, old_dirs, new_dirs, scanned)
+
+    return partial_index.merge(partials)
+
+
 # ╔═══════════════════════════════════════╗
 # ║               C L I                  ║
 # ╚═══════════════════════════════════════╝
@@ -217,22 +707,97 @@ def parse_args() -> argparse.Namespace:
         description="Сканирует директории и создаёт app_index.json с полезными программами."
     )
     parser.add_argument("extra", nargs="*", help="Дополнительные папки для сканирования")
-    return parser.parse_args()
+    parser.add_argument("--full", action="store_true",
+                        help="Полное пересканирование без манифеста (кэш будет перезаписан)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Потоков для обхода (1 — последовательно, по умолчанию {DEFAULT_WORKERS})")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Шардировать обход по N процессам (0 — потоки, см. --workers)")
+    parser.add_argument("--only", action="store_true",
+                        help="Сканировать только переданные папки, без стандартных")
+    parser.add_argument("--partial-out", type=pathlib.Path,
+                        help="Сохранить частичный индекс в файл вместо app_index.json")
+    parser.add_argument("--merge", type=pathlib.Path, nargs="+", metavar="PARTIAL",
+                        help="Не сканировать, а слить частичные индексы в app_index.json")
+    parser.add_argument("--profile", action="store_true",
+                        help="Показать, куда ушло время: фазы, корни, гистограмма score, медленные поддеревья")
+    parser.add_argument("--profile-json", type=pathlib.Path, metavar="FILE",
+                        help="То же в JSON-файл (включает --profile)")
+    parser.add_argument("--rules", type=pathlib.Path, default=scoring.RULES_FILE,
+                        help="JSON с правилами score (по умолчанию scoring_rules.json)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Не завершаться: следить за папками и обновлять индекс на лету")
+    parser.add_argument("--poll", action="store_true",
+                        help="Для --watch: опрос mtime вместо watchdog (например, для сетевых дисков)")
+    parser.add_argument("--poll-interval", type=float, default=WATCH_POLL_INTERVAL,
+                        help=f"Для --watch --poll: секунд между проверками (по умолчанию {WATCH_POLL_INTERVAL:g})")
+    args = parser.parse_args()
+    if args.profile_json:
+        args.profile = True
+    if args.poll_interval <= WATCH_DEBOUNCE:
+        parser.error(f"--poll-interval должен быть больше {WATCH_DEBOUNCE:g} с (пауза перед пересчётом)")
+    if args.profile and (args.processes > 0 or args.watch):
+        parser.error("--profile работает только с обычным (потоковым) сканированием")
+    return args
 
 
 if __name__ == "__main__":
     args = parse_args()
+    load_sources()
+    use_rules(args.rules)
+
+    if args.merge:
+        index, scores = partial_index.to_index(partial_index.merge(
+            partial_index.load(p) for p in args.merge
+        ))
+        save_index(index, scores=scores)
+        sys.exit(0)
 
-    start_dirs = DEFAULT_PATHS + [pathlib.Path(p) for p in args.extra]
+    start_dirs = ([] if args.only else DEFAULT_PATHS) + [pathlib.Path(p) for p in args.extra]
     start_dirs = [p.resolve() for p in start_dirs if p.exists()]
 
     if not start_dirs:
         print("❌ Ни одной валидной стартовой директории не найдено.")
         sys.exit(1)
 
-    index = scan_folders(start_dirs)
+    manifest = {} if args.full else load_manifest()
+    SHORTCUTS.load()
+    if args.watch:
+        watch(start_dirs, manifest, workers=args.workers,
+              poll_interval=args.poll_interval, use_polling=args.poll)
+        sys.exit(0)
+
+    if args.profile:
+        PROFILE = scan_profile.ScanProfile([str(p) for p in start_dirs], TRESHOLD)
+
+    scores: Dict[str, int] = {}
+    if args.processes > 0:
+        index, scores = partial_index.to_index(scan_sharded(start_dirs, manifest, args.processes))
+    else:
+        index = scan_folders(start_dirs, manifest, workers=args.workers, scores=scores)
+    if PROFILE:
+        PROFILE.finish()
+        PROFILE.report()
+        if args.profile_json:
+            args.profile_json.write_text(
+                json.dumps(PROFILE.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            print(f"📊 Профиль сохранён: {args.profile_json}")
+
+    save_manifest(manifest)
+    SHORTCUTS.save()
+    if args.processes <= 0:  # у процессов-шардов свои кэши
+        ctx = RULES.dir_cache.stats()
+        print(f"🗂️  Контексты папок: {ctx['hits']} попаданий в кэш, "
+              f"{ctx['inherited']} унаследовано от родителя, {ctx['computed']} посчитано с нуля")
+
+    if args.partial_out:
+        partial_index.save(partial_index.from_index(index, scores), args.partial_out,
+                           [str(p) for p in start_dirs])
+        sys.exit(0)
+
     if not index:
         print("⚠️  Ни одного подходящего файла не найдено.")
         sys.exit(0)
 
-    save_index(index)
+    save_index(index, scores=scores)
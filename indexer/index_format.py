@@ -0,0 +1,310 @@
+"""
+index_format.py — компактный бинарный формат индекса (app_index.bin)
+====================================================================
+Лежит рядом с app_index.json и содержит то же самое плюс score каждой
+программы и заранее посчитанную таблицу синонимов (синоним → ключ).
+JSON остаётся для людей, .bin — для быстрого старта AppLauncher.
+
+Формат (little-endian, версия 1)
+--------------------------------
+    заголовок   "<4sHHII": b"JVIX", версия, 0, n_apps, n_aliases
+    key_off     (n_apps + 1)    × u32  — смещения ключей в key_blob
+    path_off    (n_apps + 1)    × u32  — смещения путей в path_blob
+    scores      n_apps          × i32
+    key_order   n_apps          × u32  — номера программ, отсортированные по ключу
+    alias_off   (n_aliases + 1) × u32
+    alias_app   n_aliases       × u32  — номер программы для синонима
+    alias_order n_aliases       × u32  — номера синонимов, отсортированные по тексту
+    key_blob, path_blob, alias_blob — строки UTF-8, каждая завершается "\\0"
+
+Порядок программ и синонимов сохраняется как в исходных словарях (от него
+зависит, какой синоним сработает первым), а *_order даёт двоичный поиск
+без распаковки всего файла. Файл читается через mmap и пишется атомарно:
+temp-файл + os.replace, так что читатель никогда не видит его наполовину.
+"""
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterator, List, Mapping
+
+MAGIC = b"JVIX"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+
+
+# ╔═══════════════════════════════════════╗
+# ║               З А П И С Ь             ║
+# ╚═══════════════════════════════════════╝
+def atomic_write_bytes(path: pathlib.Path, data: bytes) -> None:
+    """Пишет во временный файл рядом с path и атомарно подменяет path."""
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        try:  # mkstemp создаёт файл с правами 0600 — сохраним права заменяемого файла
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def build_alias_map(index: Mapping[str, str], aliases: Mapping[str, List[str]]) -> Dict[str, str]:
+    """
+    Синоним → ключ программы, с той же семантикой, что AppLauncher.build_app_mapping():
+    учитываются только программы из индекса, при повторе побеждает последний.
+    """
+    alias_map: Dict[str, str] = {}
+    for app_name, synonyms in aliases.items():
+        if app_name in index:
+            for synonym in synonyms:
+                alias_map[synonym] = app_name
+    return alias_map
+
+
+def _blob(strings: List[str]) -> tuple[array, bytes]:
+    encoded = [s.encode("utf-8") + b"\0" for s in strings]
+    offsets = array("I", [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return offsets, b"".join(encoded)
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def encode_index(
+    index: Mapping[str, str],
+    scores: Mapping[str, int] | None = None,
+    alias_map: Mapping[str, str] | None = None,
+) -> bytes:
+    """Сериализует индекс в байты формата JVIX."""
+    scores = scores or {}
+    alias_map = alias_map or {}
+    keys = list(index)
+    app_id = {k: i for i, k in enumerate(keys)}
+    aliases = [a for a in alias_map if alias_map[a] in app_id]
+
+    key_off, key_blob = _blob(keys)
+    path_off, path_blob = _blob([index[k] for k in keys])
+    alias_off, alias_blob = _blob(aliases)
+
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, 0, len(keys), len(aliases)),
+        _le(key_off),
+        _le(path_off),
+        _le(array("i", [scores.get(k, 0) for k in keys])),
+        _le(array("I", sorted(range(len(keys)), key=keys.__getitem__))),
+        _le(alias_off),
+        _le(array("I", [app_id[alias_map[a]] for a in aliases])),
+        _le(array("I", sorted(range(len(aliases)), key=aliases.__getitem__))),
+        key_blob,
+        path_blob,
+        alias_blob,
+    ]
+    return b"".join(parts)
+
+
+def write_index(
+    path: pathlib.Path,
+    index: Mapping[str, str],
+    scores: Mapping[str, int] | None = None,
+    alias_map: Mapping[str, str] | None = None,
+) -> None:
+    """Атомарно записывает app_index.bin."""
+    atomic_write_bytes(path, encode_index(index, scores, alias_map))
+
+
+# ╔═══════════════════════════════════════╗
+# ║               Ч Т Е Н И Е             ║
+# ╚═══════════════════════════════════════╝
+class _SortedView:
+    """Строки blob в порядке order — для bisect без распаковки всего списка."""
+
+    def __init__(self, owner: "CompactIndex", offsets, blob_start: int, order):
+        self._owner, self._offsets, self._start, self._order = owner, offsets, blob_start, order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i: int) -> str:
+        return self._owner._string(self._offsets, self._start, self._order[i])
+
+
+class CompactIndex(Mapping):
+    """
+    Индекс из app_index.bin как read-only словарь {ключ: путь}.
+    Поиск по ключу и синониму — двоичный, по mmap, без распаковки файла;
+    to_dict()/alias_paths() распаковывают всё разом (несколько split'ов).
+    """
+
+    def __init__(self, path: pathlib.Path):
+        with open(path, "rb") as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # пустой файл mmap не отображает
+                self._buf = b""
+        try:
+            self._open(path)
+        except ValueError:
+            self.close()
+            raise
+
+    def _open(self, path: pathlib.Path) -> None:
+        """Разбор заголовка и таблиц; любая несостыковка с размером файла — ValueError."""
+        size = len(self._buf)
+        if size < _HEADER.size:
+            raise ValueError(f"{path}: слишком короткий файл индекса")
+        magic, version, _, n, m = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: неизвестный формат индекса ({magic!r}, v{version})")
+        tables = 4 * (4 * n + 3 * m + 3)  # key_off … alias_order, см. шапку модуля
+        if _HEADER.size + tables > size:
+            raise ValueError(f"{path}: заголовок ({n} программ, {m} синонимов) не сходится с размером файла")
+
+        self._view = memoryview(self._buf)
+        pos = _HEADER.size
+
+        def take(typecode: str, count: int):
+            nonlocal pos
+            size = count * 4
+            arr = self._view[pos:pos + size]
+            pos += size
+            if sys.byteorder != "little":
+                swapped = array(typecode, arr.tobytes())
+                swapped.byteswap()
+                return swapped
+            return arr.cast(typecode)
+
+        self._n, self._m = n, m
+        self._key_off = take("I", n + 1)
+        self._path_off = take("I", n + 1)
+        self._scores = take("i", n)
+        self._key_order = take("I", n)
+        self._alias_off = take("I", m + 1)
+        self._alias_app = take("I", m)
+        self._alias_order = take("I", m)
+        self._key_start = pos
+        self._path_start = self._key_start + self._key_off[n]
+        self._alias_start = self._path_start + self._path_off[n]
+        if (self._key_off[0] or self._path_off[0] or self._alias_off[0]
+                or self._alias_start + self._alias_off[m] != size):
+            raise ValueError(f"{path}: таблицы смещений не сходятся с размером файла")
+
+        self._sorted_keys = _SortedView(self, self._key_off, self._key_start, self._key_order)
+        self._sorted_aliases = _SortedView(self, self._alias_off, self._alias_start, self._alias_order)
+
+    # --- низкоуровневое ------------------------------------------------------
+    def _string(self, offsets, start: int, i: int) -> str:
+        try:
+            return bytes(self._view[start + offsets[i]:start + offsets[i + 1] - 1]).decode("utf-8")
+        except IndexError:  # номер из *_order или alias_app за пределами таблицы
+            raise ValueError(f"файл индекса повреждён: нет строки №{i}") from None
+
+    def _strings(self, offsets, start: int, count: int) -> List[str]:
+        if not count:
+            return []
+        raw = bytes(self._view[start:start + offsets[count]]).decode("utf-8")
+        strings = raw.split("\0")[:-1]
+        if len(strings) != count:
+            raise ValueError(f"файл индекса повреждён: {len(strings)} строк вместо {count}")
+        return strings
+
+    def _find(self, view: _SortedView, order, value: str) -> int | None:
+        pos = bisect.bisect_left(view, value)
+        if pos < len(view) and view[pos] == value:
+            return order[pos]
+        return None
+
+    # --- Mapping -------------------------------------------------------------
+    def __getitem__(self, key: str) -> str:
+        i = self._find(self._sorted_keys, self._key_order, key)
+        if i is None:
+            raise KeyError(key)
+        return self._string(self._path_off, self._path_start, i)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_list())
+
+    def __len__(self) -> int:
+        return self._n
+
+    # --- удобства ------------------------------------------------------------
+    def keys_list(self) -> List[str]:
+        return self._strings(self._key_off, self._key_start, self._n)
+
+    def paths_list(self) -> List[str]:
+        return self._strings(self._path_off, self._path_start, self._n)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Весь индекс одним словарём, в исходном порядке."""
+        return dict(zip(self.keys_list(), self.paths_list()))
+
+    def score(self, key: str) -> int | None:
+        i = self._find(self._sorted_keys, self._key_order, key)
+        return None if i is None else self._scores[i]
+
+    def resolve_alias(self, alias: str) -> str | None:
+        """Синоним → ключ программы (или None)."""
+        j = self._find(self._sorted_aliases, self._alias_order, alias)
+        if j is None:
+            return None
+        return self._string(self._key_off, self._key_start, self._alias_app[j])
+
+    def _alias_targets(self, values: List[str]) -> Dict[str, str]:
+        aliases = self._strings(self._alias_off, self._alias_start, self._m)
+        apps = self._alias_app.tolist()
+        if apps and max(apps) >= len(values):
+            raise ValueError("файл индекса повреждён: синоним ссылается на несуществующую программу")
+        return dict(zip(aliases, map(values.__getitem__, apps)))
+
+    def alias_map(self) -> Dict[str, str]:
+        """Вся таблица синоним → ключ в исходном порядке."""
+        return self._alias_targets(self.keys_list())
+
+    def alias_paths(self, paths: List[str] | None = None) -> Dict[str, str]:
+        """Синоним → путь сразу (paths — уже распакованный paths_list(), если есть)."""
+        return self._alias_targets(paths if paths is not None else self.paths_list())
+
+    def close(self) -> None:
+        """Отпускает mmap (на Windows иначе файл нельзя подменить)."""
+        for name in ("_key_off", "_path_off", "_scores", "_key_order",
+                     "_alias_off", "_alias_app", "_alias_order", "_view"):
+            arr = getattr(self, name, None)  # при ошибке в _open() есть не все
+            if isinstance(arr, memoryview):
+                arr.release()
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self) -> "CompactIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_index(path: pathlib.Path) -> CompactIndex:
+    """
+    Открывает app_index.bin. ValueError — если это не наш формат или файл
+    повреждён: заголовок и таблицы не сходятся с размером файла (сразу),
+    строки или номера синонимов не сходятся с таблицами (при распаковке).
+    """
+    return CompactIndex(path)
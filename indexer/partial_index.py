@@ -0,0 +1,76 @@
+"""
+partial_index.py — частичные индексы и их детерминированное слияние
+===================================================================
+Частичный индекс — это {ключ: [путь, score]} по части корней (шард
+процесса, отдельный диск, отсканированный вчера, …). Его можно сохранить
+в файл и позже слить с другими в итоговый app_index.json.
+
+Правило при совпадении ключей (не зависит от порядка слияния):
+    1) .exe побеждает всё остальное (как и при обычном сканировании);
+    2) при равенстве — больший score;
+    3) при равенстве — лексикографически меньший путь.
+"""
+from __future__ import annotations
+
+import json
+import pathlib
+import time
+from typing import Dict, Iterable, List, Tuple
+
+PARTIAL_VERSION = 1
+
+
+def _rank(path: str, score: int) -> tuple:
+    return path.lower().endswith(".exe"), score
+
+
+def add(partial: dict, key: str, path: str, score: int) -> None:
+    """Добавляет кандидата в частичный индекс по правилу слияния."""
+    current = partial.get(key)
+    if current is not None:
+        old_rank, new_rank = _rank(*current), _rank(path, score)
+        if new_rank < old_rank or (new_rank == old_rank and path >= current[0]):
+            return
+    partial[key] = [path, score]
+
+
+def merge(partials: Iterable[dict]) -> dict:
+    """Сливает частичные индексы; результат не зависит от их порядка."""
+    merged: dict = {}
+    for partial in partials:
+        for key, (path, score) in partial.items():
+            add(merged, key, path, score)
+    return merged
+
+
+def from_index(index: Dict[str, str], scores: Dict[str, int] | None = None) -> dict:
+    """Обычный индекс (+ score) → частичный."""
+    scores = scores or {}
+    return {key: [path, scores.get(key, 0)] for key, path in index.items()}
+
+
+def to_index(partial: dict) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """Частичный индекс → (индекс {ключ: путь}, {ключ: score}) для save_index()."""
+    index = {key: path for key, (path, _score) in partial.items()}
+    scores = {key: score for key, (_path, score) in partial.items()}
+    return index, scores
+
+
+def save(partial: dict, path: pathlib.Path, roots: List[str]) -> None:
+    """Записывает частичный индекс вместе со списком корней и временем скана."""
+    payload = {
+        "version": PARTIAL_VERSION,
+        "roots": roots,
+        "scanned_at": time.time(),
+        "entries": partial,
+    }
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"🧩 Частичный индекс сохранён: {path}  ({len(partial)} объектов)")
+
+
+def load(path: pathlib.Path) -> dict:
+    """Читает частичный индекс (ValueError — если версия не та)."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"{path}: неизвестная версия частичного индекса")
+    return payload["entries"]
@@ -0,0 +1,153 @@
+"""
+scan_profile.py — профиль прохода индексатора (app_indexer.py --profile)
+=======================================================================
+Собирает, куда ушло время сканирования:
+    - по корням и по фазам: list (чтение папок), stat, lnk (разбор ярлыков),
+      score (эвристики), merge (сборка индекса);
+    - сколько файлов просмотрено в секунду, сколько папок отрезано
+      SKIP_DIR_NAMES и сколько взято из манифеста без перечитывания;
+    - гистограмму score относительно TRESHOLD;
+    - самые медленные поддеревья (первые SUBTREE_DEPTH уровней под корнем).
+
+report() печатает сводку, to_dict() — то же самое для JSON (--profile-json),
+чтобы следить за скоростью сканирования от запуска к запуску.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+PHASES = ("list", "stat", "lnk", "score", "merge")
+SUBTREE_DEPTH = 2   # «Program Files/Vendor/App» → поддерево «Program Files/Vendor/App»
+TOP_SUBTREES = 10
+
+
+def _root_stats() -> dict:
+    return {
+        "dirs": 0, "dirs_cached": 0, "dirs_pruned": 0,
+        "files": 0, "candidates": 0, "busy": 0.0,
+        "phases": dict.fromkeys(PHASES[:-1], 0.0),
+    }
+
+
+class ScanProfile:
+    """Накопитель статистики; потокобезопасен (обновления — раз на папку)."""
+
+    def __init__(self, roots: List[str], threshold: int):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        # длинные корни вперёд, чтобы вложенный корень не приписался внешнему
+        self._prefixes = sorted(
+            ((r.rstrip(os.sep) + os.sep, r) for r in roots), key=lambda p: len(p[0]), reverse=True
+        )
+        self.roots: Dict[str, dict] = {r: _root_stats() for r in roots}
+        self.subtrees: Dict[str, list] = {}  # поддерево → [время, файлов]
+        self.histogram: Counter = Counter()
+        self.merge_time = 0.0
+        self.wall = 0.0
+        self._started = time.perf_counter()
+
+    # --- сбор ---------------------------------------------------------------
+    def _locate(self, dir_path: str) -> tuple[str | None, str]:
+        for prefix, root in self._prefixes:
+            if dir_path == root or dir_path.startswith(prefix):
+                rel = dir_path[len(prefix):].split(os.sep)[:SUBTREE_DEPTH] if dir_path != root else []
+                return root, os.path.join(root, *rel)
+        return None, dir_path
+
+    def add_dir(
+        self, dir_path: str, busy: float, stat: float, lnk: float, score: float,
+        files: int, candidates: int, pruned: int,
+    ) -> None:
+        """Папка перечитана с диска."""
+        root, subtree = self._locate(dir_path)
+        with self._lock:
+            stats = self.roots.setdefault(root or dir_path, _root_stats())
+            stats["dirs"] += 1
+            stats["dirs_pruned"] += pruned
+            stats["files"] += files
+            stats["candidates"] += candidates
+            stats["busy"] += busy
+            phases = stats["phases"]
+            phases["stat"] += stat
+            phases["lnk"] += lnk
+            phases["score"] += score
+            phases["list"] += max(busy - stat - lnk - score, 0.0)
+            entry = self.subtrees.setdefault(subtree, [0.0, 0])
+            entry[0] += busy
+            entry[1] += files
+
+    def add_cached_dir(self, dir_path: str, stat: float) -> None:
+        """Папка взята из манифеста (mtime не изменился), но stat на неё потрачен."""
+        root, _subtree = self._locate(dir_path)
+        with self._lock:
+            stats = self.roots.setdefault(root or dir_path, _root_stats())
+            stats["dirs_cached"] += 1
+            stats["busy"] += stat
+            stats["phases"]["stat"] += stat
+
+    def add_scores(self, scores) -> None:
+        """Score кандидатов — для гистограммы (вызывается из сборки индекса)."""
+        self.histogram.update(scores)
+
+    def finish(self) -> None:
+        self.wall = time.perf_counter() - self._started
+
+    # --- вывод --------------------------------------------------------------
+    def to_dict(self) -> dict:
+        files = sum(s["files"] for s in self.roots.values())
+        totals = dict.fromkeys(PHASES, 0.0)
+        for stats in self.roots.values():
+            for phase, value in stats["phases"].items():
+                totals[phase] += value
+        totals["merge"] = self.merge_time
+        below = sum(n for score, n in self.histogram.items() if score < self.threshold)
+        slowest = sorted(self.subtrees.items(), key=lambda kv: kv[1][0], reverse=True)[:TOP_SUBTREES]
+        return {
+            "timestamp": time.time(),
+            "wall_seconds": round(self.wall, 4),
+            "files_visited": files,
+            "files_per_second": round(files / self.wall, 1) if self.wall else None,
+            "phases_seconds": {k: round(v, 4) for k, v in totals.items()},
+            "roots": {
+                root: {**s, "busy": round(s["busy"], 4),
+                       "phases": {k: round(v, 4) for k, v in s["phases"].items()}}
+                for root, s in self.roots.items()
+            },
+            "threshold": self.threshold,
+            "score_histogram": {str(k): v for k, v in sorted(self.histogram.items())},
+            "below_threshold": below,
+            "at_or_above_threshold": sum(self.histogram.values()) - below,
+            "slowest_subtrees": [
+                {"path": path, "seconds": round(t, 4), "files": n} for path, (t, n) in slowest
+            ],
+        }
+
+    def report(self) -> None:
+        data = self.to_dict()
+        print("\n⏱️  Профиль сканирования")
+        print(f"   всего {data['wall_seconds']:.2f} с, файлов {data['files_visited']}"
+              f" ({data['files_per_second'] or 0:.0f}/с)")
+        phases = ", ".join(f"{k} {v:.2f} с" for k, v in data["phases_seconds"].items())
+        print(f"   фазы (сумма по потокам): {phases}")
+
+        print("   по корням:")
+        for root, s in data["roots"].items():
+            print(f"     {root}: {s['busy']:.2f} с, папок {s['dirs']} (+{s['dirs_cached']} из манифеста,"
+                  f" {s['dirs_pruned']} отрезано SKIP_DIR_NAMES), файлов {s['files']},"
+                  f" кандидатов {s['candidates']}")
+
+        print(f"   score (порог {self.threshold}): {data['at_or_above_threshold']} проходят,"
+              f" {data['below_threshold']} отсеяно")
+        peak = max(self.histogram.values(), default=0)
+        for score, count in sorted(self.histogram.items()):
+            mark = "✅" if score >= self.threshold else "  "
+            bar = "█" * max(1, round(30 * count / peak))
+            print(f"     {mark} {score:>4} {bar} {count}")
+
+        print("   самые медленные поддеревья:")
+        for item in data["slowest_subtrees"]:
+            print(f"     {item['seconds']:8.3f} с  {item['files']:>7} файлов  {item['path']}")
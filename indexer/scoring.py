@@ -0,0 +1,270 @@
+"""
+scoring.py — табличный движок эвристик для score_exe()
+======================================================
+Правила лежат в scoring_rules.json рядом с индексатором; их можно
+подкручивать без правки кода. При загрузке всё компилируется:
+    - стоп-слова в одно регулярное выражение (подстрока в имени файла);
+    - «плохие» части пути в одно выражение по целым компонентам пути;
+    - штраф/бонусы уровня папки считаются раз на папку и наследуются от
+      родителя (DirContextCache): работа на файл не зависит от глубины пути,
+      а score_batch() оценивает все файлы папки за один вызов.
+
+Ключи конфига (любой можно опустить — возьмётся значение по умолчанию)
+---------------------------------------------------------------------
+    threshold         минимальный score, чтобы попасть в индекс
+    weights           match_parent (exe = имя папки), alias_hit (ключ из ALIASES),
+                      launched (программу запускали голосом, см. usage_stats.py),
+                      stopword, bad_dir, bad_size, stale
+    min_size_mb       файлы меньше — штраф bad_size
+    stale_after_days  файлы старше — штраф stale
+    stopwords         подстроки имени файла → штраф stopword
+    bad_dir_parts     имена папок в пути → штраф bad_dir
+    path_rules        [{"suffix": ".url", "contains": "steam", "weight": 15}, …] —
+                      бонус, если у файла такой суффикс и путь содержит подстроку
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from typing import Iterable, List, Sequence, Tuple
+
+RULES_FILE = pathlib.Path(__file__).with_name("scoring_rules.json")
+
+DEFAULT_RULES: dict = {
+    "threshold": 3,
+    "weights": {
+        "match_parent": 10,
+        "alias_hit": 8,
+        "launched": 12,
+        "stopword": -10,
+        "bad_dir": -5,
+        "bad_size": -10,
+        "stale": -3,
+    },
+    "min_size_mb": 3,
+    "stale_after_days": 30,
+    "stopwords": [
+        "uninstall", "update", "setup", "helper", "crash",
+        "service", "patch", "install", "debug",
+    ],
+    "bad_dir_parts": [
+        "update", "installer", "redist", "patcher",
+        "resources", "bin", "debug", "x64", "x86",
+    ],
+    "path_rules": [
+        {"suffix": ".url", "contains": "steam", "weight": 15},
+    ],
+}
+
+_NEVER = re.compile(r"(?!)")  # пустой список слов — ничего не совпадает
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # длинные вперёд, чтобы «uninstall» не перехватывался «install»
+    return "|".join(re.escape(w.lower()) for w in sorted(set(words), key=len, reverse=True))
+
+
+class ScoringRules:
+    """Скомпилированный набор правил. Создаётся один раз на запуск индексатора."""
+
+    def __init__(self, config: dict | None = None, aliases: Iterable[str] = (), launched: Iterable[str] = ()):
+        cfg = {**DEFAULT_RULES, **(config or {})}
+        weights = {**DEFAULT_RULES["weights"], **cfg.get("weights", {})}
+
+        self.threshold: int = cfg["threshold"]
+        self.w_match_parent: int = weights["match_parent"]
+        self.w_alias_hit: int = weights["alias_hit"]
+        self.w_launched: int = weights["launched"]
+        self.w_stopword: int = weights["stopword"]
+        self.w_bad_dir: int = weights["bad_dir"]
+        self.w_bad_size: int = weights["bad_size"]
+        self.w_stale: int = weights["stale"]
+        self.min_size: float = cfg["min_size_mb"] * 1_048_576
+        self.stale_after: float = cfg["stale_after_days"] * 24 * 3600
+
+        self.stopwords = frozenset(w.lower() for w in cfg["stopwords"])
+        self.bad_dir_parts = frozenset(w.lower() for w in cfg["bad_dir_parts"])
+        self.path_rules: List[Tuple[str, str, int]] = [
+            (r["suffix"].lower(), r.get("contains", "").lower(), r["weight"])
+            for r in cfg["path_rules"]
+        ]
+        self.aliases = frozenset(aliases)
+        self.launched = frozenset(launched)
+
+        self._stopword_re = re.compile(_alternation(self.stopwords)) if self.stopwords else _NEVER
+        self._bad_dir_re = (
+            re.compile(r"(?:^|[\\/])(?:%s)(?=[\\/]|$)" % _alternation(self.bad_dir_parts), re.IGNORECASE)
+            if self.bad_dir_parts else _NEVER
+        )
+
+        # отпечаток правил + ключей ALIASES: если он изменился, кэш score в манифесте
+        # недействителен. launched сюда не входит — бонус за запуски добавляется
+        # при чтении (launched_bonus), и каждый новый запуск не сбрасывает кэш
+        payload = json.dumps([cfg, weights, sorted(self.aliases)], sort_keys=True, ensure_ascii=False)
+        self.fingerprint = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+        self.dir_cache = DirContextCache(self)
+
+    # --- уровень папки ------------------------------------------------------
+    def dir_penalty(self, dir_path: str) -> int:
+        """Штраф за «плохие» части пути папки (installer, redist, …)."""
+        return self.w_bad_dir if self._bad_dir_re.search(dir_path) else 0
+
+    def dir_context(self, dir_path: str) -> "DirContext":
+        """Контекст папки «с нуля» — по всему пути (O(глубина))."""
+        name = os.path.basename(dir_path)
+        dir_lower = dir_path.lower()
+        return DirContext(
+            _norm_name(name),
+            self.dir_penalty(dir_path),
+            tuple(contains in dir_lower for _suffix, contains, _weight in self.path_rules),
+        )
+
+    def child_context(self, parent: "DirContext", name: str) -> "DirContext":
+        """Контекст подпапки name из контекста родителя — O(1) по глубине."""
+        name_lower = name.lower()
+        penalty = parent.penalty or (self.w_bad_dir if name_lower in self.bad_dir_parts else 0)
+        flags = tuple(
+            flag or contains in name_lower
+            for flag, (_suffix, contains, _weight) in zip(parent.flags, self.path_rules)
+        )
+        return DirContext(_norm_name(name), penalty, flags)
+
+    # --- уровень файла ------------------------------------------------------
+    def score_batch(
+        self,
+        dir_path: str,
+        files: Sequence[Tuple[str, int, float]],
+        context: "DirContext" | None = None,
+        now: float | None = None,
+        volatile: bool = True,
+    ) -> List[int]:
+        """
+        Оценивает все файлы (имя, size, mtime) одной папки.
+        context — контекст папки; по умолчанию берётся из self.dir_cache.
+        volatile=False — без штрафа stale и бонуса launched: такой score
+        зависит только от файла и правил и годится для кэша, а то и другое
+        добавляется при чтении через age_penalty() и launched_bonus().
+        """
+        ctx = context or self.dir_cache.get(dir_path)
+        parent_norm, dir_score, flags = ctx.norm_name, ctx.penalty, ctx.flags
+        now = time.time() if now is None else now
+        stale_before = now - self.stale_after if volatile else float("-inf")
+        launched = self.launched if volatile else frozenset()
+        stopword = self._stopword_re.search
+        scores: List[int] = []
+
+        for name, size, mtime in files:
+            stem, suffix = os.path.splitext(name.lower())
+            score = dir_score
+
+            if stem == parent_norm:
+                score += self.w_match_parent
+            if stem in self.aliases:
+                score += self.w_alias_hit
+            if launched and stem.replace(" ", "") in launched:
+                score += self.w_launched
+            if stopword(stem):
+                score += self.w_stopword
+            if size < self.min_size:
+                score += self.w_bad_size
+            if mtime < stale_before:
+                score += self.w_stale
+            for (rule_suffix, contains, weight), in_dir in zip(self.path_rules, flags):
+                if suffix == rule_suffix and (in_dir or contains in name.lower()):
+                    score += weight
+
+            scores.append(score)
+        return scores
+
+    def score(self, dir_path: str, name: str, size: int, mtime: float, volatile: bool = True) -> int:
+        """Один файл — обёртка над score_batch()."""
+        return self.score_batch(dir_path, [(name, size, mtime)], volatile=volatile)[0]
+
+    def age_penalty(self, mtime: float, now: float | None = None) -> int:
+        """Штраф stale для файла с таким mtime на момент now (по умолчанию — сейчас)."""
+        now = time.time() if now is None else now
+        return self.w_stale if mtime < now - self.stale_after else 0
+
+    def launched_bonus(self, path: str) -> int:
+        """Бонус launched, если программу path уже запускали голосом."""
+        if not self.launched:
+            return 0
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return self.w_launched if stem.lower().replace(" ", "") in self.launched else 0
+
+
+def _norm_name(name: str) -> str:
+    """Имя папки для сравнения с именем exe: без расширения, нижний регистр, без пробелов."""
+    return os.path.splitext(name)[0].lower().replace(" ", "")
+
+
+class DirContext:
+    """Что нужно знать о папке для оценки её файлов; считается раз на папку."""
+
+    __slots__ = ("norm_name", "penalty", "flags")
+
+    def __init__(self, norm_name: str, penalty: int, flags: Tuple[bool, ...]):
+        self.norm_name = norm_name  # имя папки, нормализованное как ключ
+        self.penalty = penalty      # накопленный штраф за «плохие» части пути
+        self.flags = flags          # path_rules[i].contains встречается в пути папки
+
+
+class DirContextCache:
+    """
+    Кэш контекстов папок, заполняемый по ходу обхода. Контекст новой папки
+    выводится из контекста родителя (inherited); «с нуля» по всему пути
+    считаются только корни обхода и папки, чей родитель не встречался (computed).
+    """
+
+    def __init__(self, rules: ScoringRules):
+        self._rules = rules
+        self._contexts: dict = {}
+        self._lock = threading.Lock()
+        self.hits = self.inherited = self.computed = 0
+
+    def get(self, dir_path: str) -> DirContext:
+        ctx = self._contexts.get(dir_path)
+        if ctx is not None:
+            with self._lock:
+                self.hits += 1
+            return ctx
+
+        parent_path, name = os.path.split(dir_path)
+        parent = self._contexts.get(parent_path) if name else None
+        if parent is not None:
+            ctx = self._rules.child_context(parent, name)
+        else:
+            ctx = self._rules.dir_context(dir_path)
+        with self._lock:
+            if parent is not None:
+                self.hits += 1  # сам родитель нашёлся в кэше
+                self.inherited += 1
+            else:
+                self.computed += 1
+        self._contexts[dir_path] = ctx
+        return ctx
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.inherited = self.computed = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "inherited": self.inherited, "computed": self.computed,
+                "cached": len(self._contexts)}
+
+
+def load_rules(
+    path: pathlib.Path = RULES_FILE, aliases: Iterable[str] = (), launched: Iterable[str] = (),
+) -> ScoringRules:
+    """Читает правила из JSON; если файла нет — правила по умолчанию."""
+    try:
+        config = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        config = {}
+    return ScoringRules(config, aliases, launched)
@@ -0,0 +1,297 @@
+"""
+shortcuts.py — разбор ярлыков .lnk для индексатора
+==================================================
+Раньше каждый .lnk разворачивался новым COM-объектом ShellLink, а результат
+нигде не запоминался. Теперь:
+
+1. parse_lnk() — чистый Python по спецификации MS-SHLLINK: LinkInfo
+   (LocalBasePath + CommonPathSuffix, в т.ч. сетевые пути), блок
+   EnvironmentVariableDataBlock (%ProgramFiles%\\…) и RelativePath.
+   Работает на любой ОС, поэтому логику можно гонять и мерить на Linux.
+2. COM IShellLinkW — только запасной вариант на Windows (ярлыки, у которых
+   есть лишь IDList, «рекламные» MSI-ярлыки), один экземпляр на поток.
+3. ShortcutResolver — кэш {путь .lnk: [mtime, size, цель]} в JSON рядом
+   с индексом: ярлыки из «Пуска» не разбираются заново при каждом скане.
+"""
+from __future__ import annotations
+
+import ctypes
+import json
+import ntpath
+import os
+import pathlib
+import struct
+import sys
+import threading
+from typing import Dict
+
+import index_format
+
+CACHE_VERSION = 1
+
+_LINK_CLSID = b"\x01\x14\x02\x00\x00\x00\x00\x00\xC0\x00\x00\x00\x00\x00\x00F"
+_HEADER_SIZE = 0x4C
+
+# LinkFlags
+_HAS_ID_LIST = 0x0001
+_HAS_LINK_INFO = 0x0002
+_HAS_NAME = 0x0004
+_HAS_RELATIVE_PATH = 0x0008
+_HAS_WORKING_DIR = 0x0010
+_HAS_ARGUMENTS = 0x0020
+_HAS_ICON_LOCATION = 0x0040
+_IS_UNICODE = 0x0080
+
+# LinkInfoFlags
+_VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+_COMMON_NETWORK_RELATIVE_LINK = 0x2
+
+_ENV_BLOCK_SIGNATURE = 0xA0000001
+
+# ANSI-строки в .lnk записаны в кодовой странице системы, где ярлык создан
+_ANSI = "mbcs" if sys.platform == "win32" else "cp1251"
+
+
+# ╔═══════════════════════════════════════╗
+# ║        П А Р С Е Р  MS-SHLLINK        ║
+# ╚═══════════════════════════════════════╝
+def _cstr(data: bytes, offset: int) -> str:
+    end = data.find(b"\0", offset)
+    return data[offset:end if end >= 0 else len(data)].decode(_ANSI, errors="replace")
+
+
+def _wstr(data: bytes, offset: int) -> str:
+    end = offset
+    while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+        end += 2
+    return data[offset:end].decode("utf-16-le", errors="replace")
+
+
+def _link_info_target(data: bytes, start: int) -> str | None:
+    """Цель из структуры LinkInfo (или None, если её там нет)."""
+    size, header_size, flags, _vol, base_off, net_off, suffix_off = struct.unpack_from("<7I", data, start)
+    if size < header_size or start + size > len(data):
+        raise struct.error("LinkInfo выходит за конец файла")
+    info = data[start:start + size]
+    unicode_base = unicode_suffix = 0
+    if header_size >= 0x24:
+        unicode_base, unicode_suffix = struct.unpack_from("<2I", data, start + 28)
+
+    if unicode_suffix:
+        suffix = _wstr(info, unicode_suffix)
+    else:
+        suffix = _cstr(info, suffix_off) if suffix_off else ""
+
+    if flags & _VOLUME_ID_AND_LOCAL_BASE_PATH:
+        base = _wstr(info, unicode_base) if unicode_base else _cstr(info, base_off)
+        if base:
+            return base + suffix
+
+    if flags & _COMMON_NETWORK_RELATIVE_LINK and net_off:
+        # CommonNetworkRelativeLink: size, flags, NetNameOffset, …
+        net_name_off = struct.unpack_from("<I", info, net_off + 8)[0]
+        net_name = _cstr(info, net_off + net_name_off)
+        if net_name:
+            return net_name.rstrip("\\") + ("\\" + suffix if suffix else "")
+    return None
+
+
+def _env_block_target(data: bytes, pos: int) -> str | None:
+    """Цель из EnvironmentVariableDataBlock в ExtraData (с раскрытием %VAR%)."""
+    while pos + 8 <= len(data):
+        block_size, signature = struct.unpack_from("<2I", data, pos)
+        if block_size < 4 or pos + block_size > len(data):
+            break  # терминатор или обрезанный блок
+        if signature == _ENV_BLOCK_SIGNATURE and block_size >= 8 + 260 + 520:
+            target = _wstr(data, pos + 8 + 260) or _cstr(data, pos + 8)
+            # цель — всегда путь Windows: %VAR% раскрываем по правилам ntpath на любой ОС
+            return ntpath.expandvars(target) if target else None
+        pos += block_size
+    return None
+
+
+def parse_lnk(data: bytes, lnk_dir: str | None = None) -> str | None:
+    """
+    Возвращает путь цели ярлыка по его байтам или None, если формат не наш
+    или цель описана только IDList'ом. lnk_dir нужен для RelativePath.
+    Обрезанные и битые байты тоже дают None — исключений наружу нет, а
+    структура, выходящая за конец файла, не превращается в «полпути».
+    """
+    if len(data) < _HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != _HEADER_SIZE:
+        return None
+    if data[4:20] != _LINK_CLSID:
+        return None
+
+    flags = struct.unpack_from("<I", data, 20)[0]
+    pos = _HEADER_SIZE
+    try:
+        if flags & _HAS_ID_LIST:
+            pos += 2 + struct.unpack_from("<H", data, pos)[0]
+
+        target = None
+        if flags & _HAS_LINK_INFO:
+            target = _link_info_target(data, pos)
+            pos += struct.unpack_from("<I", data, pos)[0]
+
+        # StringData: NAME, RELATIVE_PATH, WORKING_DIR, ARGUMENTS, ICON_LOCATION
+        char_size = 2 if flags & _IS_UNICODE else 1
+        relative = None
+        for bit in (_HAS_NAME, _HAS_RELATIVE_PATH, _HAS_WORKING_DIR, _HAS_ARGUMENTS, _HAS_ICON_LOCATION):
+            if not flags & bit:
+                continue
+            count = struct.unpack_from("<H", data, pos)[0]
+            raw = data[pos + 2:pos + 2 + count * char_size]
+            pos += 2 + count * char_size
+            if pos > len(data):
+                raise struct.error("StringData выходит за конец файла")
+            if bit == _HAS_RELATIVE_PATH:
+                relative = raw.decode("utf-16-le" if char_size == 2 else _ANSI, errors="replace")
+
+        if target:
+            return target
+        target = _env_block_target(data, pos)
+        if target:
+            return target
+        if relative and lnk_dir:
+            return os.path.normpath(os.path.join(lnk_dir, relative.replace("\\", os.sep)))
+    except struct.error:
+        return None  # обрезанный/битый файл
+    return None
+
+
+def read_lnk_target(lnk_path: str) -> str | None:
+    """parse_lnk() для файла на диске."""
+    try:
+        with open(lnk_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return parse_lnk(data, os.path.dirname(lnk_path))
+
+
+# ╔═══════════════════════════════════════╗
+# ║     C O M  (только Windows, запас)    ║
+# ╚═══════════════════════════════════════╝
+_CLSID_SHELL_LINK = _LINK_CLSID
+_IID_ISHELL_LINK_W = b"\xF9\x14\x02\x00\x00\x00\x00\x00\xC0\x00\x00\x00\x00\x00\x00F"
+_IID_IPERSIST_FILE = b"\x0B\x01\x00\x00\x00\x00\x00\x00\xC0\x00\x00\x00\x00\x00\x00F"
+_CLSCTX_INPROC_SERVER = 1
+_STGM_READ = 0
+_MAX_PATH = 260
+
+_com = threading.local()  # по одному ShellLink + IPersistFile на поток
+
+
+def _vcall(obj: ctypes.c_void_p, index: int, *argtypes):
+    """Метод COM-интерфейса по номеру в vtable."""
+    vtbl = ctypes.cast(obj, ctypes.POINTER(ctypes.POINTER(ctypes.c_void_p))).contents
+    return ctypes.WINFUNCTYPE(ctypes.c_long, ctypes.c_void_p, *argtypes)(vtbl[index])
+
+
+def _com_link():
+    """ShellLink + IPersistFile текущего потока (создаются один раз)."""
+    link = getattr(_com, "link", None)
+    if link is not None:
+        return link
+
+    ole32 = ctypes.OleDLL("ole32")
+    ole32.CoInitialize(None)
+    psl = ctypes.c_void_p()
+    ole32.CoCreateInstance(
+        ctypes.c_char_p(_CLSID_SHELL_LINK), None, _CLSCTX_INPROC_SERVER,
+        ctypes.c_char_p(_IID_ISHELL_LINK_W), ctypes.byref(psl),
+    )
+    ppf = ctypes.c_void_p()
+    # IUnknown::QueryInterface — 0-й метод
+    if _vcall(psl, 0, ctypes.c_char_p, ctypes.POINTER(ctypes.c_void_p))(
+        psl, _IID_IPERSIST_FILE, ctypes.byref(ppf)
+    ):
+        raise OSError("IShellLink не отдал IPersistFile")
+    _com.link = (psl, ppf)
+    return _com.link
+
+
+def com_resolve(lnk_path: str) -> str | None:
+    """Разворачивает ярлык через IShellLinkW; на других ОС — None."""
+    if sys.platform != "win32":
+        return None
+    try:
+        psl, ppf = _com_link()
+        # IPersistFile::Load — 5-й метод (после IUnknown×3, GetClassID, IsDirty)
+        if _vcall(ppf, 5, ctypes.c_wchar_p, ctypes.c_ulong)(ppf, lnk_path, _STGM_READ):
+            return None
+        buf = ctypes.create_unicode_buffer(_MAX_PATH)
+        # IShellLinkW::GetPath — 3-й метод
+        if _vcall(psl, 3, ctypes.c_wchar_p, ctypes.c_int, ctypes.c_void_p, ctypes.c_ulong)(
+            psl, buf, _MAX_PATH, None, 0
+        ):
+            return None
+        return buf.value or None
+    except OSError:
+        return None
+
+
+# ╔═══════════════════════════════════════╗
+# ║        К Э Ш  Я Р Л Ы К О В           ║
+# ╚═══════════════════════════════════════╝
+class ShortcutResolver:
+    """
+    Разворачивает .lnk с кэшем по (путь, mtime, size). Кэш можно сохранить
+    на диск (save) и поднять при следующем запуске (load).
+    """
+
+    def __init__(self, cache_path: pathlib.Path | None = None, use_com: bool = sys.platform == "win32"):
+        self.cache_path = cache_path
+        self.use_com = use_com
+        self._cache: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = self.parsed = self.com = self.failed = 0
+
+    def resolve(self, lnk_path: str, st: os.stat_result | None = None) -> str | None:
+        """Цель ярлыка; st — уже известный stat самого .lnk (из DirEntry)."""
+        try:
+            st = st or os.stat(lnk_path)
+        except OSError:
+            return None
+        cached = self._cache.get(lnk_path)
+        if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            with self._lock:
+                self.hits += 1
+            return cached[2]
+
+        target = read_lnk_target(lnk_path)
+        source = "parsed"
+        if target is None and self.use_com:
+            target = com_resolve(lnk_path)
+            source = "com"
+        if target is None:
+            source = "failed"
+
+        with self._lock:
+            setattr(self, source, getattr(self, source) + 1)
+            self._cache[lnk_path] = [st.st_mtime, st.st_size, target]
+            self._dirty = True
+        return target
+
+    def load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if payload.get("version") == CACHE_VERSION:
+            self._cache = payload.get("links", {})
+
+    def save(self) -> None:
+        if self.cache_path is None or not self._dirty:
+            return
+        with self._lock:
+            payload = {"version": CACHE_VERSION, "links": dict(self._cache)}
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        index_format.atomic_write_bytes(self.cache_path, data)
+        self._dirty = False
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "parsed": self.parsed, "com": self.com, "failed": self.failed}
@@ -0,0 +1,189 @@
+"""
+synonym_batch.py — пакетная генерация синонимов для update_aliases.py
+=====================================================================
+Раньше update_aliases() делал один запрос к модели на каждый ключ
+app_index.json, строго по очереди и при каждом запуске — сотни программ
+означали десятки минут. Здесь:
+
+    - ключи пакуются по batch_size в один промпт, ответ — JSON-объект
+      {ключ: [синонимы]} сразу на весь пакет;
+    - пакеты уходят параллельно (ThreadPoolExecutor, не больше workers
+      запросов одновременно) через общий RateLimiter (токен-бакет:
+      не больше rate запросов в секунду, всплеск до burst);
+    - ошибка запроса или нечитаемый ответ — повтор с экспоненциальной
+      задержкой и джиттером, до retries раз;
+    - ключи, которых не оказалось в ответе, собираются во второй проход,
+      а если модель так и не ответила — остаются с синонимом [ключ].
+
+Сам вызов модели — функция complete(prompt) -> str, её передаёт
+вызывающий код (в update_aliases.py — OpenAI, в бенчмарке — локальный
+сервер-заглушка benchmarks/llm_standin.py).
+"""
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Sequence
+
+BATCH_SIZE = 10      # ключей в одном промпте
+WORKERS = 4          # одновременных запросов
+RATE = 2.0           # запросов в секунду в среднем
+BURST = 4            # и сколько можно отправить разом
+RETRIES = 3          # повторов на пакет
+BACKOFF = 1.0        # первая задержка перед повтором, сек.; дальше ×2
+
+BATCH_PROMPT = """
+Ты — голосовой помощник на русском языке, задача которого — помочь понять Vosk, как пользователь может произнести название программы на русском в разговорной речи.
+
+Тебе даётся список ключей — названий программ (например, "telegram", "chrome", "vscode"), которые совпадают с официальными именами программ в системе.
+
+Для КАЖДОГО ключа сгенерируй 5–10 реальных русскоязычных сокращений, жаргонизмов, транскрипций с английского на русский или распространённых вариантов произношения этого слова, которые часто используют люди, говоря голосом. Но не уменьшительно-ласкательно.
+
+Ответ должен быть строго JSON-объектом: ключ → массив строк, по одному полю на каждый ключ из списка.
+Никаких пояснений, никаких комментариев — только JSON.
+
+Пример:
+
+Вход: ["telegram", "chrome"]
+Выход: {{"telegram": ["телега", "тг", "телеграм", "телеграмм", "telegram"], "chrome": ["гугл", "хром", "браузер", "chrome"]}}
+
+---
+
+Начинаем. Вот ключи: {keys}
+"""
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def batch_prompt(keys: Sequence[str]) -> str:
+    return BATCH_PROMPT.format(keys=json.dumps(list(keys), ensure_ascii=False))
+
+
+def parse_batch_response(raw: str, keys: Sequence[str]) -> Dict[str, List[str]]:
+    """
+    Достаёт {ключ: [синонимы]} из ответа модели (в т.ч. обёрнутого в ```json).
+    Ключи не из пакета и нестроковые синонимы отбрасываются;
+    ValueError — если JSON-объекта в ответе нет.
+    """
+    found = _JSON_OBJECT.search(raw)
+    if not found:
+        raise ValueError("в ответе нет JSON-объекта")
+    data = json.loads(found.group(0))
+    wanted = set(keys)
+    return {
+        key: [s for s in synonyms if isinstance(s, str) and s.strip()]
+        for key, synonyms in data.items()
+        if key in wanted and isinstance(synonyms, list)
+    }
+
+
+class RateLimiter:
+    """Токен-бакет: в среднем rate захватов в секунду, всплеск до burst. Потокобезопасен."""
+
+    def __init__(self, rate: float = RATE, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class BatchStats:
+    """Счётчики прогона — печатаются в конце update_aliases.py."""
+
+    def __init__(self):
+        self.requests = self.retries = self.failed_batches = self.fallback_keys = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self) -> str:
+        return (f"запросов {self.requests}, повторов {self.retries}, "
+                f"неудачных пакетов {self.failed_batches}, ключей без ответа {self.fallback_keys}, "
+                f"{self.elapsed:.1f} с")
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _run_batch(
+    keys: List[str],
+    complete: Callable[[str], str],
+    limiter: RateLimiter,
+    retries: int,
+    backoff: float,
+    stats: BatchStats,
+) -> Dict[str, List[str]]:
+    prompt = batch_prompt(keys)
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        stats.add(requests=1)
+        try:
+            return parse_batch_response(complete(prompt), keys)
+        except Exception as e:  # сеть, 429/5xx, битый JSON — всё лечится повтором
+            if attempt == retries:
+                print(f"⚠️ Пакет {keys[0]}…({len(keys)}) не удался: {e}")
+                stats.add(failed_batches=1)
+                return {}
+            stats.add(retries=1)
+            time.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+    return {}
+
+
+def generate(
+    keys: Sequence[str],
+    complete: Callable[[str], str],
+    batch_size: int = BATCH_SIZE,
+    workers: int = WORKERS,
+    rate: float = RATE,
+    burst: int = BURST,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    stats: BatchStats | None = None,
+) -> Dict[str, List[str]]:
+    """Синонимы для всех keys: {ключ: [синонимы]} в порядке keys."""
+    stats = stats or BatchStats()
+    limiter = RateLimiter(rate, burst)
+    started = time.perf_counter()
+    results: Dict[str, List[str]] = {}
+    pending = list(dict.fromkeys(keys))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _pass in range(2):  # второй проход — ключи, пропущенные моделью в ответе
+            if not pending:
+                break
+            futures = [
+                pool.submit(_run_batch, chunk, complete, limiter, retries, backoff, stats)
+                for chunk in _chunks(pending, batch_size)
+            ]
+            for future in futures:
+                results.update(future.result())
+            pending = [key for key in pending if key not in results]
+
+    stats.add(fallback_keys=len(pending))
+    for key in pending:
+        results[key] = [key]
+    stats.elapsed = time.perf_counter() - started
+    return {key: results[key] for key in dict.fromkeys(keys)}
@@ -0,0 +1,142 @@
+"""
+synonym_cache.py — кэш ответов модели для update_aliases.py (SQLite)
+===================================================================
+Генерация синонимов ничего не помнила:
+каждый запуск update_aliases.py снова платил за те же ответы. Кэш лежит
+в synonym_cache.sqlite3 рядом с индексом (в .gitignore).
+
+Ключ записи — (ключ программы, модель, хэш шаблона промпта): сменили модель
+или переписали промпт — старые ответы просто перестают находиться.
+Запись живёт ttl_days; при превышении max_entries вытесняются давно
+не использовавшиеся (по полю used). Счётчики hits / misses / expired /
+evicted печатаются в конце прогона.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Mapping
+
+CACHE_FILE = pathlib.Path(__file__).with_name("synonym_cache.sqlite3")
+TTL_DAYS = 90
+MAX_ENTRIES = 20_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS synonyms (
+    key         TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    synonyms    TEXT NOT NULL,
+    created     REAL NOT NULL,
+    used        REAL NOT NULL,
+    PRIMARY KEY (key, model, prompt_hash)
+);
+CREATE INDEX IF NOT EXISTS synonyms_used ON synonyms (used);
+"""
+_CHUNK = 500  # параметров в одном IN (…) — с запасом до лимита SQLite
+
+
+def template_hash(template: str) -> str:
+    """Короткий хэш шаблона промпта — часть ключа кэша."""
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:16]
+
+
+class SynonymCache:
+    """Кэш {ключ: [синонимы]} для одной пары (модель, шаблон промпта)."""
+
+    def __init__(
+        self,
+        model: str,
+        prompt_hash: str,
+        path: pathlib.Path = CACHE_FILE,
+        ttl_days: float = TTL_DAYS,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.model = model
+        self.prompt_hash = prompt_hash
+        self.ttl = ttl_days * 24 * 3600
+        self.max_entries = max_entries
+        self._db = sqlite3.connect(str(path))
+        self._db.executescript(_SCHEMA)
+        self.hits = self.misses = self.expired = self.evicted = 0
+
+    # --- чтение --------------------------------------------------------------
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Ещё живые ответы для keys; отсутствующие и устаревшие считаются промахами."""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found: Dict[str, List[str]] = {}
+        stale: List[str] = []
+        for i in range(0, len(keys), _CHUNK):
+            chunk = keys[i:i + _CHUNK]
+            rows = self._db.execute(
+                f"SELECT key, synonyms, created FROM synonyms WHERE model = ? AND prompt_hash = ?"
+                f" AND key IN ({','.join('?' * len(chunk))})",
+                (self.model, self.prompt_hash, *chunk),
+            )
+            for key, synonyms, created in rows:
+                if now - created > self.ttl:
+                    stale.append(key)
+                else:
+                    found[key] = json.loads(synonyms)
+
+        if found:
+            with self._db:
+                self._db.executemany(
+                    "UPDATE synonyms SET used = ? WHERE key = ? AND model = ? AND prompt_hash = ?",
+                    [(now, key, self.model, self.prompt_hash) for key in found],
+                )
+        self.hits += len(found)
+        self.expired += len(stale)
+        self.misses += len(keys) - len(found)
+        return found
+
+    # --- запись --------------------------------------------------------------
+    def put_many(self, answers: Mapping[str, List[str]]) -> None:
+        """Сохраняет ответы и ужимает кэш до max_entries."""
+        if not answers:
+            return
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO synonyms VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, self.model, self.prompt_hash, json.dumps(synonyms, ensure_ascii=False), now, now)
+                 for key, synonyms in answers.items()],
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        """Удаляет устаревшие записи, затем — давно не использованные сверх max_entries."""
+        now = time.time()
+        with self._db:
+            removed = self._db.execute("DELETE FROM synonyms WHERE created < ?", (now - self.ttl,)).rowcount
+            (count,) = self._db.execute("SELECT COUNT(*) FROM synonyms").fetchone()
+            if count > self.max_entries:
+                removed += self._db.execute(
+                    "DELETE FROM synonyms WHERE rowid IN"
+                    " (SELECT rowid FROM synonyms ORDER BY used LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        self.evicted += removed
+
+    # --- служебное -----------------------------------------------------------
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM synonyms").fetchone()[0]
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        rate = f"{self.hits / total:.0%}" if total else "—"
+        return (f"попаданий {self.hits}, промахов {self.misses} (из них устарело {self.expired}), "
+                f"вытеснено {self.evicted}, доля попаданий {rate}, записей {len(self)}")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "SynonymCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,16 +1,24 @@
 # ╔═══════════════════════════════════════╗
 # ║       З А Г Р У З К А   Ф А Й Л О В    ║
 # ╚═══════════════════════════════════════╝
+import argparse
 import json
-import ast
 import os
+from pathlib import Path
+
 import openai
 from dotenv import load_dotenv
 
+import alias_store
+import synonym_batch
+import synonym_cache
+
 # Абсолютные пути к файлам ВНУТРИ indexer/
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 APP_INDEX_PATH = os.path.join(BASE_DIR, 'app_index.json')
-ALIASES_PATH = os.path.join(BASE_DIR, 'aliases.py')
+ALIASES_PATH = str(alias_store.ALIASES_FILE)
+OPENAI_MODEL = "gpt-4"
+MAX_SYNONYMS = 15
 
 # ╔═══════════════════════════════════════╗
 # ║          Г Л А В Н Ы Е  Ф‑Ц И И       ║
@@ -26,79 +34,53 @@ def load_app_index(path):
 
 
 def load_aliases(path):
-    """Загрузка aliases.py и извлечение словаря ALIASES через AST"""
+    """Загрузка aliases.json (данные синонимов, без разбора Python-кода)"""
     if not os.path.exists(path):
-        print(f"❌ Не найден файл aliases.py по пути: {path}")
+        print(f"❌ Не найден файл aliases.json по пути: {path}")
         exit(1)
-    with open(path, 'r', encoding='utf-8') as f:
-        source = f.read()
-    module = ast.parse(source)
-    for node in module.body:
-        if isinstance(node, ast.Assign) and node.targets[0].id == 'ALIASES':
-            return ast.literal_eval(node.value), source
-    raise ValueError('ALIASES dict not found')
-
-
-def get_russian_synonyms_from_gpt(key):
-    """Используем OpenAI для генерации синонимов команды на русском"""
-    prompt = f"""
-    Ты — голосовой помощник на русском языке, задача которого — помочь понять Vosk, как пользователь может произнести название программы на русском в разговорной речи.
-
-    Тебе даётся ключ — название программы (например, "telegram", "chrome", "vscode"), которое совпадает с официальным именем программы в системе.
-
-    Твоя задача — сгенерировать 5–10 реальных русскоязычных сокращений, жаргонизмовб, траскрипцию с англиского на русский или распространённых вариантов произношения этого слова, которые часто используют люди, говоря голосом. Но не уменшительно ласкательно
-
-    Ответ должен быть строго в формате JSON-массива строк.
-    Никаких пояснений, никаких комментариев — только JSON.
-
-    Примеры:
-
-    Вход: "telegram"  
-    Выход: ["телега", "тг", "телеграм", "телеграмм", "telegram"]
+    return alias_store.read_aliases(Path(path))
 
-    Вход: "chrome"  
-    Выход: ["гугл", "хром", "браузер", "chrome"]
 
-    Вход: "vscode"  
-    Выход: ["код", "вскод", "вскоде", "видео код", "vs code"]
+def openai_complete(prompt):
+    """Один запрос к OpenAI → текст ответа (адрес API можно сменить через OPENAI_BASE_URL)"""
+    response = openai.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.7,
+    )
+    return response.choices[0].message.content
 
-    ---
 
-    Начинаем. Вот ключ: "{key}"  
-    """
-
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-        )
-        raw = response.choices[0].message.content
-        return json.loads(raw)
-    except Exception as e:
-        print(f"Ошибка при обращении к OpenAI для '{key}':", e)
-        return [key]
-
-
-def update_aliases(app_index, aliases):
+def update_aliases(app_index, aliases, refresh=False, complete=openai_complete, stats=None, cache=None,
+                   **batch_options):
     """Добавление новых ключей из app_index в ALIASES, без дублирования синонимов,
-    с ограничением максимум 15 синонимов в списке"""
-    updated = False
-    MAX_SYNONYMS = 15
-
-    for key in app_index:
-        synonyms = get_russian_synonyms_from_gpt(key)
+    с ограничением максимум MAX_SYNONYMS синонимов в списке.
+
+    Синонимы запрашиваются пакетами и параллельно (см. synonym_batch.py) и только
+    для ключей, которых ещё нет в ALIASES; refresh=True — для всех ключей индекса.
+    cache (synonym_cache.SynonymCache) — ключи с живым ответом в кэше к модели не идут."""
+    keys = [key for key in app_index if refresh or key not in aliases]
+    if not keys:
+        return False
+
+    answers = cache.get_many(keys) if cache is not None else {}
+    missing = [key for key in keys if key not in answers]
+    if missing:
+        print(f"🧠 Запрашиваю синонимы для {len(missing)} программ (из кэша: {len(answers)})…")
+        generated = synonym_batch.generate(missing, complete, stats=stats, **batch_options)
+        if cache is not None:
+            # [ключ] — это заглушка synonym_batch для ключей без ответа, её не кэшируем
+            cache.put_many({key: synonyms for key, synonyms in generated.items() if synonyms != [key]})
+        answers.update(generated)
 
-        if key in aliases:
-            # Объединяем старые и новые синонимы вместе с ключом
-            combined = set(aliases[key]) | set(synonyms) | {key}
-        else:
-            combined = set(synonyms) | {key}
-
-        # Ограничиваем до MAX_SYNONYMS (сохраняем уникальные)
-        limited = list(combined)[:MAX_SYNONYMS]
+    updated = False
+    for key in keys:
+        synonyms = answers[key]
+        # Старые синонимы, потом новые, потом сам ключ — без повторов, порядок сохраняется
+        combined = list(dict.fromkeys([*aliases.get(key, []), *synonyms, key]))
+        limited = combined[:MAX_SYNONYMS]
 
-        if key not in aliases or set(limited) != set(aliases.get(key, [])):
+        if key not in aliases or set(limited) != set(aliases[key]):
             aliases[key] = limited
             updated = True
 
@@ -106,39 +88,47 @@ def update_aliases(app_index, aliases):
 
 
 
-def write_aliases(path, original_source, aliases_dict):
-    """Перезапись aliases.py с обновленным ALIASES"""
-    new_dict = 'ALIASES = ' + json.dumps(aliases_dict, ensure_ascii=False, indent=4)
-    lines = original_source.splitlines()
-    out_lines = []
-    in_aliases = False
-    for line in lines:
-        if line.startswith('ALIASES'):
-            in_aliases = True
-            out_lines.append(new_dict)
-        elif in_aliases:
-            if line.strip().startswith('#') or line.strip() == '':
-                continue
-            if not line.startswith(' '):
-                in_aliases = False
-                out_lines.append(line)
-        else:
-            out_lines.append(line)
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(out_lines))
+def write_aliases(path, aliases_dict):
+    """Атомарная перезапись aliases.json; скомпилированный alias_store пересоберётся при следующем load()"""
+    alias_store.write_aliases(aliases_dict, Path(path))
+    alias_store.reset()
 
 
 # ╔═══════════════════════════════════════╗
 # ║            Т О Ч К А  В Х О Д А       ║
 # ╚═══════════════════════════════════════╝
+def parse_args():
+    parser = argparse.ArgumentParser(description="Генерация синонимов для новых программ из app_index.json")
+    parser.add_argument("--refresh", action="store_true", help="Запросить синонимы и для уже известных ключей")
+    parser.add_argument("--batch-size", type=int, default=synonym_batch.BATCH_SIZE, help="Ключей в одном запросе")
+    parser.add_argument("--workers", type=int, default=synonym_batch.WORKERS, help="Одновременных запросов")
+    parser.add_argument("--rate", type=float, default=synonym_batch.RATE, help="Запросов в секунду")
+    parser.add_argument("--no-cache", action="store_true", help="Не брать ответы из synonym_cache.sqlite3")
+    parser.add_argument("--cache-ttl-days", type=float, default=synonym_cache.TTL_DAYS,
+                        help="Сколько дней ответ модели считается свежим")
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
+    args = parse_args()
     load_dotenv()
     openai.api_key = os.getenv("OPENAI_API_KEY")
 
     app_index = load_app_index(APP_INDEX_PATH)
-    aliases, src = load_aliases(ALIASES_PATH)
-    if update_aliases(app_index, aliases):
-        write_aliases(ALIASES_PATH, src, aliases)
-        print('✅ aliases.py обновлён.')
+    aliases = load_aliases(ALIASES_PATH)
+    stats = synonym_batch.BatchStats()
+    cache = None
+    if not args.no_cache:
+        cache = synonym_cache.SynonymCache(OPENAI_MODEL, synonym_cache.template_hash(synonym_batch.BATCH_PROMPT),
+                                           ttl_days=args.cache_ttl_days)
+    if update_aliases(app_index, aliases, refresh=args.refresh, stats=stats, cache=cache,
+                      batch_size=args.batch_size, workers=args.workers, rate=args.rate):
+        write_aliases(ALIASES_PATH, aliases)
+        print('✅ aliases.json обновлён.')
     else:
         print('ℹ️ Новых программ для добавления нет.')
+    if stats.requests:
+        print(f"📊 {stats.report()}")
+    if cache is not None:
+        print(f"💾 Кэш синонимов: {cache.report()}")
+        cache.close()
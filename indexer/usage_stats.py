@@ -0,0 +1,113 @@
+"""
+usage_stats.py — какие программы действительно запускают (usage_stats.json)
+===========================================================================
+score_exe() пытается угадать полезность программы по mtime файла, а лучший
+сигнал — что пользователь реально открывает голосом — раньше терялся.
+AppLauncher записывает сюда каждый удачный запуск: {ключ: [число запусков,
+время последнего]}. Дальше это используется:
+    - индексатором: программы, которые хоть раз запускали, получают бонус
+      weights.launched в scoring.py (и не выпадают из индекса за «stale»);
+    - AppLauncher: при нескольких равноценных совпадениях побеждает то,
+      у которого больше frecency (частота × затухание по давности);
+    - prewarm(): exe самых частых программ заранее читаются в кэш ОС,
+      чтобы они стартовали быстрее.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List
+
+try:
+    from indexer import index_format
+except ImportError:  # запуск из папки indexer/
+    import index_format
+
+USAGE_FILE = pathlib.Path(__file__).with_name("usage_stats.json")
+HALF_LIFE_DAYS = 14.0               # через столько дней без запусков вес падает вдвое
+PREWARM_MAX_BYTES = 64 * 1_048_576  # больше с одного файла не читаем
+_CHUNK = 1_048_576
+
+
+class UsageStats:
+    """Счётчики запусков; потокобезопасны, сохраняются атомарно."""
+
+    def __init__(self, path: pathlib.Path | None = USAGE_FILE, half_life_days: float = HALF_LIFE_DAYS):
+        self.path = path
+        self.half_life = half_life_days * 24 * 3600
+        self._data: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "UsageStats":
+        if self.path is not None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._data, ensure_ascii=False, separators=(",", ":"))
+        index_format.atomic_write_bytes(self.path, data.encode("utf-8"))
+
+    def record(self, key: str, when: float | None = None) -> None:
+        """Ещё один запуск программы key."""
+        when = time.time() if when is None else when
+        with self._lock:
+            count, _last = self._data.get(key, (0, 0.0))
+            self._data[key] = [count + 1, when]
+
+    def count(self, key: str) -> int:
+        return self._data.get(key, (0, 0.0))[0]
+
+    def frecency(self, key: str | None, now: float | None = None) -> float:
+        """Число запусков, затухающее с давностью последнего (0 — не запускали)."""
+        entry = self._data.get(key) if key else None
+        if not entry:
+            return 0.0
+        age = (time.time() if now is None else now) - entry[1]
+        return entry[0] * 0.5 ** (max(age, 0.0) / self.half_life)
+
+    def launched_keys(self) -> FrozenSet[str]:
+        """Ключи программ, которые запускали хотя бы раз."""
+        return frozenset(k for k, (count, _last) in self._data.items() if count > 0)
+
+    def top(self, n: int) -> List[str]:
+        """n ключей с наибольшей frecency."""
+        now = time.time()
+        return sorted(self._data, key=lambda k: self.frecency(k, now), reverse=True)[:n]
+
+
+def load(path: pathlib.Path | None = USAGE_FILE) -> UsageStats:
+    return UsageStats(path).load()
+
+
+def prewarm(paths: Iterable[str], max_bytes: int = PREWARM_MAX_BYTES) -> int:
+    """
+    Подтягивает файлы в кэш страниц ОС: на POSIX — posix_fadvise(WILLNEED),
+    иначе просто читает первые max_bytes. Возвращает, сколько байт затронуто.
+    """
+    touched = 0
+    for path in paths:
+        try:
+            with open(path, "rb", buffering=0) as f:
+                size = min(os.fstat(f.fileno()).st_size, max_bytes)
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_WILLNEED)
+                else:
+                    remaining = size
+                    while remaining > 0:
+                        chunk = f.read(min(_CHUNK, remaining))
+                        if not chunk:
+                            break
+                        remaining -= len(chunk)
+                touched += size
+        except OSError:
+            continue  # файл переехал или нет прав — не страшно, это лишь ускорение
+    return touched
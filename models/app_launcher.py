@@ -1,77 +1,191 @@
+import functools
 import json
 import os
-import subprocess
-import re
+import threading
+import webbrowser
 from pathlib import Path
+from urllib.parse import quote_plus
 
 # Изменяем импорт на абсолютный
 try:
-    from indexer import aliases
+    from indexer import alias_store, index_format, usage_stats
+    from models.app_registry import AppRegistry
+    from models.command_matcher import CommandMatcher
+    from models import intents
+    from models.fuzzy_index import FuzzyIndex
+    from models.launch_service import LaunchService
 except ImportError:
     # Альтернативный вариант для случаев, когда модуль запускается напрямую
     import sys
     from os.path import dirname, abspath
     sys.path.append(dirname(dirname(abspath(__file__))))
-    from indexer import aliases
+    from indexer import alias_store, index_format, usage_stats
+    from models.app_registry import AppRegistry
+    from models.command_matcher import CommandMatcher
+    from models import intents
+    from models.fuzzy_index import FuzzyIndex
+    from models.launch_service import LaunchService
+
+# слова команд — нечёткий поиск не должен принимать их за название программы
+TRIGGER_WORDS = tuple(word for words in intents.VERBS.values() for word in words) + intents.FILLERS
+SEARCH_URL = "https://www.google.com/search?q={}"
+# хвосты, с которыми кусок слова ещё считается названием: «открой хрома», «закрой телеграмом»
+CASE_ENDINGS = frozenset(("а", "я", "у", "ю", "е", "и", "ы", "ом", "ем", "ой", "ей",
+                          "ам", "ям", "ах", "ях", "ами", "ями"))
+INDEX_FILE = Path(__file__).resolve().parent.parent / "indexer" / "app_index.json"
+
+
+def _inflected(text: str, match) -> bool:
+    """Совпадение с начала слова, а остаток слова — падежное окончание."""
+    if match.start and text[match.start - 1].isalnum():
+        return False
+    end = match.end
+    while end < len(text) and text[end].isalnum():
+        end += 1
+    return text[match.end:end] in CASE_ENDINGS
+
 
 class AppLauncher:
-    def __init__(self):
-        self.app_paths = self.load_app_index()
-        self.app_mapping = self.build_app_mapping()
+    def __init__(self, prewarm_top: int = 0, ask=None, classifier: bool = False,
+                 index_path: Path = INDEX_FILE, aliases=None, launches=None, usage=None):
+        # index_path / aliases (AliasStore) / launches / usage подменяются в бенчмарках
+        self.index_path = Path(index_path)
+        self.aliases = aliases  # None — общий alias_store.get()
+        self.app_paths = self.load_app_index()  # AppRegistry: ключ → путь, синонимы → номер записи
+        self.matcher = None  # автомат по ключам и синонимам, строится в build_app_mapping()
+        self.fuzzy = None    # нечёткий индекс на случай, если Vosk исказил название
+        self.build_app_mapping()
+        # Popen — в фоне, с дедупликацией и метриками
+        self.launches = launches if launches is not None else LaunchService()
+        # сколько и когда запускали — для ничьих и индексатора
+        self.usage = usage if usage is not None else usage_stats.load()
+        # намерение фразы → обработчик; ask(text) (например, Ollama) — только если ничего не подошло
+        handlers = {
+            intents.LAUNCH: self._launch,
+            intents.SWITCH: self._launch,  # уже запущенную программу launch() выводит на передний план
+            intents.CLOSE: self._close,
+            intents.SEARCH: self._search,
+        }
+        if ask is not None:
+            handlers[intents.ASK] = lambda _slot, text: ask(text)
+        self.router = intents.IntentEngine(
+            handlers, classifier=intents.IntentClassifier() if classifier else None)
+        if prewarm_top:
+            self.prewarm(prewarm_top)
+
+    def usage_rank(self, record_id: int) -> float:
+        """frecency программы по номеру записи — для выбора среди равноценных совпадений"""
+        return self.usage.frecency(self.app_paths.key(record_id))
+
+    def prewarm(self, top: int) -> threading.Thread:
+        """Подтягивает exe top самых запускаемых программ в кэш ОС (в фоне)"""
+        paths = [self.app_paths[key] for key in self.usage.top(top) if key in self.app_paths]
+        thread = threading.Thread(target=usage_stats.prewarm, args=(paths,), daemon=True, name="prewarm")
+        thread.start()
+        return thread
+
+    def _record_launch(self, key, future):
+        """Колбэк фонового запуска: удачные запуски идут в usage_stats.json"""
+        result = future.result()
+        if result.action != "failed":
+            self.usage.record(key)
+            try:
+                self.usage.save()
+            except OSError as e:
+                print(f"⚠️ Не удалось сохранить статистику запусков: {e}")
     
     def load_app_index(self):
-        """Загрузка путей из JSON-файла"""
-        base_dir = Path(__file__).resolve().parent.parent
-        index_path = base_dir / "indexer" / "app_index.json"
-        
+        """Реестр программ: из app_index.bin, если он свежий, иначе из JSON-файла и alias_store"""
+        index_path = self.index_path
+        binary_path = index_path.with_suffix(".bin")
+
+        # .bin годится, только если он не старше JSON (его могли поправить руками)
+        # и aliases.json (тогда таблица синонимов в .bin устарела)
+        try:
+            binary_mtime = binary_path.stat().st_mtime
+            sources = [p for p in (index_path, alias_store.ALIASES_FILE) if p.exists()]
+            if all(binary_mtime >= p.stat().st_mtime for p in sources):
+                with index_format.load_index(binary_path) as compact:
+                    if self.aliases is None:
+                        return AppRegistry(compact.to_dict(), compact.alias_map().items())
+                    return AppRegistry(compact.to_dict(), self.aliases.synonym_pairs())
+        except (OSError, ValueError):
+            pass  # нет .bin или он битый — читаем JSON
+
         try:
             with open(index_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                paths = json.load(f)
         except FileNotFoundError:
             print(f"Файл конфигурации не найден: {index_path}")
-            return {}
+            paths = {}
         except json.JSONDecodeError:
             print(f"Ошибка чтения JSON: {index_path}")
-            return {}
+            paths = {}
+
+        # синонимы — из скомпилированного alias_store, уже нормализованные
+        store = self.aliases if self.aliases is not None else alias_store.get()
+        return AppRegistry(paths, store.synonym_pairs())
     
     def build_app_mapping(self):
-        """Создание словаря для поиска приложений"""
-        mapping = {}
-        
-        # Добавляем основные названия
-        for app_name, path in self.app_paths.items():
-            mapping[app_name] = path
-        
-        # Добавляем синонимы
-        for app_name, synonyms in aliases.ALIASES.items():
-            if app_name in self.app_paths:
-                for synonym in synonyms:
-                    mapping[synonym] = self.app_paths[app_name]
-        
-        return mapping
-    
+        """Автомат и нечёткий индекс для поиска приложений: название → номер записи"""
+        # ключи и синонимы; повторный синоним перекрывает ключ
+        names = list(self.app_paths.names())
+        self.matcher = CommandMatcher(names)
+        self.fuzzy = FuzzyIndex(names)
+        return self.app_paths
+
+    def find_app(self, phrase: str):
+        """(название, AppRecord) программы из фразы или None"""
+        # один проход автомата: самое длинное совпадение по границам слов
+        match = self.matcher.best(phrase, prefer=self.usage_rank)
+        if match is not None and match.rank(phrase)[0]:
+            return match.pattern, self.app_paths.record(self.matcher.value(match))
+        # целого слова нет — ищем по звучанию («стив» → «стим»); кусок слова
+        # берём, только если и по звучанию ничего не нашлось и остаток слова —
+        # падежное окончание («хром» в «хрома», но не «мапо» в «мапоус»)
+        fuzzy = self.fuzzy.best_in_text(phrase, TRIGGER_WORDS, prefer=self.usage_rank)
+        if fuzzy is not None:
+            return fuzzy.name, self.app_paths.record(fuzzy.value)
+        if match is not None and _inflected(phrase.lower(), match):
+            return match.pattern, self.app_paths.record(self.matcher.value(match))
+        return None
+
+    def _launch(self, slot: str, text: str):
+        found = self.find_app(slot or text)
+        if found is None:
+            return None  # «как перейти на новую работу» — не команда, пусть отвечает LLM
+        app_name, record = found
+
+        # Запуск уходит в фон: голосовой цикл не ждёт появления процесса
+        future, deduped = self.launches.launch(app_name, record.path)
+        if deduped:
+            return f"Уже открываю {app_name}"
+        future.add_done_callback(functools.partial(self._record_launch, record.key))
+        return f"Открываю {app_name}"
+
+    def _close(self, slot: str, text: str):
+        found = self.find_app(slot or text)
+        if found is None:
+            return None
+        app_name, record = found
+        self.launches.close(app_name, record.path)
+        return f"Закрываю {app_name}"
+
+    def _search(self, slot: str, text: str) -> str:
+        if not slot:
+            return "Что нужно найти?"
+        threading.Thread(target=webbrowser.open, args=(SEARCH_URL.format(quote_plus(slot)),),
+                         daemon=True, name="search").start()
+        return f"Ищу {slot}"
+
     def execute_command(self, text: str) -> str:
-        """Обработка команд запуска приложений"""
-        text = text.lower()
-        
-        # Проверка триггерных слов
-        triggers = r'открыть|включить|переключить|запусти|запустить|включи|открой'
-        if not re.search(triggers, text):
-            return ""
-        
-        # Поиск приложения в команде
-        for app_name, app_path in self.app_mapping.items():
-            if app_name in text:
-                try:
-                    subprocess.Popen(app_path)
-                    return f"Открываю {app_name}"
-                except Exception as e:
-                    return f"Ошибка при открытии {app_name}: {str(e)}"
-        
-        return "Не удалось распознать название программы"
+        """Обработка голосовой команды; "" — это не команда (отдайте фразу LLM)"""
+        result = self.router.route(text)
+        return result.reply or ""
 
 # Для тестирования модуля отдельно
 if __name__ == "__main__":
     launcher = AppLauncher()
     print("Тест запуска приложений:")
-    print(launcher.execute_command("запусти хром"))
\ No newline at end of file
+    for phrase in ("запусти хром", "переключись на хром", "закрой хром", "найди погоду в москве"):
+        print(f"{phrase} → {launcher.router.parse(phrase)}")
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+app_registry.py — компактный реестр программ для AppLauncher
+============================================================
+Раньше AppLauncher держал app_paths {ключ: путь}, обратный key_by_path
+{путь: ключ} и app_mapping {синоним: путь} — три словаря на каждую
+программу и синоним. На каталогах в десятки тысяч программ (библиотеки игр,
+папки портативных утилит) это десятки мегабайт одних словарей.
+
+AppRegistry хранит то же плоско:
+    - запись программы — номер id; ключи — список, пути — отдельный список
+      уникальных интернированных строк, а запись ссылается на путь номером
+      (array), так что одинаковые пути хранятся один раз;
+    - синонимы — список строк и array с номером записи-владельца;
+    - AppRecord (__slots__) — лёгкое «представление» записи по запросу.
+
+Снаружи реестр — Mapping {ключ: путь}, как прежний app_paths. В автомат
+CommandMatcher и FuzzyIndex уходят пары (название, id), а не пути.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+
+class AppRecord:
+    """Программа из реестра: номер, ключ индекса и путь к exe."""
+
+    __slots__ = ("id", "key", "path")
+
+    def __init__(self, record_id: int, key: str, path: str):
+        self.id = record_id
+        self.key = key
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"AppRecord({self.id}, {self.key!r}, {self.path!r})"
+
+
+class AppRegistry(Mapping[str, str]):
+    """Ключ → путь; записи, пути и синонимы хранятся массивами."""
+
+    def __init__(self, paths: Mapping[str, str], synonyms: Iterable[Tuple[str, str]] = ()):
+        """paths — {ключ: путь} из app_index; synonyms — пары (синоним, ключ), чужие ключи пропускаются."""
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._paths: List[str] = []
+        self._path_ids = array("I")
+        path_ids: Dict[str, int] = {}  # только на время сборки
+
+        for key, path in paths.items():
+            path_id = path_ids.get(path)
+            if path_id is None:
+                path_id = path_ids[path] = len(self._paths)
+                self._paths.append(sys.intern(path))
+            self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._path_ids.append(path_id)
+
+        self._synonyms: List[str] = []
+        self._owners = array("I")
+        for synonym, key in synonyms:
+            record_id = self._ids.get(key)
+            if record_id is not None:
+                self._synonyms.append(synonym)
+                self._owners.append(record_id)
+
+    # --- Mapping {ключ: путь} --------------------------------------------------
+    def __getitem__(self, key: str) -> str:
+        return self._paths[self._path_ids[self._ids[key]]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
+
+    # --- записи ----------------------------------------------------------------
+    def key(self, record_id: int) -> str:
+        return self._keys[record_id]
+
+    def path(self, record_id: int) -> str:
+        return self._paths[self._path_ids[record_id]]
+
+    def record(self, record_id: int) -> AppRecord:
+        return AppRecord(record_id, self._keys[record_id], self.path(record_id))
+
+    def names(self) -> Iterator[Tuple[str, int]]:
+        """(название, id): сначала ключи, потом синонимы — повторный синоним перекрывает ключ."""
+        ids = list(range(len(self._keys)))  # общие объекты int для ключа и его синонимов
+        yield from zip(self._keys, ids)
+        yield from zip(self._synonyms, map(ids.__getitem__, self._owners))
+
+    def stats(self) -> dict:
+        return {"apps": len(self._keys), "paths": len(self._paths), "synonyms": len(self._synonyms)}
@@ -0,0 +1,162 @@
+"""
+command_matcher.py — поиск названий программ в распознанной фразе
+==================================================================
+Раньше execute_command() перебирал весь app_mapping и для каждого синонима
+делал `synonym in text`: O(синонимов × длина фразы) на каждую команду,
+а результат зависел от порядка словаря — короткий «вар» мог перехватить
+«вартандер».
+
+CommandMatcher компилирует все ключи и синонимы в автомат Ахо–Корасик
+один раз (в build_app_mapping) и за один проход по фразе находит все
+вхождения. Из них best() выбирает:
+    1) совпадение по границам слов с обеих сторон;
+    2) иначе — хотя бы с начала слова («хром» в «хрома»);
+    3) при равенстве — самое длинное, затем то, что чаще запускают
+       (prefer — например, frecency из usage_stats), затем самое левое
+       в фразе, затем то, что раньше встретилось в словаре.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, Generic, Iterable, List, NamedTuple, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class Match(NamedTuple):
+    start: int     # позиция в (приведённой к нижнему регистру) фразе
+    end: int       # позиция сразу после совпадения
+    pattern: str   # ключ или синоним, как он записан в словаре
+    order: int     # номер шаблона в исходном словаре
+
+    def rank(self, text: str, preference: float = 0.0) -> tuple:
+        """Чем больше, тем лучше (см. правила в шапке модуля)."""
+        starts_word = self.start == 0 or not text[self.start - 1].isalnum()
+        ends_word = self.end == len(text) or not text[self.end].isalnum()
+        return (starts_word and ends_word, starts_word, self.end - self.start, preference,
+                -self.start, -self.order)
+
+
+class CommandMatcher(Generic[V]):
+    """
+    Автомат Ахо–Корасик над шаблонами {текст: значение}.
+
+    Бор нумеруется обходом в ширину и хранится плоско: метки рёбер всех узлов
+    подряд в одной строке _labels (рёбра узла n — _labels[_starts[n]:_starts[n + 1]]),
+    а ребро в позиции p ведёт в узел p + 1 — при такой нумерации дети идут
+    подряд. Ссылки-неудачи, номер шаблона, кончающегося в узле, и ссылка на
+    ближайший суффикс-шаблон — в array. На 50k программ это в разы меньше
+    словаря переходов на каждый узел.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, V]] | Dict[str, V]):
+        items = patterns.items() if isinstance(patterns, dict) else patterns
+        self._patterns: List[str] = []
+        self._values: List[V] = []
+        seen: Dict[str, int] = {}
+
+        for text, value in items:
+            lowered = text.lower().strip()
+            if not lowered:
+                continue
+            if lowered == text:
+                lowered = text  # тот же объект строки, что у вызывающего, — без копии
+            if lowered in seen:  # повтор — как в dict, побеждает последнее значение
+                self._values[seen[lowered]] = value
+                continue
+            seen[lowered] = len(self._patterns)
+            self._patterns.append(lowered)
+            self._values.append(value)
+
+        self._build()
+
+    # --- построение ----------------------------------------------------------
+    def _build(self) -> None:
+        # 1) обычный бор на словарях — только на время сборки
+        goto: List[Dict[str, int]] = [{}]
+        ends: List[int] = [-1]
+        for pattern_id, text in enumerate(self._patterns):
+            node = 0
+            for ch in text:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    ends.append(-1)
+                node = nxt
+            ends[node] = pattern_id
+
+        # 2) перенумерация обходом в ширину: ребро в позиции p ведёт в узел p + 1
+        order = [0]
+        labels: List[str] = []
+        starts = array("I")
+        for old in order:  # order растёт по ходу обхода
+            starts.append(len(labels))
+            for ch, child in goto[old].items():
+                labels.append(ch)
+                order.append(child)
+        starts.append(len(labels))
+        del goto
+
+        self._labels = "".join(labels)
+        self._starts = starts
+        self._end = array("i", (ends[old] for old in order))
+        self._fail = array("I", bytes(4 * len(order)))
+        self._link = array("I", bytes(4 * len(order)))
+        self._link_failures()
+
+    def _link_failures(self) -> None:
+        """Ссылки-неудачи (узлы уже в порядке обхода в ширину) и ссылки на суффикс-шаблоны."""
+        labels, starts, fail, link, end = self._labels, self._starts, self._fail, self._link, self._end
+        find = labels.find
+        for node in range(len(end)):
+            for p in range(starts[node], starts[node + 1]):
+                child, ch = p + 1, labels[p]
+                if node:
+                    f = fail[node]
+                    target = find(ch, starts[f], starts[f + 1])
+                    while target < 0 and f:
+                        f = fail[f]
+                        target = find(ch, starts[f], starts[f + 1])
+                    fail[child] = target + 1 if target >= 0 else 0
+                suffix = fail[child]
+                link[child] = suffix if end[suffix] >= 0 else link[suffix]
+
+    # --- поиск ---------------------------------------------------------------
+    def find_all(self, text: str) -> List[Match]:
+        """Все вхождения шаблонов в text (text ожидается в нижнем регистре)."""
+        labels, starts, fail, link, end, patterns = (
+            self._labels, self._starts, self._fail, self._link, self._end, self._patterns)
+        matches: List[Match] = []
+        node = 0
+        for i, ch in enumerate(text):
+            while True:
+                p = labels.find(ch, starts[node], starts[node + 1])
+                if p >= 0:
+                    node = p + 1
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            out = node if end[node] >= 0 else link[node]
+            while out:
+                pid = end[out]
+                matches.append(Match(i + 1 - len(patterns[pid]), i + 1, patterns[pid], pid))
+                out = link[out]
+        return matches
+
+    def best(self, text: str, prefer: Callable[[V], float] | None = None) -> Match | None:
+        """Лучшее совпадение в фразе или None; prefer(значение) разрешает ничьи."""
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        if prefer is None:
+            return max(matches, key=lambda m: m.rank(text))
+        return max(matches, key=lambda m: m.rank(text, prefer(self._values[m.order])))
+
+    def value(self, match: Match) -> V:
+        return self._values[match.order]
+
+    def __len__(self) -> int:
+        return len(self._patterns)
@@ -0,0 +1,220 @@
+"""
+fuzzy_index.py — нечёткий поиск программы по «расслышанному» названию
+======================================================================
+Vosk часто ошибается в названиях («стив» вместо «стим»), а aliases.py
+пытается закрыть это ручными опечатками. FuzzyIndex — запасной путь для
+execute_command(), когда точный CommandMatcher ничего не нашёл.
+
+Как устроено
+------------
+1. phonetic_key() сводит название к «звучанию»: латиница транслитерируется
+   в кириллицу (steam → стим), звонкие оглушаются (в→ф, д→т, …),
+   близкие гласные склеиваются (о/ё/я→а, е/э/ы/й→и, ю→у), мягкий/твёрдый
+   знаки, пробелы и повторы букв убираются.
+2. По ключам строится инвертированный индекс биграмм (с ^ и $ по краям).
+   Он считается один раз при сборке, запрос трогает только свои биграммы.
+3. Кандидаты ранжируются по коэффициенту Дайса, лучшие TOP_CANDIDATES
+   переоцениваются расстоянием Левенштейна по ключам:
+       confidence = 1 - расстояние / длина более длинного ключа.
+   Переоценка останавливается, если вышел бюджет времени (budget_ms).
+   best_in_text() делает до MAX_WINDOW поисков на каждое слово фразы,
+   поэтому бюджет у него один на всю фразу, а не на каждый поиск.
+
+Порог уверенности не может быть одним на все длины: одна ошибка в ключе
+из 4 букв — это 0.75 («стив» → «стим»), а лишняя буква в «свет» против
+«сивит» — 0.8. Поэтому названия с уверенностью ниже MIN_CONFIDENCE
+принимаются, только если ключи одной длины (не короче SWAP_MIN_LENGTH)
+и отличаются одной заменой буквы («хрон» → «хром»), а ближайшее другое
+название хуже хотя бы на MIN_MARGIN. Вставки и пропуски букв в коротких
+словах так и остаются «не узнали».
+"""
+from __future__ import annotations
+
+import re
+import time
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Generic, Iterable, List, NamedTuple, Sequence, Tuple, TypeVar
+
+V = TypeVar("V")
+
+MIN_CONFIDENCE = 0.85  # ниже — считаем, что программу не узнали (кроме одной замены буквы)
+SWAP_MIN_LENGTH = 4    # с такой длины ключа одна замена буквы ещё узнаётся
+MIN_MARGIN = 0.1       # насколько одна замена должна быть лучше другой программы
+TOP_CANDIDATES = 20    # сколько лучших по биграммам переоценивать Левенштейном
+BUDGET_MS = 3.0        # бюджет на один поиск (lookup) и на всю фразу (best_in_text)
+MAX_WINDOW = 3         # best_in_text(): окна до стольких слов подряд
+
+# латиница → кириллица: сначала сочетания, потом одиночные буквы
+_LATIN_DIGRAPHS = [
+    ("sch", "ш"), ("tch", "ч"), ("sh", "ш"), ("ch", "ч"), ("zh", "ж"), ("kh", "х"),
+    ("ph", "ф"), ("th", "т"), ("ck", "к"), ("qu", "кв"), ("ee", "и"), ("ea", "и"),
+    ("oo", "у"), ("ou", "у"), ("ai", "ей"), ("ay", "ей"), ("ya", "я"), ("yu", "ю"),
+    ("ce", "се"), ("ci", "си"), ("cy", "си"), ("ge", "дже"), ("gi", "джи"),
+]
+_LATIN = str.maketrans({
+    "a": "а", "b": "б", "c": "к", "d": "д", "e": "е", "f": "ф", "g": "г", "h": "х",
+    "i": "и", "j": "дж", "k": "к", "l": "л", "m": "м", "n": "н", "o": "о", "p": "п",
+    "q": "к", "r": "р", "s": "с", "t": "т", "u": "у", "v": "в", "w": "в", "x": "кс",
+    "y": "и", "z": "з",
+})
+_LATIN_RE = re.compile("|".join(re.escape(src) for src, _dst in _LATIN_DIGRAPHS))
+_LATIN_MAP = dict(_LATIN_DIGRAPHS)
+
+# кириллица → «звучание»
+_FOLD = str.maketrans({
+    "ё": "а", "е": "и", "э": "и", "ы": "и", "й": "и",
+    "о": "а", "я": "а", "ю": "у",
+    "б": "п", "в": "ф", "г": "к", "д": "т", "з": "с", "ж": "ш", "щ": "ш", "ц": "с",
+    "ь": None, "ъ": None,
+})
+_NOT_LETTER = re.compile(r"[^0-9а-яё]+")
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def phonetic_key(text: str) -> str:
+    """Фонетический ключ названия (пустая строка, если букв нет)."""
+    text = text.lower()
+    text = _LATIN_RE.sub(lambda m: _LATIN_MAP[m.group(0)], text).translate(_LATIN)
+    text = _NOT_LETTER.sub("", text).translate(_FOLD)
+    return _REPEATS.sub(r"\1", text)
+
+
+def _bigrams(key: str) -> List[str]:
+    padded = f"^{key}$"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+def _levenshtein(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class FuzzyMatch(NamedTuple):
+    name: str          # ключ или синоним, как он записан в словаре
+    value: object      # то, что к нему привязано (путь к программе)
+    confidence: float  # 0…1
+    swap: bool = False  # ключи одной длины (≥ SWAP_MIN_LENGTH) отличаются одной заменой буквы
+
+
+class FuzzyIndex(Generic[V]):
+    """Индекс биграмм по фонетическим ключам названий {название: значение}."""
+
+    def __init__(self, names: Iterable[Tuple[str, V]] | Dict[str, V]):
+        items = names.items() if isinstance(names, dict) else names
+        self._keys: List[str] = []
+        self._names: List[str] = []    # первое название с таким ключом
+        self._values: List[V] = []
+        sizes: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        seen: Dict[str, int] = {}
+
+        for name, value in items:
+            key = phonetic_key(name)
+            if not key or key in seen:
+                continue
+            seen[key] = len(self._keys)
+            grams = set(_bigrams(key))
+            for gram in grams:
+                postings.setdefault(gram, []).append(seen[key])
+            self._keys.append(key)
+            self._names.append(name)
+            self._values.append(value)
+            sizes.append(len(grams))
+
+        # списки номеров → array: 4 байта на номер вместо указателя и объекта int
+        self._sizes = array("I", sizes)
+        self._postings: Dict[str, array] = {gram: array("I", ids) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, phrase: str, limit: int = 1, budget_ms: float = BUDGET_MS,
+               deadline: float | None = None) -> List[FuzzyMatch]:
+        """
+        До limit лучших названий для phrase, по убыванию уверенности.
+        deadline (time.perf_counter()) — общий срок вместо budget_ms.
+        """
+        key = phonetic_key(phrase)
+        if not key:
+            return []
+        if deadline is None:
+            deadline = time.perf_counter() + budget_ms / 1000
+        grams = set(_bigrams(key))
+
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        # most_common() отбирает пул на C, Дайс считаем уже только по нему
+        sizes = self._sizes
+        pool = shared.most_common(TOP_CANDIDATES * 2)
+        pool.sort(key=lambda item: 2 * item[1] / (len(grams) + sizes[item[0]]), reverse=True)
+        candidates = [i for i, _count in pool[:TOP_CANDIDATES]]
+
+        scored: List[Tuple[float, int, bool]] = []
+        for i in candidates:
+            other = self._keys[i]
+            distance = _levenshtein(key, other)
+            swap = distance == 1 and len(key) == len(other) >= SWAP_MIN_LENGTH
+            # при равенстве — раньше встретившееся в словаре
+            scored.append((1 - distance / max(len(key), len(other)), -i, swap))
+            if time.perf_counter() > deadline:
+                break
+        scored.sort(reverse=True)
+        return [FuzzyMatch(self._names[-i], self._values[-i], round(c, 3), swap) for c, i, swap in scored[:limit]]
+
+    @staticmethod
+    def accepted(matches: Sequence[FuzzyMatch], min_confidence: float = MIN_CONFIDENCE) -> List[FuzzyMatch]:
+        """
+        Совпадения из lookup(), которым можно верить: все с уверенностью
+        не ниже min_confidence, а если таких нет — лучшее, если это одна
+        замена буквы и другая программа заметно дальше (MIN_MARGIN).
+        """
+        sure = [m for m in matches if m.confidence >= min_confidence]
+        if sure or not matches or not matches[0].swap:
+            return sure
+        top = matches[0]
+        runner_up = max((m.confidence for m in matches[1:] if m.value != top.value), default=0.0)
+        return [top] if top.confidence - runner_up >= MIN_MARGIN else []
+
+    def best(self, phrase: str, min_confidence: float = MIN_CONFIDENCE) -> FuzzyMatch | None:
+        matches = self.accepted(self.lookup(phrase, limit=5), min_confidence)
+        return matches[0] if matches else None
+
+    def best_in_text(
+        self,
+        text: str,
+        skip_words: Sequence[str] = (),
+        min_confidence: float = MIN_CONFIDENCE,
+        prefer: Callable[[V], float] | None = None,
+        budget_ms: float = BUDGET_MS,
+    ) -> FuzzyMatch | None:
+        """
+        Лучшее название среди окон до MAX_WINDOW слов фразы (без skip_words —
+        например, глаголов-триггеров). При равной уверенности — то, что больше
+        нравится prefer(значение) (частота запусков), затем более длинное окно.
+        budget_ms — на всю фразу: когда он вышел, оставшиеся окна (сначала
+        проверяются отдельные слова, потом пары и тройки) пропускаются.
+        """
+        skip = set(skip_words)
+        words = [w for w in text.lower().split() if w not in skip]
+        deadline = time.perf_counter() + budget_ms / 1000
+        best: tuple | None = None
+        result = None
+        for size in range(1, MAX_WINDOW + 1):
+            for start in range(len(words) - size + 1):
+                if time.perf_counter() > deadline:
+                    return result
+                matches = self.lookup(" ".join(words[start:start + size]), limit=5, deadline=deadline)
+                for match in self.accepted(matches, min_confidence):
+                    rank = (match.confidence, prefer(match.value) if prefer else 0.0, size)
+                    if best is None or rank > best:
+                        best, result = rank, match
+        return result
@@ -0,0 +1,176 @@
+"""
+intents.py — локальный разбор намерений вместо одного регэкспа-триггера
+=======================================================================
+Раньше execute_command() реагировал только на глаголы «открыть|включить|…»
+и умел лишь запускать программы, а всё остальное уходило в Ollama.
+IntentEngine за один проход по фразе определяет намерение и «слот»
+(то, к чему оно относится) и отдаёт их обработчику:
+
+    launch  «открой хром», «запусти стим»          → слот: программа
+    close   «закрой телегу», «выключи дискорд»     → слот: программа
+    switch  «переключись на браузер»               → слот: программа
+    search  «найди рецепт блинов в интернете»      → слот: запрос
+    ask     всё остальное                          → LLM (медленный путь)
+
+Грамматика — одно скомпилированное выражение с именованными группами по
+глаголам всех намерений. Глагол должен стоять в начале фразы (после
+обращения, междометий и наполнителей: «джарвис, ну открой хром»): в
+середине он обычно часть вопроса — «как остановить кровотечение» это не
+команда close. Если обработчик команды не нашёл программу, он возвращает
+None, и фраза уходит в ask.
+Если глагола нет, можно включить маленький наивный байесовский
+классификатор (IntentClassifier) по словам фразы — он ловит перефразировки
+вроде «хочу поиграть в стим»; неуверенный ответ тоже уходит в ask.
+Ollama вызывается только тогда, когда быстрый путь ничего не нашёл.
+"""
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Sequence
+
+LAUNCH, CLOSE, SWITCH, SEARCH, ASK = "launch", "close", "switch", "search", "ask"
+
+VERBS: Dict[str, Sequence[str]] = {
+    LAUNCH: ("открой", "открыть", "открывай", "запусти", "запустить", "запускай",
+             "включи", "включить", "стартуй"),
+    CLOSE: ("закрой", "закрыть", "выключи", "выключить", "заверши", "завершить",
+            "останови", "остановить", "убей"),
+    SWITCH: ("переключи", "переключить", "переключись", "переключиться", "перейди",
+             "перейти", "разверни", "развернуть", "покажи"),
+    SEARCH: ("найди", "найти", "поищи", "поискать", "загугли", "погугли", "поиск"),
+}
+
+# слова, которые не относятся к слоту: «открой мне, пожалуйста, хром»
+FILLERS = ("пожалуйста", "мне", "давай", "ка", "на", "в", "программу", "приложение")
+# что может стоять перед глаголом: «джарвис, ну-ка открой хром»
+LEADING = ("джарвис", "jarvis", "эй", "слушай", "ну", "окей", "а", "так") + FILLERS
+SEARCH_TAILS = re.compile(r"\s+(?:в|во)\s+(?:интернете|гугле|яндексе|сети|браузере)\s*$")
+
+MIN_CLASSIFIER_CONFIDENCE = 0.6
+
+# небольшой корпус для классификатора — перефразировки без глаголов из VERBS
+TRAINING_PHRASES: Dict[str, Sequence[str]] = {
+    LAUNCH: ("хочу поиграть в стим", "нужен браузер", "хочу послушать музыку в спотифай",
+             "дай мне телеграм", "мне нужен код", "поехали в дискорд", "давай хром"),
+    CLOSE: ("хватит стима", "убери телеграм", "больше не нужен браузер", "выход из игры",
+            "прекрати дискорд"),
+    SWITCH: ("вернись в браузер", "вернись в телеграм", "назад в телеграм", "обратно в дискорд",
+             "давай обратно в код", "верни окно браузера", "к дискорду"),
+    SEARCH: ("что такое квантовый компьютер в интернете", "гугл рецепт блинов",
+             "посмотри в интернете погоду", "узнай курс доллара в сети"),
+    ASK: ("как дела", "расскажи анекдот", "сколько будет два плюс два", "что ты умеешь",
+          "кто написал войну и мир", "почему небо голубое", "привет джарвис"),
+}
+
+
+class Intent(NamedTuple):
+    name: str         # LAUNCH / CLOSE / SWITCH / SEARCH / ASK
+    slot: str         # программа или запрос (для ASK — вся фраза)
+    verb: str         # сработавший глагол («» — классификатор или ask)
+    confidence: float
+
+
+class IntentResult(NamedTuple):
+    intent: Intent
+    reply: str | None
+    elapsed: float    # сек. на разбор + обработчик
+
+
+def _words(text: str) -> List[str]:
+    """Слова фразы без однобуквенных предлогов («в», «к») — они есть во всех намерениях."""
+    return re.findall(r"\w\w+", text.lower())
+
+
+def _stem(word: str) -> str:
+    """Грубая «основа» для классификатора: первые 5 букв (хватает для падежей)."""
+    return word[:5]
+
+
+class IntentClassifier:
+    """Мультиномиальный наивный Байес по основам слов; обучается за миллисекунды."""
+
+    def __init__(self, phrases: Mapping[str, Iterable[str]] = TRAINING_PHRASES):
+        self._log_prior: Dict[str, float] = {}
+        self._log_prob: Dict[str, Dict[str, float]] = {}
+        self._log_unknown: Dict[str, float] = {}
+        counts = {intent: Counter(_stem(w) for p in items for w in _words(p))
+                  for intent, items in phrases.items()}
+        totals = {intent: len(list(items)) for intent, items in phrases.items()}
+        vocabulary = set().union(*counts.values())
+        n_phrases = sum(totals.values())
+        for intent, counter in counts.items():
+            denom = sum(counter.values()) + len(vocabulary) + 1
+            self._log_prior[intent] = math.log(totals[intent] / n_phrases)
+            self._log_prob[intent] = {w: math.log((c + 1) / denom) for w, c in counter.items()}
+            self._log_unknown[intent] = math.log(1 / denom)
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """(намерение, вероятность) по softmax от логарифмов правдоподобия."""
+        stems = [_stem(w) for w in _words(text)]
+        scores = {
+            intent: self._log_prior[intent] + sum(probs.get(s, self._log_unknown[intent]) for s in stems)
+            for intent, probs in self._log_prob.items()
+        }
+        best = max(scores, key=scores.get)
+        peak = scores[best]
+        total = sum(math.exp(v - peak) for v in scores.values())
+        return best, 1 / total
+
+
+class IntentEngine:
+    """Разбор фразы в Intent и вызов обработчика: handler(slot, text) -> ответ или None."""
+
+    def __init__(
+        self,
+        handlers: Mapping[str, Callable[[str, str], str | None]],
+        verbs: Mapping[str, Sequence[str]] = VERBS,
+        classifier: IntentClassifier | None = None,
+        min_confidence: float = MIN_CLASSIFIER_CONFIDENCE,
+    ):
+        self.handlers = dict(handlers)
+        self.classifier = classifier
+        self.min_confidence = min_confidence
+        alternatives = [
+            "(?P<%s>%s)" % (intent, "|".join(sorted(map(re.escape, words), key=len, reverse=True)))
+            for intent, words in verbs.items()
+        ]
+        leading = r"(?:(?:%s)\b\W*)*" % "|".join(map(re.escape, LEADING))
+        self._grammar = re.compile(r"\W*%s(?:%s)\b" % (leading, "|".join(alternatives)))
+        self._fillers = re.compile(r"^(?:(?:%s)\b\W*)+" % "|".join(map(re.escape, FILLERS)))
+
+    def parse(self, text: str) -> Intent:
+        """Намерение и слот; ASK — если быстрый путь ничего не нашёл."""
+        text = text.lower().strip()
+        found = self._grammar.match(text)
+        if found:
+            intent = found.lastgroup
+            slot = self._fillers.sub("", text[found.end():].strip(" ,.!?"))
+            if intent == SEARCH:
+                slot = SEARCH_TAILS.sub("", slot)
+            return Intent(intent, slot, found.group(intent), 1.0)
+
+        if self.classifier is not None and text:
+            intent, confidence = self.classifier.predict(text)
+            if intent != ASK and confidence >= self.min_confidence:
+                slot = SEARCH_TAILS.sub("", text) if intent == SEARCH else text
+                return Intent(intent, slot, "", confidence)
+        return Intent(ASK, text, "", 0.0)
+
+    def route(self, text: str) -> IntentResult:
+        """Разбор + обработчик намерения (если его нет — reply=None).
+
+        Обработчик команды вернул None (например, программа не нашлась) —
+        фраза всё-таки вопрос и уходит в обработчик ASK.
+        """
+        started = time.perf_counter()
+        intent = self.parse(text)
+        handler = self.handlers.get(intent.name)
+        reply = handler(intent.slot, text) if handler else None
+        if reply is None and intent.name != ASK:
+            intent = Intent(ASK, text.lower().strip(), "", 0.0)
+            handler = self.handlers.get(ASK)
+            reply = handler(intent.slot, text) if handler else None
+        return IntentResult(intent, reply, time.perf_counter() - started)
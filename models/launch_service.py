@@ -0,0 +1,207 @@
+"""
+launch_service.py — запуск программ в фоне для AppLauncher
+==========================================================
+execute_command() раньше вызывал subprocess.Popen() прямо в потоке
+распознавания: медленный старт процесса (антивирус, холодный диск) стопорил
+голосовой цикл, уже запущенная программа открывалась второй копией,
+а дескрипторы дочерних процессов копились.
+
+LaunchService:
+    - launch() возвращается сразу: сам запуск — в ThreadPoolExecutor;
+    - одна и та же программа, запрошенная повторно в течение dedup_window
+      секунд (Vosk любит выдавать фразу дважды), запускается один раз;
+    - если программа уже работает — её окно выводится на передний план
+      (Windows), а не запускается копия. Работающие процессы ищутся через
+      psutil, если он установлен, иначе — среди собственных детей;
+    - завершившиеся дети опрашиваются (poll) и забываются при каждом запуске;
+    - время от команды до появления процесса копится в метриках (stats());
+    - close() завершает программу тоже в фоне (своих детей — terminate(),
+      чужие процессы — через psutil).
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple
+
+# --- внешняя необязательная зависимость --------------------------------------
+try:
+    import psutil  # поиск уже запущенных программ по пути exe
+except ImportError:  # нет psutil — «уже запущена» знаем только про своих детей
+    psutil = None
+
+DEDUP_WINDOW = 3.0   # сек.: повтор той же команды в этом окне — не запускаем заново
+WORKERS = 2          # фоновых потоков запуска
+MAX_SAMPLES = 500    # сколько последних замеров держать для p50/p99
+
+
+class LaunchResult(NamedTuple):
+    name: str
+    path: str
+    action: str            # "started" | "focused" | "running" | "closed" | "missing" | "failed"
+    pid: int | None
+    latency: float         # сек. от launch() до появления процесса / фокуса
+    error: str | None = None
+
+
+# ╔═══════════════════════════════════════╗
+# ║      О К Н А  (только Windows)        ║
+# ╚═══════════════════════════════════════╝
+def focus_window(pids: List[int]) -> bool:
+    """Выводит на передний план первое видимое окно одного из pids (только Windows)."""
+    if sys.platform != "win32" or not pids:
+        return False
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    wanted = set(pids)
+    found: List[int] = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def on_window(hwnd, _lparam):
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        if pid.value in wanted and user32.IsWindowVisible(hwnd):
+            found.append(hwnd)
+            return False  # нашли — обход можно прервать
+        return True
+
+    user32.EnumWindows(on_window, 0)
+    if not found:
+        return False
+    user32.ShowWindow(found[0], 9)  # SW_RESTORE — если окно свёрнуто
+    return bool(user32.SetForegroundWindow(found[0]))
+
+
+# ╔═══════════════════════════════════════╗
+# ║              С Е Р В И С              ║
+# ╚═══════════════════════════════════════╝
+class LaunchService:
+    """Фоновые запуски с дедупликацией, поиском уже запущенных и метриками."""
+
+    def __init__(self, workers: int = WORKERS, dedup_window: float = DEDUP_WINDOW,
+                 spawn=subprocess.Popen):
+        self.dedup_window = dedup_window
+        self._spawn = spawn  # подменяется в бенчмарках, чтобы не плодить процессы
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="launch")
+        self._lock = threading.Lock()
+        self._recent: Dict[str, tuple] = {}        # путь → (время запроса, Future)
+        self._children: Dict[str, List[subprocess.Popen]] = {}
+        self._latencies: List[float] = []
+        self.counts = {"started": 0, "focused": 0, "running": 0, "closed": 0, "missing": 0,
+                       "failed": 0, "deduped": 0}
+
+    # --- публичное -------------------------------------------------------------
+    def launch(self, name: str, path: str) -> tuple[Future, bool]:
+        """
+        Ставит запуск в очередь и сразу возвращает (Future[LaunchResult], deduped).
+        deduped=True — такая же команда уже была меньше dedup_window секунд назад.
+        """
+        now = time.perf_counter()
+        key = os.path.normcase(path)
+        with self._lock:
+            previous = self._recent.get(key)
+            if previous and now - previous[0] < self.dedup_window:
+                self.counts["deduped"] += 1
+                return previous[1], True
+            future = self._pool.submit(self._run, name, path, key, now)
+            self._recent[key] = (now, future)
+        return future, False
+
+    def close(self, name: str, path: str) -> Future:
+        """Ставит завершение программы в очередь; Future[LaunchResult] с action closed/missing."""
+        return self._pool.submit(self._close, name, path, os.path.normcase(path), time.perf_counter())
+
+    def reap(self) -> int:
+        """Забывает завершившихся детей; возвращает, сколько их было."""
+        reaped = 0
+        with self._lock:
+            for key in list(self._children):
+                alive = [p for p in self._children[key] if p.poll() is None]
+                reaped += len(self._children[key]) - len(alive)
+                if alive:
+                    self._children[key] = alive
+                else:
+                    del self._children[key]
+            horizon = time.perf_counter() - self.dedup_window
+            for key in [k for k, (t, _f) in self._recent.items() if t < horizon]:
+                del self._recent[key]
+        return reaped
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._latencies)
+            children = sum(len(v) for v in self._children.values())
+            counts = dict(self.counts)
+        p50 = statistics.median(samples) if samples else None
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else None
+        return {**counts, "children": children, "samples": len(samples),
+                "latency_p50_ms": p50 and round(p50 * 1000, 2),
+                "latency_p99_ms": p99 and round(p99 * 1000, 2)}
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    # --- фон -------------------------------------------------------------------
+    def _running_pids(self, path: str, key: str) -> List[int]:
+        with self._lock:
+            own = [p.pid for p in self._children.get(key, ()) if p.poll() is None]
+        if own or psutil is None:
+            return own
+        pids = []
+        for proc in psutil.process_iter(["exe"]):
+            exe = proc.info.get("exe")
+            if exe and os.path.normcase(exe) == key:
+                pids.append(proc.pid)
+        return pids
+
+    def _run(self, name: str, path: str, key: str, requested: float) -> LaunchResult:
+        self.reap()
+        try:
+            pids = self._running_pids(path, key)
+            if pids:
+                action = "focused" if focus_window(pids) else "running"
+                return self._done(LaunchResult(name, path, action, pids[0], time.perf_counter() - requested))
+
+            proc = self._spawn(path)
+            with self._lock:
+                self._children.setdefault(key, []).append(proc)
+            return self._done(LaunchResult(name, path, "started", proc.pid, time.perf_counter() - requested))
+        except Exception as e:
+            print(f"❌ Ошибка при открытии {name}: {e}")
+            return self._done(LaunchResult(name, path, "failed", None, time.perf_counter() - requested, str(e)))
+
+    def _close(self, name: str, path: str, key: str, requested: float) -> LaunchResult:
+        try:
+            pids = self._running_pids(path, key)
+            with self._lock:
+                own = {p.pid: p for p in self._children.pop(key, ())}
+                self._recent.pop(key, None)  # следующий «открой» не должен считаться повтором
+            for pid in pids:
+                if pid in own:
+                    own[pid].terminate()
+                elif psutil is not None:
+                    try:
+                        psutil.Process(pid).terminate()
+                    except psutil.Error:
+                        pass  # успел завершиться сам или нет прав — закрывать уже нечего
+            action = "closed" if pids else "missing"
+            return self._done(LaunchResult(name, path, action, pids[0] if pids else None,
+                                           time.perf_counter() - requested))
+        except Exception as e:
+            print(f"❌ Ошибка при закрытии {name}: {e}")
+            return self._done(LaunchResult(name, path, "failed", None, time.perf_counter() - requested, str(e)))
+
+    def _done(self, result: LaunchResult) -> LaunchResult:
+        with self._lock:
+            self.counts[result.action] += 1
+            if result.action in ("started", "focused", "running"):
+                self._latencies.append(result.latency)
+                del self._latencies[:-MAX_SAMPLES]
+        return result
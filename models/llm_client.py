@@ -0,0 +1,358 @@
+"""
+llm_client.py — общий клиент LLM для listen.py и self-study.py
+==============================================================
+ask_ollama() и AIAssistant.ask_ai() каждый раз звали requests.post() без
+сессии: на каждый голосовой ход — новое TCP-(и TLS-)соединение, а у
+ask_ollama не было даже таймаута, так что зависший Ollama вешал Джарвиса.
+
+LLMClient:
+    - держит пул keep-alive соединений (http.client, без внешних
+      зависимостей) — соединение открывается один раз и переиспользуется;
+      «протухшее» соединение, закрытое сервером, молча заменяется новым;
+    - таймауты: connect_timeout на установку соединения, read_timeout
+      на ожидание каждого следующего куска ответа;
+    - отмена (barge-in): CancelToken.cancel() из любого потока рвёт текущий
+      запрос — complete() бросает Cancelled, stream() просто заканчивается;
+    - бэкенды подключаемые: OllamaBackend (/api/generate, NDJSON) и
+      OpenAIBackend (любой OpenAI-совместимый /chat/completions, SSE);
+    - warm() заранее открывает соединение, чтобы даже первый ход не ждал
+      рукопожатия.
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import ssl
+import threading
+from typing import Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urlsplit
+
+CONNECT_TIMEOUT = 3.0   # сек. на установку соединения
+READ_TIMEOUT = 60.0     # сек. ожидания очередного куска ответа
+POOL_SIZE = 4           # сколько простаивающих соединений держать на один сервер
+OLLAMA_URL = "http://localhost:11434"
+OPENAI_URL = "https://api.openai.com/v1"
+
+
+class LLMError(RuntimeError):
+    """Ошибка запроса к LLM (сеть, HTTP-статус, формат ответа)."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class LLMTimeout(LLMError):
+    """Сервер не ответил за отведённое время."""
+
+
+class Cancelled(LLMError):
+    """Запрос отменён через CancelToken (пользователь перебил ответ)."""
+
+
+class CancelToken:
+    """Отмена текущего запроса из другого потока: cancel() рвёт соединение, на котором ждёт ответ."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._conn: http.client.HTTPConnection | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._event.set()
+            conn = self._conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)  # будит поток, заблокированный в recv()
+            except OSError:
+                pass
+
+    def _attach(self, conn: http.client.HTTPConnection | None) -> None:
+        with self._lock:
+            self._conn = conn
+        if conn is not None and self.cancelled:
+            self.cancel()
+
+
+# ╔═══════════════════════════════════════╗
+# ║              Б Э К Е Н Д Ы            ║
+# ╚═══════════════════════════════════════╝
+def ollama_tokens(lines: Iterable[bytes | str]) -> Iterator[str]:
+    """Кусочки текста из NDJSON-потока /api/generate; LLMError, если Ollama прислала ошибку."""
+    for line in lines:
+        if not line or not line.strip():
+            continue
+        data = json.loads(line)
+        if data.get("error"):
+            raise LLMError(data["error"])
+        token = data.get("response", "")
+        if token:
+            yield token
+        if data.get("done"):
+            return
+
+
+def openai_tokens(lines: Iterable[bytes | str]) -> Iterator[str]:
+    """Кусочки текста из SSE-потока Chat Completions ("data: {...}" … "data: [DONE]")."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        payload = json.loads(data)
+        if payload.get("error"):
+            raise LLMError(str(payload["error"]))
+        for choice in payload.get("choices", ()):
+            token = (choice.get("delta") or {}).get("content")
+            if token:
+                yield token
+
+
+class OllamaBackend:
+    """Локальный Ollama: POST /api/generate."""
+
+    def __init__(self, url: str = OLLAMA_URL, model: str = "llama3", options: dict | None = None):
+        self.url = url.rstrip("/")
+        self.model = model
+        self.options = options
+
+    def endpoint(self) -> str:
+        return f"{self.url}/api/generate"
+
+    def warm_endpoint(self) -> str:
+        return f"{self.url}/api/tags"
+
+    def headers(self) -> Dict[str, str]:
+        return {}
+
+    def body(self, prompt: str, stream: bool) -> dict:
+        body = {"model": self.model, "prompt": prompt, "stream": stream}
+        if self.options:
+            body["options"] = self.options
+        return body
+
+    def text(self, payload: dict) -> str:
+        if payload.get("error"):
+            raise LLMError(payload["error"])
+        if "response" not in payload:
+            raise LLMError("Нет поля 'response' в ответе")
+        return payload["response"]
+
+    def tokens(self, lines: Iterable[bytes]) -> Iterator[str]:
+        return ollama_tokens(lines)
+
+
+class OpenAIBackend:
+    """OpenAI или совместимый сервер: POST {base_url}/chat/completions."""
+
+    def __init__(self, api_key: str | None = None, model: str = "gpt-3.5-turbo",
+                 base_url: str | None = None, temperature: float | None = None):
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY")
+        self.model = model
+        self.url = (base_url or os.getenv("OPENAI_BASE_URL") or OPENAI_URL).rstrip("/")
+        self.temperature = temperature
+
+    def endpoint(self) -> str:
+        return f"{self.url}/chat/completions"
+
+    def warm_endpoint(self) -> str:
+        return f"{self.url}/models"
+
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def body(self, prompt: str, stream: bool) -> dict:
+        body = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "stream": stream}
+        if self.temperature is not None:
+            body["temperature"] = self.temperature
+        return body
+
+    def text(self, payload: dict) -> str:
+        try:
+            return payload["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise LLMError(f"Неожиданный формат ответа: {str(payload)[:200]}") from None
+
+    def tokens(self, lines: Iterable[bytes]) -> Iterator[str]:
+        return openai_tokens(lines)
+
+
+# ╔═══════════════════════════════════════╗
+# ║               К Л И Е Н Т             ║
+# ╚═══════════════════════════════════════╝
+class LLMClient:
+    """Пул keep-alive соединений к одному бэкенду, таймауты и отмена."""
+
+    def __init__(self, backend, connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT, pool_size: int = POOL_SIZE):
+        self.backend = backend
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_size = pool_size
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "connections": 0, "reused": 0, "stale": 0,
+                       "timeouts": 0, "cancelled": 0, "errors": 0}
+
+    # --- публичное -------------------------------------------------------------
+    def complete(self, prompt: str, cancel: CancelToken | None = None) -> str:
+        """Весь ответ одной строкой."""
+        conn, key, response = self._send("POST", self.backend.endpoint(), self.backend.body(prompt, False), cancel)
+        try:
+            raw = response.read()
+        except (socket.timeout, OSError, http.client.HTTPException) as e:
+            self._discard(conn, cancel)
+            raise self._failure(e, cancel) from e
+        if cancel is not None and cancel.cancelled:
+            self._discard(conn, cancel)
+            raise self._failure(Cancelled("Запрос отменён"), cancel)
+        self._release(key, conn, cancel)
+        try:
+            return self.backend.text(json.loads(raw))
+        except ValueError as e:
+            raise LLMError(f"Ответ не JSON: {raw[:200]!r}") from e
+
+    def stream(self, prompt: str, cancel: CancelToken | None = None) -> Iterator[str]:
+        """Кусочки ответа по мере генерации; после cancel() поток просто заканчивается."""
+        conn, key, response = self._send("POST", self.backend.endpoint(), self.backend.body(prompt, True), cancel)
+        finished = False
+        try:
+            yield from self.backend.tokens(response)
+            response.read()  # дочитываем хвост, чтобы соединение можно было вернуть в пул
+            if cancel is not None and cancel.cancelled:  # сокет закрыт отменой — поток просто оборвался
+                self._failure(Cancelled("Запрос отменён"), cancel)
+            else:
+                finished = True
+        except (socket.timeout, OSError, ValueError, http.client.HTTPException) as e:
+            failure = self._failure(e, cancel)
+            if not isinstance(failure, Cancelled):
+                raise failure from e
+        finally:
+            if finished:
+                self._release(key, conn, cancel)
+            else:
+                self._discard(conn, cancel)
+
+    def warm(self) -> bool:
+        """Заранее открывает соединение (GET на лёгкий адрес бэкенда); False — сервер недоступен."""
+        try:
+            conn, key, response = self._send("GET", self.backend.warm_endpoint(), None, None)
+            response.read()
+            self._release(key, conn, None)
+            return True
+        except LLMError:
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counts, "idle": sum(len(c) for c in self._idle.values())}
+
+    # --- соединения ------------------------------------------------------------
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=self.connect_timeout,
+                                               context=ssl.create_default_context())
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # без Nagle: +40 мс на мелких запросах
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self.counts["connections"] += 1
+        return conn
+
+    def _send(self, method: str, url: str, body: dict | None, cancel: CancelToken | None):
+        """(соединение, ключ пула, ответ со статусом < 400)."""
+        if cancel is not None and cancel.cancelled:
+            raise Cancelled("Запрос отменён")
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json", **self.backend.headers()}
+        with self._lock:
+            self.counts["requests"] += 1
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            reused = conn is not None
+            try:
+                if conn is None:
+                    conn = self._connect(*key)
+                if cancel is not None:
+                    cancel._attach(conn)
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                if conn is not None:
+                    conn.close()
+                if reused and not (cancel is not None and cancel.cancelled):
+                    with self._lock:
+                        self.counts["stale"] += 1
+                    continue  # сервер закрыл простаивающее соединение — пробуем новым
+                raise self._failure(e, cancel) from e
+            except (socket.timeout, OSError, http.client.HTTPException) as e:
+                if conn is not None:
+                    conn.close()
+                raise self._failure(e, cancel) from e
+            break
+
+        if reused:
+            with self._lock:
+                self.counts["reused"] += 1
+        if response.status >= 400:
+            detail = response.read()[:200].decode("utf-8", "replace")
+            self._release(key, conn, cancel)
+            with self._lock:
+                self.counts["errors"] += 1
+            raise LLMError(f"HTTP {response.status}: {detail}", status=response.status)
+        return conn, key, response
+
+    def _release(self, key, conn: http.client.HTTPConnection, cancel: CancelToken | None) -> None:
+        if cancel is not None:
+            cancel._attach(None)
+        if conn.sock is None:  # сервер ответил Connection: close
+            return
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _discard(self, conn: http.client.HTTPConnection, cancel: CancelToken | None) -> None:
+        if cancel is not None:
+            cancel._attach(None)
+        conn.close()
+
+    def _failure(self, error: Exception, cancel: CancelToken | None) -> LLMError:
+        if cancel is not None and cancel.cancelled:
+            kind, failure = "cancelled", Cancelled("Запрос отменён")
+        elif isinstance(error, socket.timeout):
+            kind, failure = "timeouts", LLMTimeout(f"Нет ответа за {self.read_timeout:g} с")
+        else:
+            kind, failure = "errors", LLMError(f"{type(error).__name__}: {error}")
+        with self._lock:
+            self.counts[kind] += 1
+        return failure
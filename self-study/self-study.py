@@ -6,6 +6,9 @@ import subprocess
 import time
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.llm_client import LLMClient, LLMError, LLMTimeout, OpenAIBackend  # noqa: E402
+
 load_dotenv()
 
 
@@ -13,6 +16,11 @@ class AIAssistant:
     def __init__(self):
         """Инициализация ассистента с автоматическим определением версии"""
         self.api_key = os.getenv("OPENAI_API_KEY")
+        # Одно keep-alive соединение на все запросы вместо нового TLS-рукопожатия на каждый
+        self.llm = LLMClient(
+            OpenAIBackend(api_key=self.api_key, model="gpt-3.5-turbo", temperature=0.7),
+            read_timeout=30  # Увеличенный таймаут
+        )
         self.pycharm_path = os.getenv("PYCHARM_PATH")
         self.version = self.detect_current_version()
 
@@ -33,26 +41,12 @@ class AIAssistant:
         """Улучшенный запрос к API с повторными попытками"""
         for attempt in range(max_retries):
             try:
-                response = requests.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-3.5-turbo",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": 0.7
-                    },
-                    timeout=30  # Увеличенный таймаут
-                )
-                response.raise_for_status()
-                return response.json()["choices"][0]["message"]["content"]
-            except requests.exceptions.Timeout:
+                return self.llm.complete(prompt)
+            except LLMTimeout:
                 if attempt == max_retries - 1:
                     return "Ошибка: превышено время ожидания сервера"
                 time.sleep(5)  # Пауза между попытками
-            except requests.exceptions.RequestException as e:
+            except LLMError as e:
                 return f"Ошибка: {str(e)}"
         return "Не удалось получить ответ от API"
 
@@ -0,0 +1,8 @@
+"""Общие настройки тестов: пакета нет, модули берутся из корня репозитория, indexer/ и benchmarks/."""
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "indexer", ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,83 @@
+"""app_indexer.watch() в режиме опроса на временной папке."""
+import json
+import threading
+import time
+
+import pytest
+
+import app_indexer
+
+DEBOUNCE = 0.2
+POLL = 0.3
+
+
+def make_exe(path):
+    """Пустой exe, который проходит порог score: имя как у папки, размер не меньше min_size_mb."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.truncate(4 << 20)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def watched(tmp_path, monkeypatch):
+    """Запущенный watch(): (корень, путь к app_index.json); после теста — stop()."""
+    monkeypatch.setattr(app_indexer.SHORTCUTS, "save", lambda *args, **kwargs: None)
+    root = tmp_path / "apps"
+    make_exe(root / "tool" / "tool.exe")
+    index_path = tmp_path / "app_index.json"
+    stop = threading.Event()
+    worker = threading.Thread(target=app_indexer.watch, args=([root], {}, index_path, tmp_path / "manifest.json"),
+                              kwargs={"debounce": DEBOUNCE, "poll_interval": POLL, "use_polling": True,
+                                      "stop": stop})
+    worker.start()
+    assert wait_for(index_path.exists)
+    yield root, index_path
+    stop.set()
+    worker.join(timeout=5.0)
+    assert not worker.is_alive()
+
+
+def read_index(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_initial_scan(watched):
+    root, index_path = watched
+    assert read_index(index_path) == {"tool": str(root / "tool" / "tool.exe")}
+
+
+def test_new_program_appears(watched):
+    root, index_path = watched
+    make_exe(root / "other" / "other.exe")
+    assert wait_for(lambda: "other" in read_index(index_path))
+    assert read_index(index_path)["other"] == str(root / "other" / "other.exe")
+
+
+def test_removed_program_disappears(watched):
+    root, index_path = watched
+    (root / "tool" / "tool.exe").unlink()
+    assert wait_for(lambda: read_index(index_path) == {})
+
+
+def test_keeps_updating_after_many_polls(watched):
+    """Папка, ждущая пересчёта, не должна бесконечно откладывать его при каждом опросе."""
+    root, index_path = watched
+    for name in ("first", "second"):
+        make_exe(root / name / f"{name}.exe")
+        assert wait_for(lambda: name in read_index(index_path), timeout=POLL * 10)
+
+
+@pytest.mark.parametrize("poll_interval", [DEBOUNCE, DEBOUNCE / 2])
+def test_rejects_poll_interval_within_debounce(tmp_path, poll_interval):
+    with pytest.raises(ValueError):
+        app_indexer.watch([tmp_path], {}, tmp_path / "app_index.json", tmp_path / "manifest.json",
+                          debounce=DEBOUNCE, poll_interval=poll_interval, use_polling=True)
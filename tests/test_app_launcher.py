@@ -0,0 +1,134 @@
+"""AppLauncher.execute_command() на маленьком каталоге во временной папке; Popen подменён."""
+import itertools
+import json
+import os
+import time
+
+import pytest
+
+from indexer import alias_store, index_format, usage_stats
+from models.app_launcher import AppLauncher
+from models.launch_service import LaunchService
+
+INDEX = {
+    "steam": "C:\\Steam\\steam.exe",
+    "chrome": "C:\\Chrome\\chrome.exe",
+    "discord": "C:\\Discord\\discord.exe",
+    "warthunder": "C:\\WarThunder\\launcher.exe",
+    "sivit": "C:\\Sivit\\sivit.exe",
+}
+ALIASES = {
+    "steam": ["steam", "стим"],
+    "chrome": ["chrome", "хром", "гугл"],
+    "discord": ["discord", "дискорд"],
+    "warthunder": ["warthunder", "вартандер", "вар"],
+    "sivit": ["sivit", "сивит"],
+}
+
+_pids = itertools.count(10_000)
+
+
+class StubProcess:
+    """Вместо subprocess.Popen: «процесс» сразу завершился."""
+
+    def __init__(self, path):
+        self.args = path
+        self.pid = next(_pids)
+
+    def poll(self):
+        return 0
+
+    def terminate(self):
+        pass
+
+
+class RecordingLaunches(LaunchService):
+    """LaunchService без настоящих процессов; launched — запрошенные пути по порядку."""
+
+    def __init__(self):
+        super().__init__(dedup_window=0.0, spawn=StubProcess)
+        self.launched = []
+
+    def launch(self, name, path):
+        self.launched.append(path)
+        return super().launch(name, path)
+
+
+@pytest.fixture
+def make_launcher(tmp_path):
+    launchers = []
+
+    def make(index=INDEX, aliases=ALIASES, usage=None, **options):
+        index_path = tmp_path / "app_index.json"
+        index_path.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+        (tmp_path / "aliases.json").write_text(json.dumps(aliases, ensure_ascii=False), encoding="utf-8")
+        store = alias_store.load(tmp_path / "aliases.json", index_path, store_path=None)
+        launcher = AppLauncher(index_path=index_path, aliases=store, launches=RecordingLaunches(),
+                               usage=usage or usage_stats.UsageStats(None), **options)
+        launchers.append(launcher)
+        return launcher
+
+    yield make
+    for launcher in launchers:
+        launcher.launches.shutdown()
+
+
+@pytest.fixture
+def launcher(make_launcher):
+    return make_launcher()
+
+
+@pytest.mark.parametrize("phrase, key", [
+    ("открой стив", "steam"),   # одна замена буквы в коротком названии
+    ("открой стиф", "steam"),
+    ("запусти хрон", "chrome"),
+])
+def test_misheard_short_name_launches(launcher, phrase, key):
+    assert launcher.execute_command(phrase)
+    assert launcher.launches.launched == [INDEX[key]]
+
+
+@pytest.mark.parametrize("phrase", ["включи свет", "включи свет на кухне", "открой окно"])
+def test_ordinary_words_launch_nothing(launcher, phrase):
+    assert launcher.execute_command(phrase) == ""
+    assert launcher.launches.launched == []
+
+
+@pytest.mark.parametrize("phrase, name, key", [
+    ("открой вартандер", "вартандер", "warthunder"),  # не короткий синоним «вар»
+    ("закрой вар", "вар", "warthunder"),
+    ("открой хрома", "хром", "chrome"),               # падежное окончание после названия
+])
+def test_find_app(launcher, phrase, name, key):
+    found_name, record = launcher.find_app(phrase)
+    assert (found_name, record.key) == (name, key)
+
+
+def test_frecency_breaks_ties(make_launcher):
+    usage = usage_stats.UsageStats(None)
+    usage.record("steam")
+    launcher = make_launcher(usage=usage)
+    assert launcher.execute_command("запусти хром или стим")
+    assert launcher.launches.launched == [INDEX["steam"]]
+
+
+def write_fresh_bin(path, data):
+    path.write_bytes(data)
+    future = time.time() + 3600  # новее JSON и aliases.json — иначе .bin и не читается
+    os.utime(path, (future, future))
+
+
+def test_fresh_bin_is_used(tmp_path, make_launcher):
+    only_bin = {**INDEX, "bin": "C:\\Bin\\bin.exe"}
+    write_fresh_bin(tmp_path / "app_index.bin", index_format.encode_index(only_bin))
+    assert dict(make_launcher().app_paths) == only_bin
+
+
+@pytest.mark.parametrize("cut", [10, -7])
+def test_corrupt_bin_falls_back_to_json(tmp_path, make_launcher, cut):
+    """Свежий, но битый app_index.bin — реестр читается из JSON."""
+    data = index_format.encode_index({**INDEX, "bin": "C:\\Bin\\bin.exe"})
+    write_fresh_bin(tmp_path / "app_index.bin", data[:cut])
+    launcher = make_launcher()
+    assert dict(launcher.app_paths) == INDEX
+    assert launcher.find_app("открой стим")[1].key == "steam"
@@ -0,0 +1,50 @@
+"""CommandMatcher.best(): какое из найденных в фразе названий побеждает."""
+import pytest
+
+from models.command_matcher import CommandMatcher
+
+NAMES = {
+    "warthunder": "warthunder", "вартандер": "warthunder", "вар": "warthunder-short",
+    "хром": "chrome", "гугл": "chrome", "стим": "steam", "steam": "steam",
+}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return CommandMatcher(NAMES)
+
+
+def best(matcher, phrase, prefer=None):
+    match = matcher.best(phrase, prefer=prefer)
+    return None if match is None else (match.pattern, matcher.value(match))
+
+
+def test_longest_whole_word_wins(matcher):
+    # «вар» тоже найден — с начала слова, но «вартандер» целый и длиннее
+    assert best(matcher, "открой вартандер") == ("вартандер", "warthunder")
+    assert best(matcher, "открой вар") == ("вар", "warthunder-short")
+
+
+def test_word_start_beats_infix(matcher):
+    assert best(matcher, "открой хрома") == ("хром", "chrome")
+    # «стим» в середине слова хуже совпадения с начала слова
+    assert best(matcher, "закрой вастим хрома") == ("хром", "chrome")
+
+
+def test_frecency_breaks_ties(matcher):
+    phrase = "запусти хром или стим"
+    assert best(matcher, phrase) == ("хром", "chrome")  # без prefer — самое левое
+    usage = {"steam": 3.0, "chrome": 1.0}
+    assert best(matcher, phrase, prefer=lambda value: usage.get(value, 0.0)) == ("стим", "steam")
+
+
+def test_preference_does_not_beat_longer_match(matcher):
+    usage = {"warthunder-short": 100.0}
+    assert best(matcher, "открой вартандер", prefer=lambda value: usage.get(value, 0.0))[0] == "вартандер"
+
+
+def test_case_and_duplicates():
+    matcher = CommandMatcher([("Steam", 1), ("steam", 2), ("", 3)])
+    assert len(matcher) == 1
+    assert best(matcher, "open steam") == ("steam", 2)  # повтор — как в dict, последнее значение
+    assert matcher.best("ничего нет") is None
@@ -0,0 +1,61 @@
+"""FuzzyIndex: что узнаётся по звучанию, а что остаётся «не узнали»."""
+import pytest
+
+from models.fuzzy_index import FuzzyIndex, FuzzyMatch, phonetic_key
+
+NAMES = {
+    "steam": "steam", "стим": "steam", "chrome": "chrome", "хром": "chrome",
+    "discord": "discord", "дискорд": "discord", "warthunder": "warthunder", "вартандер": "warthunder",
+    "sivit": "sivit", "сивит": "sivit", "telegram": "telegram", "телеграм": "telegram",
+}
+BUDGET_MS = 1000.0  # на маленьком индексе бюджет не должен влиять на ответ
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FuzzyIndex(NAMES)
+
+
+def test_phonetic_key():
+    assert phonetic_key("steam") == phonetic_key("стим")
+    assert phonetic_key("Дискорд") == phonetic_key("дискорт")
+    assert phonetic_key("!!!") == ""
+
+
+@pytest.mark.parametrize("heard, value", [
+    ("стив", "steam"),        # одна замена в коротком ключе — 0.75, но соседей нет
+    ("хрон", "chrome"),
+    ("дискорт", "discord"),
+    ("телеграмм", "telegram"),
+    ("вартандэр", "warthunder"),
+])
+def test_misheard_names(index, heard, value):
+    assert index.best(heard).value == value
+
+
+@pytest.mark.parametrize("heard", ["свет", "окно", "стеам"])
+def test_not_recognised(index, heard):
+    # «свет» ↔ «сивит» — лишняя буква, а не замена; «стеам» ↔ «стим» тоже
+    assert index.best(heard) is None
+
+
+def test_swap_needs_margin():
+    top = FuzzyMatch("стим", "steam", 0.75, swap=True)
+    assert FuzzyIndex.accepted([top, FuzzyMatch("steam", "steam", 0.7)]) == [top]  # та же программа
+    assert FuzzyIndex.accepted([top, FuzzyMatch("стин", "stin", 0.7, swap=True)]) == []
+    assert FuzzyIndex.accepted([FuzzyMatch("сивит", "sivit", 0.8)]) == []
+
+
+def test_best_in_text(index):
+    assert index.best_in_text("открой стив", ["открой"], budget_ms=BUDGET_MS).value == "steam"
+    assert index.best_in_text("включи свет на кухне", ["включи", "на"], budget_ms=BUDGET_MS) is None
+    assert index.best_in_text("открой вар тандер", ["открой"], budget_ms=BUDGET_MS).value == "warthunder"
+
+
+def test_best_in_text_prefers_frequent():
+    index = FuzzyIndex({"стим": "steam", "стин": "stin"})
+    usage = {"stin": 5.0}
+    found = index.best_in_text("запусти стим стин", ["запусти"], prefer=lambda value: usage.get(value, 0.0),
+                               budget_ms=BUDGET_MS)
+    assert found.value == "stin"
+    assert index.best_in_text("запусти стим стин", ["запусти"], budget_ms=BUDGET_MS).value == "steam"
@@ -0,0 +1,99 @@
+"""app_index.bin: то же, что app_index.json, а битый файл — всегда ValueError."""
+import json
+import random
+
+import pytest
+
+import app_indexer
+import index_format
+
+INDEX = {
+    "steam": "C:\\Program Files (x86)\\Steam\\steam.exe",
+    "вартандер": "D:\\Игры\\War Thunder\\launcher.exe",
+    "chrome": "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
+    "sivit": "\\\\NAS\\apps\\Tools\\sivit.exe",
+}
+SCORES = {"steam": 25, "вартандер": 10, "chrome": -3}
+ALIASES = {"steam": ["стим", "steam"], "chrome": ["хром", "гугл"], "missing": ["нет такой"]}
+
+
+@pytest.fixture
+def saved(tmp_path, monkeypatch):
+    """(app_index.json, app_index.bin), записанные save_index()."""
+    monkeypatch.setattr(app_indexer, "ALIASES", ALIASES)
+    path = tmp_path / "app_index.json"
+    app_indexer.save_index(INDEX, path, SCORES)
+    return path, path.with_suffix(".bin")
+
+
+def test_round_trip_matches_json(saved):
+    json_path, bin_path = saved
+    from_json = json.loads(json_path.read_text(encoding="utf-8"))
+    with index_format.load_index(bin_path) as compact:
+        assert compact.to_dict() == from_json
+        assert list(compact) == list(from_json)  # порядок программ сохранён
+        assert len(compact) == len(from_json)
+        assert all(compact[key] == path for key, path in from_json.items())
+        assert {key: compact.score(key) for key in from_json} == {key: SCORES.get(key, 0) for key in from_json}
+        assert compact.alias_map() == index_format.build_alias_map(from_json, ALIASES)
+        assert compact.resolve_alias("хром") == "chrome"
+        assert compact.alias_paths()["стим"] == INDEX["steam"]
+        assert compact.resolve_alias("нет такой") is None
+        assert compact.score("нет такой") is None
+        with pytest.raises(KeyError):
+            compact["нет такой"]
+
+
+def test_empty_index(tmp_path):
+    path = tmp_path / "empty.bin"
+    index_format.write_index(path, {})
+    with index_format.load_index(path) as compact:
+        assert compact.to_dict() == {} and compact.alias_map() == {}
+
+
+def read_all(path):
+    """Всё, что AppLauncher и бенчмарки достают из .bin."""
+    with index_format.load_index(path) as compact:
+        keys = list(compact)
+        return (compact.to_dict(), compact.alias_map(), compact.alias_paths(),
+                [compact.get(key) for key in keys], [compact.score(key) for key in keys],
+                compact.resolve_alias("стим"))
+
+
+def test_truncated_or_padded_raises(saved, tmp_path):
+    data = saved[1].read_bytes()
+    broken = tmp_path / "broken.bin"
+    for size in range(len(data)):
+        broken.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            index_format.load_index(broken)
+    broken.write_bytes(data + b"\0")
+    with pytest.raises(ValueError):
+        index_format.load_index(broken)
+
+
+@pytest.mark.parametrize("field, value", [(3, 1000), (4, 1000), (3, 0)])
+def test_header_counts_checked(saved, tmp_path, field, value):
+    data = bytearray(saved[1].read_bytes())
+    header = list(index_format._HEADER.unpack_from(data, 0))
+    header[field] = value
+    index_format._HEADER.pack_into(data, 0, *header)
+    broken = tmp_path / "broken.bin"
+    broken.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        index_format.load_index(broken)
+
+
+def test_corrupt_bytes_never_raise_other_errors(saved, tmp_path):
+    data = saved[1].read_bytes()
+    broken = tmp_path / "broken.bin"
+    rng = random.Random(5)
+    for _ in range(500):
+        mutated = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            mutated[rng.randrange(len(mutated))] = rng.randrange(256)
+        broken.write_bytes(bytes(mutated))
+        try:
+            read_all(broken)
+        except ValueError:
+            pass
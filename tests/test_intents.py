@@ -0,0 +1,66 @@
+"""IntentEngine: глагол в начале фразы, слот, и откат в ASK, если команда не подошла."""
+import pytest
+
+from models import intents
+from models.intents import ASK, CLOSE, LAUNCH, SEARCH, SWITCH, IntentClassifier, IntentEngine
+
+APPS = {"хром", "стим", "дискорд"}
+
+
+def app_handler(slot, _text):
+    """Как AppLauncher._launch: не нашлась программа — None."""
+    return f"ok {slot}" if slot in APPS else None
+
+
+@pytest.fixture
+def engine():
+    handlers = {name: app_handler for name in (LAUNCH, CLOSE, SWITCH)}
+    handlers[SEARCH] = lambda slot, _text: f"ищу {slot}"
+    handlers[ASK] = lambda _slot, text: f"llm: {text}"
+    return IntentEngine(handlers)
+
+
+@pytest.mark.parametrize("phrase, name, slot", [
+    ("открой хром", LAUNCH, "хром"),
+    ("Джарвис, ну открой мне, пожалуйста, хром", LAUNCH, "хром"),
+    ("закрой дискорд", CLOSE, "дискорд"),
+    ("переключись на стим", SWITCH, "стим"),
+    ("найди погоду в москве", SEARCH, "погоду в москве"),
+    ("найди рецепт блинов в интернете", SEARCH, "рецепт блинов"),
+    ("как остановить кровотечение", ASK, "как остановить кровотечение"),  # глагол не в начале
+    ("почему небо голубое", ASK, "почему небо голубое"),
+])
+def test_parse(engine, phrase, name, slot):
+    intent = engine.parse(phrase)
+    assert (intent.name, intent.slot) == (name, slot)
+
+
+def test_search_keeps_slot(engine):
+    result = engine.route("найди погоду в москве")
+    assert result.intent.name == SEARCH
+    assert result.reply == "ищу погоду в москве"
+
+
+@pytest.mark.parametrize("phrase", ["включи свет на кухне", "как остановить кровотечение"])
+def test_not_a_program_goes_to_ask(engine, phrase):
+    result = engine.route(phrase)
+    assert result.intent.name == ASK
+    assert result.reply == f"llm: {phrase}"
+
+
+def test_without_ask_handler_reply_is_none():
+    engine = IntentEngine({LAUNCH: app_handler})
+    result = engine.route("включи свет на кухне")
+    assert result.intent.name == ASK
+    assert result.reply is None
+
+
+def test_classifier_catches_paraphrase():
+    engine = IntentEngine({}, classifier=IntentClassifier())
+    assert engine.parse("хочу поиграть в стим").name == LAUNCH
+    assert engine.parse("как дела").name == ASK
+
+
+def test_verbs_are_distinct():
+    words = [word for group in intents.VERBS.values() for word in group]
+    assert len(words) == len(set(words))
@@ -0,0 +1,117 @@
+"""LLMClient против llm_standin.StandinServer: keep-alive, отмена, таймауты, ошибки HTTP."""
+import threading
+import time
+
+import pytest
+
+from llm_standin import StandinServer
+from models.llm_client import (Cancelled, CancelToken, LLMClient, LLMError, LLMTimeout,
+                               OllamaBackend, OpenAIBackend)
+from Vosk.streaming import sentences
+
+REPLY = "Первое предложение ответа. Второе предложение ответа. Третье и последнее."
+
+
+@pytest.fixture
+def server():
+    with StandinServer(latency=0.0, token_delay=0.005, reply=REPLY) as standin:
+        yield standin
+
+
+@pytest.fixture
+def client(server):
+    llm = LLMClient(OllamaBackend(server.ollama_url), read_timeout=5.0)
+    yield llm
+    llm.close()
+
+
+def test_complete_reuses_connection(server, client):
+    assert client.warm()
+    for _ in range(3):
+        assert client.complete("вопрос") == REPLY
+    stats = client.stats()
+    assert stats["connections"] == 1
+    assert stats["reused"] == 3
+    assert server.connections == 1
+
+
+def test_stream_yields_reply_in_pieces(client):
+    tokens = list(client.stream("вопрос"))
+    assert len(tokens) > 1
+    assert "".join(tokens) == REPLY
+    assert list(sentences(client.stream("вопрос")))[0] == "Первое предложение ответа."
+    assert client.stats()["idle"] == 1  # дочитанный поток вернул соединение в пул
+
+
+def test_openai_backend_complete_and_stream(server):
+    llm = LLMClient(OpenAIBackend("test-key", base_url=server.url))
+    try:
+        assert "steam" in llm.complete('Вот ключ: "steam"')
+        assert "".join(llm.stream("вопрос")) == REPLY
+    finally:
+        llm.close()
+
+
+def test_cancel_ends_stream_quietly(server, client):
+    server.token_delay = 0.05
+    token, got = CancelToken(), []
+    worker = threading.Thread(target=lambda: got.extend(client.stream("вопрос", token)))
+    worker.start()
+    time.sleep(0.2)
+    token.cancel()
+    worker.join(timeout=2.0)
+    assert not worker.is_alive()
+    assert 0 < len(got) < len(REPLY.split())
+    assert client.stats()["cancelled"] == 1
+    server.token_delay = 0.0
+    assert client.complete("снова") == REPLY  # отменённое соединение не вернулось в пул
+
+
+def test_cancel_interrupts_complete(server, client):
+    server.token_delay = 0.2  # без потока сервер молчит, пока не «сгенерирует» весь ответ
+    token = CancelToken()
+    timer = threading.Timer(0.1, token.cancel)
+    timer.start()
+    started = time.perf_counter()
+    with pytest.raises(Cancelled):
+        client.complete("вопрос", token)
+    assert time.perf_counter() - started < 1.0
+    timer.join()
+    assert client.stats()["cancelled"] == 1
+
+
+def test_cancelled_token_refuses_new_request(client):
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(Cancelled):
+        client.complete("вопрос", token)
+    assert client.stats()["requests"] == 0
+
+
+def test_read_timeout(server):
+    server.latency = 0.5
+    llm = LLMClient(OllamaBackend(server.ollama_url), read_timeout=0.05)
+    try:
+        with pytest.raises(LLMTimeout):
+            llm.complete("вопрос")
+        assert llm.stats()["timeouts"] == 1
+    finally:
+        llm.close()
+
+
+def test_http_error_status(server, client):
+    server.error_rate = 1.0
+    with pytest.raises(LLMError) as error:
+        client.complete("вопрос")
+    assert error.value.status == 500
+    server.error_rate = 0.0
+    assert client.complete("вопрос") == REPLY
+
+
+def test_server_down():
+    with StandinServer() as standin:
+        url = standin.ollama_url
+    llm = LLMClient(OllamaBackend(url), connect_timeout=0.5)
+    assert not llm.warm()
+    with pytest.raises(LLMError):
+        llm.complete("вопрос")
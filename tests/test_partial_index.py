@@ -0,0 +1,81 @@
+"""partial_index.merge(): правило .exe > score > путь и независимость от порядка."""
+import itertools
+import random
+
+import pytest
+
+import app_indexer
+import partial_index
+
+
+def winner(candidates):
+    """Победитель по правилу из шапки partial_index — напрямую, без add()."""
+    return min(candidates, key=lambda c: (not c[0].lower().endswith(".exe"), -c[1], c[0]))
+
+
+@pytest.mark.parametrize("first, second, expected", [
+    (["C:\\a\\tool.py", 50], ["D:\\b\\tool.exe", 3], ["D:\\b\\tool.exe", 3]),    # .exe важнее score
+    (["C:\\a\\tool.exe", 5], ["D:\\b\\tool.exe", 9], ["D:\\b\\tool.exe", 9]),    # затем score
+    (["D:\\b\\tool.exe", 5], ["C:\\a\\tool.exe", 5], ["C:\\a\\tool.exe", 5]),    # затем меньший путь
+    (["C:\\a\\Tool.EXE", 5], ["C:\\a\\tool.url", 20], ["C:\\a\\Tool.EXE", 5]),  # расширение без учёта регистра
+])
+def test_tie_break(first, second, expected):
+    for a, b in ((first, second), (second, first)):
+        assert partial_index.merge([{"tool": a}, {"tool": b}]) == {"tool": expected}
+
+
+def test_merge_is_order_independent():
+    rng = random.Random(8)
+    keys = ["steam", "chrome", "tool", "game"]
+    partials = []
+    for shard in range(5):
+        partial: dict = {}
+        for key in rng.sample(keys, 3):
+            path = f"{'CDE'[shard % 3]}:\\shard{shard}\\{key}{rng.choice(['.exe', '.py', '.url'])}"
+            partial_index.add(partial, key, path, rng.choice([3, 5, 5, 8]))
+        partials.append(partial)
+
+    candidates = {}
+    for partial in partials:
+        for key, entry in partial.items():
+            candidates.setdefault(key, []).append(entry)
+    expected = {key: winner(entries) for key, entries in candidates.items()}
+
+    for order in itertools.permutations(partials):
+        assert partial_index.merge(order) == expected
+    # слияние частями — то же, что разом
+    halves = [partial_index.merge(partials[:2]), partial_index.merge(partials[2:])]
+    assert partial_index.merge(halves) == expected
+
+
+def test_save_load_round_trip(tmp_path):
+    partial = {"steam": ["C:\\Steam\\steam.exe", 25], "вартандер": ["D:\\Игры\\launcher.exe", 10]}
+    path = tmp_path / "part.json"
+    partial_index.save(partial, path, ["C:\\", "D:\\"])
+    assert partial_index.load(path) == partial
+    assert partial_index.to_index(partial) == (
+        {"steam": "C:\\Steam\\steam.exe", "вартандер": "D:\\Игры\\launcher.exe"},
+        {"steam": 25, "вартандер": 10},
+    )
+    path.write_text('{"version": 0, "entries": {}}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        partial_index.load(path)
+
+
+def make_exe(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.truncate(4 << 20)
+
+
+def test_scan_sharded_does_not_depend_on_process_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_indexer.SHORTCUTS, "save", lambda *args, **kwargs: None)
+    root = tmp_path / "apps"
+    for unit in ("a", "b", "c", "d"):
+        make_exe(root / unit / "tool" / "tool.exe")  # один ключ в каждом шарде — побеждает меньший путь
+        make_exe(root / unit / f"game{unit}" / f"game{unit}.exe")
+    make_exe(root / "tool" / "tool.exe")  # в самом корне, вне шардов
+    results = [app_indexer.scan_sharded([root], processes=n) for n in (1, 3)]
+    assert results[0] == results[1]
+    assert results[0]["tool"][0] == str(root / "a" / "tool" / "tool.exe")
+    assert sorted(results[0]) == ["gamea", "gameb", "gamec", "gamed", "tool"]
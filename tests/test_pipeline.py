@@ -0,0 +1,34 @@
+"""VoicePipeline: озвучка и её остановка идут в одном потоке speak."""
+import threading
+
+from Vosk.pipeline import VoicePipeline
+
+
+def test_speak_and_speak_closed_run_on_speak_thread():
+    chunks = iter([b"a", b"b"])
+    threads = {}
+    spoken = []
+    done = threading.Event()
+
+    def read_chunk():
+        try:
+            return next(chunks)
+        except StopIteration:
+            done.wait(1.0)
+            return b""
+
+    def speak(text):
+        threads["speak"] = threading.current_thread().name
+        spoken.append(text)
+        done.set()
+
+    def speak_closed():
+        threads["closed"] = threading.current_thread().name
+
+    pipeline = VoicePipeline(read_chunk, lambda data: "фраза" if data == b"b" else None,
+                             lambda text: f"ответ на {text}", speak, speak_closed=speak_closed)
+    pipeline.start()
+    assert done.wait(2.0)
+    pipeline.stop()
+    assert spoken == ["ответ на фраза"]
+    assert threads == {"speak": "speak", "closed": "speak"}
@@ -0,0 +1,191 @@
+"""
+scoring.ScoringRules: паритет с прежним score_exe(), что входит в кэшируемый
+score и в отпечаток правил.
+"""
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+import pytest
+
+import alias_store
+import app_indexer
+import scoring
+
+MB = 1 << 20
+
+# ─── прежний score_exe() из app_indexer.py (до scoring.py), дословно ─────────
+GOOD_MATCH_PARENTS = 10  # exe=имя_папки
+GOOD_ALIAS_HIT     = 8   # имя совпало с ключом из ALIASES
+BAD_STOPWORD       = -10 # uninstall / update …
+BAD_DIRNAME        = -5  # installer / redist …
+BAD_SIZE           = -10  # подозрительный размер
+
+STOPWORDS = {
+    "uninstall", "update", "setup", "helper", "crash",
+    "service", "patch", "install", "debug"
+}
+BAD_DIR_PARTS = {
+    "update", "installer", "redist", "patcher",
+    "resources", "bin", "debug", "x64", "x86"
+}
+ALIASES = {"steam": [], "discord": [], "telegram": []}
+
+
+def baseline_score_exe(path: pathlib.Path) -> int:
+    """Оценивает файл по набору эвристик и возвращает итоговый score."""
+    score = 0
+    stem = path.stem.lower()
+
+    # 1) exe = имя родительской папки
+    if stem == path.parent.stem.lower().replace(" ", ""):
+        score += GOOD_MATCH_PARENTS
+
+    # 2) попадание в словарь ALIASES
+    if stem in ALIASES:
+        score += GOOD_ALIAS_HIT
+
+    # 3) стоп‑слова в названии файла
+    if any(w in stem for w in STOPWORDS):
+        score += BAD_STOPWORD
+
+    # 4) «плохие» части пути
+    if any(part.lower() in BAD_DIR_PARTS for part in path.parts):
+        score += BAD_DIRNAME
+
+    # 5) подозрительный размер (<30 КБ или >1 ГБ)
+    try:
+        size_mb = path.stat().st_size / 1_048_576
+        if size_mb < 3:
+            score += BAD_SIZE
+    except PermissionError:
+        pass  # нет доступа → не трогаем
+
+    # 6) не показывать те, что давно не открывал
+    mtime = path.stat().st_mtime
+    years_ago = (time.time() - mtime) / (30*24*3600)
+    if years_ago > 1:
+        score -= 3
+
+    # 7) игры из стим
+    if path.suffix.lower() == ".url" and "steam" in str(path).lower():
+        score += 15
+
+    return score
+
+
+# (путь от корня, размер в МБ, возраст в днях)
+FILES = [
+    ("Steam/steam.exe", 4, 1),
+    ("Steam/uninstall.exe", 4, 1),
+    ("Steam/bin/steamservice.exe", 4, 1),
+    ("Steam/steamapps/common/Half-Life.url", 0, 400),
+    ("Games/Steam Library/Portal.URL", 0, 2),
+    ("Games/Portal/portal.url", 0, 2),
+    ("Discord/Update.exe", 8, 3),
+    ("Discord/app-1.0/Discord.exe", 90, 3),
+    ("Telegram Desktop/Telegram.exe", 60, 90),
+    ("Telegram Desktop/telegramdesktop.exe", 60, 5),
+    ("My App/MyApp.exe", 10, 5),
+    ("My.App/my.exe", 10, 5),
+    ("Game/x64/game.exe", 200, 5),
+    ("Other/X86/Other.exe", 200, 5),
+    ("Game/Redist/vc_redist.x64.exe", 20, 5),
+    ("Installer/setup.exe", 20, 5),
+    ("Tools/resources/app.exe", 20, 5),
+    ("Tools/debugger/debugger.exe", 20, 5),
+    ("Tools/patcher.exe", 2, 5),
+    ("scripts/scripts.py", 0, 10),
+    ("scripts/helper.py", 0, 40),
+    ("Old/old.exe", 5, 31),
+    ("Old/older.exe", 5, 29),
+]
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """Файлы FILES на диске и правила из scoring_rules.json с теми же ALIASES, что у baseline."""
+    monkeypatch.setattr(app_indexer, "RULES", scoring.load_rules(scoring.RULES_FILE, ALIASES))
+    root = tmp_path / "root"
+    now = time.time()
+    for rel, size_mb, age_days in FILES:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.truncate(size_mb * MB)
+        mtime = now - age_days * 24 * 3600
+        os.utime(path, (mtime, mtime))
+    return root
+
+
+def test_score_exe_matches_baseline(tree):
+    scores = {rel: app_indexer.score_exe(tree / rel) for rel, _size, _age in FILES}
+    assert scores == {rel: baseline_score_exe(tree / rel) for rel, _size, _age in FILES}
+    assert len(set(scores.values())) > 5  # пути действительно задевают разные правила
+
+
+def test_walk_matches_baseline(tree):
+    """Обход с наследованием контекста папок (score_batch по папке) — те же числа."""
+    walked = dict(app_indexer._walk(str(tree), {}, {}))
+    assert len(walked) == len(FILES)
+    assert walked == {path: baseline_score_exe(pathlib.Path(path)) for path in walked}
+    assert app_indexer.RULES.dir_cache.stats()["inherited"] > 0
+
+
+def test_fingerprint_ignores_launched():
+    plain = scoring.ScoringRules(None, {"steam"})
+    assert scoring.ScoringRules(None, {"steam"}, {"tool"}).fingerprint == plain.fingerprint
+    assert scoring.ScoringRules(None, {"steam", "tool"}).fingerprint != plain.fingerprint
+
+
+def test_launched_only_in_volatile_score():
+    rules = scoring.ScoringRules(None, (), {"mytool"})
+    now = 1_000_000_000.0
+    files = [("My Tool.exe", 10 * MB, now), ("other.exe", 10 * MB, now)]
+    stable = rules.score_batch(os.path.join("C:", "apps"), files, now=now, volatile=False)
+    full = rules.score_batch(os.path.join("C:", "apps"), files, now=now)
+    assert full == [stable[0] + rules.w_launched, stable[1]]
+    assert rules.launched_bonus(os.path.join("C:", "apps", "My Tool.exe")) == rules.w_launched
+    assert rules.launched_bonus(os.path.join("C:", "apps", "other.exe")) == 0
+
+
+def test_new_launch_keeps_manifest_and_raises_score(tmp_path, monkeypatch):
+    """Программа ниже порога попадает в индекс после запуска — без пересчёта кэша манифеста."""
+    exe = tmp_path / "tool" / "tool.exe"
+    exe.parent.mkdir()
+    exe.write_bytes(b"MZ")  # имя как у папки (+10), но крошечный (-10): ниже порога
+    monkeypatch.setattr(app_indexer, "RULES", scoring.ScoringRules())
+    manifest: dict = {}
+    assert app_indexer.scan_folders([tmp_path], manifest) == {}
+
+    monkeypatch.setattr(app_indexer, "RULES", scoring.ScoringRules(None, (), {"tool"}))
+    scores: dict = {}
+    assert app_indexer.scan_folders([tmp_path], manifest, scores=scores) == {"tool": str(exe)}
+    assert scores == {"tool": app_indexer.RULES.w_launched}
+    # ни одна папка не оценивалась заново: всё взято из манифеста
+    assert app_indexer.RULES.dir_cache.stats()["computed"] == 0
+
+
+def test_import_loads_no_sources():
+    """Импорт app_indexer не читает синонимы и запуски (и не пишет alias_store.json)."""
+    code = (
+        "import alias_store, usage_stats\n"
+        "def fail(*args, **kwargs): raise AssertionError('загрузка при импорте')\n"
+        "alias_store.get = alias_store.load = usage_stats.load = fail\n"
+        "import app_indexer\n"
+        "assert app_indexer.ALIASES == {} and not app_indexer.RULES.aliases\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=pathlib.Path(app_indexer.__file__).parent, check=True)
+
+
+def test_load_sources_without_store(monkeypatch):
+    for name in ("ALIASES", "LAUNCHED", "RULES", "TRESHOLD"):
+        monkeypatch.setattr(app_indexer, name, getattr(app_indexer, name))
+    before = alias_store.STORE_FILE.stat().st_mtime_ns if alias_store.STORE_FILE.exists() else None
+    app_indexer.load_sources(store_path=None)
+    assert app_indexer.ALIASES == alias_store.read_aliases()
+    assert app_indexer.RULES.aliases == frozenset(app_indexer.ALIASES)
+    after = alias_store.STORE_FILE.stat().st_mtime_ns if alias_store.STORE_FILE.exists() else None
+    assert after == before
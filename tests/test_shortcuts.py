@@ -0,0 +1,78 @@
+"""
+shortcuts.parse_lnk() на готовых ярлыках из tests/fixtures/lnk.
+
+Ярлыки собраны по MS-SHLLINK и сверены сторонним разборщиком (LnkParse3):
+  local.lnk          — IDList + LinkInfo с LocalBasePath (ANSI) + NAME;
+  local_unicode.lnk  — LinkInfo с заголовком 0x24 (юникодные base/suffix) + WORKING_DIR;
+  network.lnk        — LinkInfo с CommonNetworkRelativeLink (\\\\NAS\\apps);
+  env.lnk            — только IDList + EnvironmentVariableDataBlock (%LOCALAPPDATA%);
+  relative.lnk       — только RelativePath + ARGUMENTS.
+"""
+import os
+import pathlib
+import random
+
+import pytest
+
+from shortcuts import parse_lnk, read_lnk_target
+
+FIXTURES = pathlib.Path(__file__).resolve().parent / "fixtures" / "lnk"
+LNK_DIR = os.path.join(os.sep, "links")
+
+
+def fixture(name):
+    return (FIXTURES / name).read_bytes()
+
+
+@pytest.mark.parametrize("name, target", [
+    ("local.lnk", "C:\\Program Files (x86)\\Steam\\steam.exe"),
+    ("local_unicode.lnk", "D:\\Игры\\War Thunder\\launcher.exe"),
+    ("network.lnk", "\\\\NAS\\apps\\Tools\\sivit.exe"),
+])
+def test_link_info(name, target):
+    assert parse_lnk(fixture(name), LNK_DIR) == target
+
+
+def test_env_block_is_expanded(monkeypatch):
+    monkeypatch.setenv("LOCALAPPDATA", "C:\\Users\\u\\AppData\\Local")
+    assert parse_lnk(fixture("env.lnk")) == "C:\\Users\\u\\AppData\\Local\\Discord\\Update.exe"
+
+
+def test_relative_path_needs_lnk_dir():
+    data = fixture("relative.lnk")
+    assert parse_lnk(data, LNK_DIR) == os.path.join(os.sep, "Apps", "tool.exe")
+    assert parse_lnk(data) is None
+
+
+def test_read_lnk_target_uses_file_dir(tmp_path):
+    path = tmp_path / "start" / "tool.lnk"
+    path.parent.mkdir()
+    path.write_bytes(fixture("relative.lnk"))
+    assert read_lnk_target(str(path)) == str(tmp_path / "Apps" / "tool.exe")
+    assert read_lnk_target(str(tmp_path / "missing.lnk")) is None
+
+
+@pytest.mark.parametrize("name", sorted(p.name for p in FIXTURES.glob("*.lnk")))
+def test_truncated_gives_full_target_or_none(name):
+    data = fixture(name)
+    full = parse_lnk(data, LNK_DIR)
+    for size in range(len(data)):
+        assert parse_lnk(data[:size], LNK_DIR) in (None, full), size
+
+
+@pytest.mark.parametrize("name", sorted(p.name for p in FIXTURES.glob("*.lnk")))
+def test_garbage_never_raises(name):
+    data = fixture(name)
+    rng = random.Random(name)
+    for _ in range(2000):
+        broken = bytearray(data)
+        for _ in range(rng.randint(1, 8)):
+            broken[rng.randrange(len(broken))] = rng.randrange(256)
+        result = parse_lnk(bytes(broken), LNK_DIR)
+        assert result is None or isinstance(result, str)
+
+
+def test_not_a_shortcut():
+    assert parse_lnk(b"") is None
+    assert parse_lnk(b"MZ" + bytes(200)) is None
+    assert parse_lnk(fixture("local.lnk")[:0x4C]) is None
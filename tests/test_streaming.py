@@ -0,0 +1,66 @@
+"""sentences() и ollama_tokens() из Vosk/streaming.py — без сети, на списках строк."""
+import json
+
+import pytest
+
+from Vosk.streaming import ollama_tokens, sentences
+from models.llm_client import LLMError
+
+
+def ndjson(*tokens, done=True):
+    lines = [json.dumps({"response": t, "done": False}, ensure_ascii=False).encode("utf-8") for t in tokens]
+    if done:
+        lines.append(b'{"response": "", "done": true}')
+    return lines
+
+
+def test_sentences_yields_each_sentence_as_soon_as_it_ends():
+    tokens = ["Привет", ", как ", "дела сегодня? ", "У меня ", "всё хорошо. ", "Спасибо"]
+    pieces = []
+    stream = sentences(iter(tokens))
+    pieces.append(next(stream))
+    assert pieces == ["Привет, как дела сегодня?"]  # первое отдано до конца потока
+    pieces.extend(stream)
+    assert pieces == ["Привет, как дела сегодня?", "У меня всё хорошо.", "Спасибо"]
+
+
+def test_sentences_keeps_short_fragments_together():
+    assert list(sentences(["Да. ", "Конечно, сейчас открою. "])) == ["Да. Конечно, сейчас открою."]
+
+
+def test_sentences_cuts_long_sentence_at_clause():
+    text = "слово, " * 40
+    pieces = list(sentences([text], max_chars=60))
+    assert len(pieces) > 1
+    assert all(len(p) <= 60 for p in pieces)
+    assert " ".join(pieces) == text.strip()
+
+
+def test_sentences_handles_quotes_and_newlines():
+    pieces = list(sentences(['Он сказал: «Готово!» ', "Дальше\n", "новая строка"]))
+    assert pieces == ["Он сказал: «Готово!»", "Дальше\nновая строка"]
+
+
+def test_sentences_empty_stream():
+    assert list(sentences([])) == []
+    assert list(sentences(["   "])) == []
+
+
+def test_ollama_tokens_stops_at_done():
+    lines = ndjson("При", "вет") + [b'{"response": "after", "done": false}']
+    assert list(ollama_tokens(lines)) == ["При", "вет"]
+
+
+def test_ollama_tokens_skips_blank_lines_and_accepts_str():
+    lines = ["", '{"response": "a", "done": false}', "  ", '{"response": "b", "done": true}']
+    assert list(ollama_tokens(lines)) == ["a", "b"]
+
+
+def test_ollama_tokens_raises_on_error_line():
+    with pytest.raises(LLMError, match="model not found"):
+        list(ollama_tokens([b'{"error": "model not found"}']))
+
+
+def test_sentences_over_ollama_tokens():
+    lines = ndjson("Сейчас ", "пятнадцать ", "градусов. ", "Возьми ", "зонт!")
+    assert list(sentences(ollama_tokens(lines))) == ["Сейчас пятнадцать градусов.", "Возьми зонт!"]
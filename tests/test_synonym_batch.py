@@ -0,0 +1,93 @@
+"""synonym_batch.generate() с подменённым вызовом модели — без сети."""
+import json
+import re
+import threading
+
+import pytest
+
+import synonym_batch
+
+FAST = {"rate": 1000.0, "burst": 1000, "backoff": 0.0}
+
+
+class FakeModel:
+    """complete(prompt) вместо OpenAI: отвечает JSON по ключам из пакетного промпта."""
+
+    def __init__(self, fail_first=0, forget=(), wrap=False):
+        self.fail_first = fail_first  # столько первых запросов падает
+        self.forget = set(forget)     # эти ключи модель «забывает» в первом ответе
+        self.wrap = wrap              # ответ в ```json … ```, как любят чат-модели
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            calls = len(self.prompts)
+        if calls <= self.fail_first:
+            raise ConnectionError("сеть недоступна")
+        keys = json.loads(re.search(r"Вот ключи:\s*(\[.*?\])", prompt, re.DOTALL).group(1))
+        answer = {}
+        for key in keys:
+            if key in self.forget:
+                with self._lock:
+                    self.forget.discard(key)
+                continue
+            answer[key] = [key.upper(), f"{key} прога"]
+        text = json.dumps(answer, ensure_ascii=False)
+        return f"```json\n{text}\n```" if self.wrap else text
+
+
+def test_batches_keys_and_keeps_order():
+    keys = [f"app{i}" for i in range(25)]
+    model = FakeModel()
+    stats = synonym_batch.BatchStats()
+    result = synonym_batch.generate(keys, model, batch_size=10, stats=stats, **FAST)
+    assert list(result) == keys
+    assert result["app3"] == ["APP3", "app3 прога"]
+    assert len(model.prompts) == 3
+    assert stats.requests == 3 and stats.fallback_keys == 0
+
+
+def test_duplicate_keys_requested_once():
+    model = FakeModel()
+    result = synonym_batch.generate(["chrome", "steam", "chrome"], model, **FAST)
+    assert list(result) == ["chrome", "steam"]
+    assert len(model.prompts) == 1
+
+
+def test_retries_failed_requests():
+    model = FakeModel(fail_first=2)
+    stats = synonym_batch.BatchStats()
+    result = synonym_batch.generate(["chrome"], model, retries=3, stats=stats, **FAST)
+    assert result == {"chrome": ["CHROME", "chrome прога"]}
+    assert stats.retries == 2 and stats.failed_batches == 0
+
+
+def test_gives_up_with_key_as_only_synonym():
+    model = FakeModel(fail_first=100)
+    stats = synonym_batch.BatchStats()
+    result = synonym_batch.generate(["chrome", "steam"], model, retries=1, stats=stats, **FAST)
+    assert result == {"chrome": ["chrome"], "steam": ["steam"]}
+    assert stats.fallback_keys == 2
+    assert stats.failed_batches == 2  # оба прохода
+
+
+def test_forgotten_keys_asked_again():
+    model = FakeModel(forget={"steam"})
+    result = synonym_batch.generate(["chrome", "steam"], model, **FAST)
+    assert result["steam"] == ["STEAM", "steam прога"]
+    assert len(model.prompts) == 2
+    assert '["steam"]' in model.prompts[1]
+
+
+def test_parse_batch_response_wrapped_and_filtered():
+    raw = FakeModel(wrap=True)(synonym_batch.batch_prompt(["chrome"]))
+    assert synonym_batch.parse_batch_response(raw, ["chrome"]) == {"chrome": ["CHROME", "chrome прога"]}
+    raw = '{"chrome": ["хром", 5, " "], "other": ["x"], "steam": "стим"}'
+    assert synonym_batch.parse_batch_response(raw, ["chrome", "steam"]) == {"chrome": ["хром"]}
+
+
+def test_parse_batch_response_without_json():
+    with pytest.raises(ValueError):
+        synonym_batch.parse_batch_response("Извините, не могу помочь.", ["chrome"])
@@ -0,0 +1,75 @@
+"""EnergyVAD/VoiceGate на WAV со ступенькой шума: тихая комната, потом включили вентилятор."""
+import random
+from array import array
+
+import pytest
+
+from synthetic_audio import RATE, background, read_wav, utterance, write_wav
+from Vosk.vad import FLOOR_RESET_SECONDS, EnergyVAD, VoiceGate
+
+CHUNK = 4096                   # как frames_per_buffer в listen.py
+QUIET_SECONDS = 4.0            # до ступеньки: фон -62 дБ
+NOISE_SECONDS = 16.0           # после: вентилятор -40 дБ
+SPEECH_AT = 13.0               # фраза уже на громком фоне
+
+
+@pytest.fixture(scope="module")
+def step_wav(tmp_path_factory):
+    rng = random.Random("step")
+    samples = background(QUIET_SECONDS, rng, -62.0, 0.0, None) + background(NOISE_SECONDS, rng, -40.0, 0.9, None)
+    speech = utterance(rng, -22.0)
+    start = int(SPEECH_AT * RATE)
+    for i, value in enumerate(speech):
+        samples[start + i] += value
+    segments = [(SPEECH_AT, round(SPEECH_AT + len(speech) / RATE, 3))]
+    path = tmp_path_factory.mktemp("vad") / "step.wav"
+    write_wav(path, array("h", (max(-32768, min(32767, int(v))) for v in samples)), segments)
+    return path
+
+
+def run_gate(path):
+    """(номера чанков, отданных распознавателю; начало и конец фразы в чанках; VAD)."""
+    data, rate, segments = read_wav(path)
+    vad = EnergyVAD(rate)
+    gate = VoiceGate(vad)
+    step = CHUNK * 2
+    passed = set()
+    for i, start in enumerate(range(0, len(data) - step + 1, step)):
+        out, _ended = gate.feed(data[start:start + step])
+        if out:
+            passed.update(range(i - len(out) + 1, i + 1))
+    seconds = CHUNK / rate
+    (begin, end), = segments
+    return passed, (int(begin / seconds), int(end / seconds)), vad
+
+
+def test_floor_follows_noise_step(step_wav):
+    passed, (speech_begin, _speech_end), vad = run_gate(step_wav)
+    seconds = CHUNK / RATE
+    # после ступеньки гейт может открыться, но не дольше FLOOR_RESET_SECONDS (+ hangover и запас)
+    settled = int((QUIET_SECONDS + FLOOR_RESET_SECONDS + 2.0) / seconds)
+    noise_only = range(settled, speech_begin - 1)
+    assert len(noise_only) > 10
+    assert not passed & set(noise_only)
+    assert vad.resets >= 1
+    assert vad.floor_db > -45.0
+
+
+def test_speech_after_step_still_passes(step_wav):
+    passed, (speech_begin, speech_end), _vad = run_gate(step_wav)
+    speech = set(range(speech_begin + 1, speech_end))
+    assert len(passed & speech) >= 0.8 * len(speech)
+
+
+def test_steady_speech_floor_untouched():
+    """Обычная фраза с паузами между словами не сбрасывает фон."""
+    rng = random.Random("speech")
+    samples = background(2.0, rng, -62.0, 0.0, None)
+    for value in utterance(rng, -22.0):
+        samples.append(value + rng.gauss(0, 1) * 32768 * 10 ** (-62 / 20))
+    pcm = array("h", (max(-32768, min(32767, int(v))) for v in samples)).tobytes()
+    vad = EnergyVAD()
+    for start in range(0, len(pcm) - vad.frame_bytes + 1, vad.frame_bytes):
+        vad.is_speech(pcm[start:start + vad.frame_bytes])
+    assert vad.resets == 0
+    assert vad.floor_db < -55.0